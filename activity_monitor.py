@@ -3,6 +3,7 @@ import time
 import threading
 from datetime import datetime
 from logger import logger
+from metrics_cache import metrics_cache
 
 class ActivityMonitor:
     """Monitor user activity and system events"""
@@ -10,18 +11,27 @@ class ActivityMonitor:
     def __init__(self):
         self.is_monitoring = False
         self.monitor_thread = None
+        self.core = None               # AsyncCore driving the monitor instead of a thread
+        self.periodic = None
         self.last_active_window = None
         self.active_processes = set()
+        self.processes_scanned = False
         self.monitoring_interval = 30  # seconds
+        self.listeners = []            # Called with every sample, e.g. the condition engine
+        self.last_sample = None
     
-    def start_monitoring(self):
-        """Start activity monitoring"""
+    def start_monitoring(self, core=None):
+        """Start activity monitoring (as a periodic task on an AsyncCore, if given)"""
         if self.is_monitoring:
             return
         
         self.is_monitoring = True
-        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.monitor_thread.start()
+        if core is not None:
+            self.core = core
+            self.periodic = core.every(self.monitoring_interval, self._tick_async)
+        else:
+            self.monitor_thread = threading.Thread(target=self._monitor_loop, name="jarvis-activity-monitor", daemon=True)
+            self.monitor_thread.start()
         
         logger.log_activity("Activity monitoring started")
     
@@ -29,24 +39,67 @@ class ActivityMonitor:
         """Stop activity monitoring"""
         self.is_monitoring = False
         
+        if self.periodic:
+            self.periodic.cancel()
+            self.periodic = None
         if self.monitor_thread:
             self.monitor_thread.join(timeout=1.0)
         
         logger.log_activity("Activity monitoring stopped")
     
+    def add_listener(self, callback):
+        """Call callback(sample) after every monitoring tick"""
+        self.listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+    
     def _monitor_loop(self):
         """Main monitoring loop"""
         while self.is_monitoring:
             try:
-                self._check_running_processes()
-                self._log_system_status()
+                sample = self._collect_sample()
+                self._log_system_status(sample)
+                self._publish(sample)
                 time.sleep(self.monitoring_interval)
             except Exception as e:
                 logger.log_error("Error in activity monitoring", e)
                 time.sleep(self.monitoring_interval)
     
+    async def _tick_async(self):
+        """One monitoring tick on the async core; psutil calls run on its executor"""
+        sample = await self.core.run_blocking(self._collect_sample)
+        await self.core.run_blocking(self._log_system_status, sample)
+        self._publish(sample)
+    
+    def _collect_sample(self):
+        """One reading of everything listeners can react to"""
+        started, closed = self._check_running_processes()
+        # CPU, memory and battery come from the shared metrics cache
+        sample = dict(metrics_cache.get())
+        sample.update({
+            "time": datetime.now(),
+            "processes": set(self.active_processes),
+            "started": started,
+            "closed": closed,
+        })
+        return sample
+    
+    def _publish(self, sample):
+        """Hand a sample to every listener"""
+        self.last_sample = sample
+        for callback in list(self.listeners):
+            try:
+                callback(sample)
+            except Exception as e:
+                logger.log_error("Error in activity monitor listener", e)
+    
     def _check_running_processes(self):
-        """Check for new or closed processes"""
+        """Check for new or closed processes; returns (started, closed) process names"""
+        # The first scan is the baseline: nothing counts as just started
+        first_scan = not self.processes_scanned
+        self.processes_scanned = True
         try:
             current_processes = set()
             
@@ -71,10 +124,13 @@ class ActivityMonitor:
                 if self._is_significant_process(proc_name):
                     logger.log_system_event("PROCESS_CLOSED", proc_name)
             
+            started_processes = set() if first_scan else current_processes - self.active_processes
             self.active_processes = current_processes
+            return started_processes, closed_processes
             
         except Exception as e:
             logger.log_error("Error checking processes", e)
+            return set(), set()
     
     def _is_significant_process(self, process_name):
         """Determine if a process is significant enough to log"""
@@ -92,13 +148,9 @@ class ActivityMonitor:
         
         return process_name.lower() in [app.lower() for app in significant_apps]
     
-    def _log_system_status(self):
+    def _log_system_status(self, sample):
         """Log periodic system status"""
         try:
-            # CPU and Memory usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            
             # Disk usage
             disk = psutil.disk_usage('C:')
             disk_percent = (disk.used / disk.total) * 100
@@ -107,8 +159,8 @@ class ActivityMonitor:
             network = psutil.net_io_counters()
             
             status_message = (
-                f"System Status - CPU: {cpu_percent}%, "
-                f"Memory: {memory.percent}%, "
+                f"System Status - CPU: {sample['cpu']}%, "
+                f"Memory: {sample['memory']}%, "
                 f"Disk: {disk_percent:.1f}%, "
                 f"Network: {self._bytes_to_mb(network.bytes_sent)}MB sent, "
                 f"{self._bytes_to_mb(network.bytes_recv)}MB received"
@@ -8,10 +8,18 @@ import json
 from datetime import datetime, timedelta
 from logger import logger
 from tts import tts
+from latency_tracker import latency_tracker, DISPATCH
+from plan_executor import plan_executor, build_plan, summarize
+from scheduler import scheduler, describe_time
+from condition_engine import condition_engine
+from activity_monitor import activity_monitor
 
 class AdvancedNLP:
     """Advanced natural language processing for complex commands"""
     
+    # Pattern categories analyze_command tries, first match wins
+    PATTERN_PRIORITY = ['questions', 'scheduled', 'conditional', 'multi_step']
+    
     def __init__(self):
         self.command_patterns = {
             # Multi-step commands
@@ -63,6 +71,31 @@ class AdvancedNLP:
             'affirmation': ['yes', 'yeah', 'sure', 'okay', 'alright', 'do it'],
             'negation': ['no', 'nope', 'don\'t', 'cancel', 'never mind', 'forget it']
         }
+        
+        self._compile_patterns()
+    
+    def _compile_patterns(self):
+        """Fold all command patterns into one alternation, highest priority first"""
+        alternatives = []
+        self._pattern_groups = {}       # group name -> (category, first inner group, inner group count)
+        group_count = 0
+        for category in self.PATTERN_PRIORITY:
+            for index, pattern in enumerate(self.command_patterns[category]):
+                name = f"{category}_{index}"
+                inner_groups = re.compile(pattern).groups
+                # Same result as re.search: the lazy prefix tries the earliest
+                # start first. A leading (.*) always matches from the start, so
+                # anchoring it avoids retrying every start position
+                prefix = '' if pattern.startswith('(.*)') else '(?s:.*?)'
+                alternatives.append(f"{prefix}(?P<{name}>{pattern})")
+                self._pattern_groups[name] = (category, group_count + 2, inner_groups)
+                group_count += 1 + inner_groups
+        self.combined_pattern = re.compile('|'.join(alternatives))
+        
+        self.keyword_patterns = {
+            key: re.compile('|'.join(re.escape(word) for word in words))
+            for key, words in self.context_keywords.items()
+        }
     
     def analyze_command(self, command):
         """Analyze command for complexity and intent"""
@@ -76,48 +109,38 @@ class AdvancedNLP:
             'politeness': False,
             'sub_commands': []
         }
+        text = command.lower()
         
         # Check urgency
-        if any(word in command.lower() for word in self.context_keywords['urgency']):
+        if self.keyword_patterns['urgency'].search(text):
             analysis['urgency'] = 'high'
         
         # Check politeness
-        if any(phrase in command.lower() for phrase in self.context_keywords['politeness']):
+        if self.keyword_patterns['politeness'].search(text):
             analysis['politeness'] = True
         
-        # Check for multi-step commands
-        for pattern in self.command_patterns['multi_step']:
-            match = re.search(pattern, command.lower())
-            if match:
-                analysis['type'] = 'multi_step'
-                analysis['sub_commands'] = [match.group(1).strip(), match.group(3).strip()]
-                break
-        
-        # Check for conditional commands
-        for pattern in self.command_patterns['conditional']:
-            match = re.search(pattern, command.lower())
-            if match:
-                analysis['type'] = 'conditional'
-                analysis['condition'] = match.group(1).strip()
-                analysis['action'] = match.group(2).strip()
-                break
+        match = self.combined_pattern.match(text)
+        if not match:
+            return analysis
         
-        # Check for scheduled commands
-        for pattern in self.command_patterns['scheduled']:
-            match = re.search(pattern, command.lower())
-            if match:
-                analysis['type'] = 'scheduled'
-                analysis['timing'] = match.groups()
-                analysis['action'] = match.group(-1).strip()
-                break
+        category, first, count = self._pattern_groups[match.lastgroup]
+        groups = match.groups()[first - 1:first - 1 + count]
+        analysis['pattern'] = match.lastgroup
         
-        # Check for questions
-        for pattern in self.command_patterns['questions']:
-            match = re.search(pattern, command.lower())
-            if match:
-                analysis['type'] = 'question'
-                analysis['query'] = match.group(1).strip()
-                break
+        if category == 'multi_step':
+            analysis['type'] = 'multi_step'
+            analysis['sub_commands'] = [groups[0].strip(), groups[-1].strip()]
+        elif category == 'conditional':
+            analysis['type'] = 'conditional'
+            analysis['condition'] = groups[0].strip()
+            analysis['action'] = groups[1].strip()
+        elif category == 'scheduled':
+            analysis['type'] = 'scheduled'
+            analysis['timing'] = groups
+            analysis['action'] = groups[-1].strip()
+        elif category == 'questions':
+            analysis['type'] = 'question'
+            analysis['query'] = groups[0].strip()
         
         return analysis
     
@@ -127,6 +150,9 @@ class AdvancedNLP:
         
         logger.log_activity(f"Command analysis: {analysis['type']} - {analysis.get('intent', 'unknown')}")
         
+        if analysis['type'] in ('multi_step', 'conditional', 'scheduled', 'question'):
+            latency_tracker.mark(DISPATCH, detail=analysis['type'])
+        
         if analysis['type'] == 'multi_step':
             return self._handle_multi_step(analysis, processor)
         elif analysis['type'] == 'conditional':
@@ -140,56 +166,76 @@ class AdvancedNLP:
             return None
     
     def _handle_multi_step(self, analysis, processor):
-        """Handle multi-step commands"""
-        sub_commands = analysis['sub_commands']
+        """Handle multi-step commands: independent steps run concurrently, one reply for all"""
+        steps = build_plan(analysis['original'])
+        logger.log_activity(f"Multi-step plan: {[(step.command, step.depends_on) for step in steps]}")
         
-        response = f"I'll do that in steps: first {sub_commands[0]}, then {sub_commands[1]}."
-        tts.speak(response)
-        
-        # Execute first command
         try:
-            processor.process_command(sub_commands[0])
-            
-            # Brief pause between commands
-            import time
-            time.sleep(1)
-            
-            # Execute second command
-            processor.process_command(sub_commands[1])
-            
-            completion_response = "Both tasks completed successfully."
-            tts.speak(completion_response)
-            return response + " " + completion_response
-            
+            plan_executor.execute(steps, lambda command: processor.process_command(command, nested=True))
+            response = summarize(steps)
         except Exception as e:
             logger.log_error("Error in multi-step command", e)
-            error_response = "I encountered an issue while executing the multi-step command."
-            tts.speak(error_response)
-            return error_response
+            response = "I encountered an issue while executing the multi-step command."
+        
+        tts.speak(response)
+        return response
     
     def _handle_conditional(self, analysis, processor):
-        """Handle conditional commands (basic implementation)"""
+        """Handle conditional commands by registering a standing rule with the condition engine"""
         condition = analysis['condition']
         action = analysis['action']
+        negate = analysis.get('pattern') == 'conditional_2'     # unless ... do ...
         
-        # For now, just acknowledge the conditional
-        response = f"I understand you want me to {action} if {condition}. However, I can't evaluate conditions yet, so I'll execute the action now."
-        tts.speak(response)
+        try:
+            rule = condition_engine.add(condition, action, negate=negate)
+            response = (f"Okay, I'll {rule.describe()}. That's rule number {rule.id}. "
+                        f"I check every {activity_monitor.monitoring_interval} seconds.")
+        except ValueError:
+            response = f"I don't know how to check whether {condition}, so I haven't set that up."
         
-        # Execute the action
-        processor.process_command(action)
+        tts.speak(response)
         return response
     
-    def _handle_scheduled(self, analysis, processor):
-        """Handle scheduled commands (basic implementation)"""
+    def _due_time(self, analysis, now):
+        """When a scheduled command should run, from its matched pattern and timing"""
         timing = analysis['timing']
+        pattern = analysis['pattern']
+        if pattern == 'scheduled_0':            # in N minutes/hours ...
+            amount = int(timing[0])
+            if timing[1].startswith('hour'):
+                return now + timedelta(hours=amount)
+            return now + timedelta(minutes=amount)
+        if pattern == 'scheduled_1':            # at H[:MM] [am|pm] ...
+            hour, minute, meridiem = int(timing[0]), int(timing[1] or 0), timing[2]
+            if hour > 23 or minute > 59 or (meridiem and not 1 <= hour <= 12):
+                return None
+            if meridiem:
+                hour = hour % 12 + (12 if meridiem == 'pm' else 0)
+            # Without am/pm, "at 7" means whichever 7 o'clock comes first
+            candidates = [hour] if meridiem or hour >= 12 else [hour, hour + 12]
+            for candidate in candidates:
+                due = now.replace(hour=candidate, minute=minute, second=0, microsecond=0)
+                if due > now:
+                    return due
+            return now.replace(hour=candidates[0], minute=minute, second=0, microsecond=0) + timedelta(days=1)
+        if pattern == 'scheduled_2':            # tomorrow ...
+            return now + timedelta(days=1)
+        if pattern == 'scheduled_3':            # next week/month ...
+            return now + timedelta(days=7 if timing[0] == 'week' else 30)
+        return None
+    
+    def _handle_scheduled(self, analysis, processor):
+        """Handle scheduled commands by queueing them on the command scheduler"""
         action = analysis['action']
+        due = self._due_time(analysis, datetime.now())
         
-        response = f"I understand you want me to {action} at the specified time. For now, I'll execute it immediately."
-        tts.speak(response)
+        if due is None:
+            response = "I couldn't work out when you want that done."
+        else:
+            job = scheduler.add(action, due.timestamp())
+            response = f"Okay, I'll {action} {describe_time(job.due)}. That's scheduled command number {job.id}."
         
-        # Execute immediately (would need a scheduler for real timing)
-        processor.process_command(action)
+        tts.speak(response)
         return response
     
     def _handle_question(self, analysis):
@@ -0,0 +1,351 @@
+"""
+Application index for JARVIS
+Collects launchable applications from Config.APPS, a user apps directory,
+Start Menu shortcuts (Windows) or .desktop files (Linux), and PATH. The index
+is cached on disk and refreshed incrementally (only directories whose mtime
+changed are rescanned), and spoken names are resolved with a trigram index so
+"open crome" still finds Chrome. PATH executables must be named exactly (or
+allowlisted), and power/session/destructive commands are never indexed.
+"""
+
+import json
+import os
+import re
+import shlex
+import subprocess
+import threading
+from config import Config
+from logger import logger
+
+LAUNCH_WORDS = {"open", "launch", "start", "run", "the", "app", "application", "program", "please", "up", "my"}
+SHORTCUT_EXTENSIONS = {".lnk", ".url", ".appref-ms"}
+DESKTOP_FIELD_CODES = re.compile(r"\s*%[fFuUdDnNickvm]")
+CACHE_VERSION = 1
+
+
+def normalize_name(name):
+    """'Visual Studio Code (User)' -> 'visual studio code user'"""
+    return " ".join(re.findall(r"[a-z0-9+#]+", name.lower()))
+
+
+def default_sources():
+    """(directory, recursive) pairs to index, most specific first"""
+    sources = [(Config.USER_APPS_DIR, True)]
+    if os.name == "nt":
+        for base in (os.environ.get("APPDATA"), os.environ.get("ProgramData")):
+            if base:
+                sources.append((os.path.join(base, "Microsoft", "Windows", "Start Menu", "Programs"), True))
+    else:
+        sources += [
+            (os.path.expanduser("~/.local/share/applications"), True),
+            ("/usr/local/share/applications", True),
+            ("/usr/share/applications", True),
+            ("/var/lib/flatpak/exports/share/applications", True),
+            ("/var/lib/snapd/desktop/applications", True),
+        ]
+    for directory in os.environ.get("PATH", "").split(os.pathsep):
+        if directory:
+            sources.append((directory, False))
+    return sources
+
+
+def parse_desktop_file(path):
+    """(name, exec command) of a launchable .desktop entry, or None"""
+    fields = {}
+    in_entry = False
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    in_entry = line == "[Desktop Entry]"
+                elif in_entry and "=" in line:
+                    key, value = line.split("=", 1)
+                    fields.setdefault(key.strip(), value.strip())
+    except OSError:
+        return None
+    if fields.get("Type", "Application") != "Application" or "Exec" not in fields or "Name" not in fields:
+        return None
+    if fields.get("NoDisplay") == "true" or fields.get("Hidden") == "true":
+        return None
+    return fields["Name"], DESKTOP_FIELD_CODES.sub("", fields["Exec"]).strip()
+
+
+def _is_executable(path, name):
+    if os.name == "nt":
+        extensions = os.environ.get("PATHEXT", ".EXE;.BAT;.CMD").lower().split(";")
+        return os.path.splitext(name)[1].lower() in extensions
+    return os.access(path, os.X_OK)
+
+
+def scan_directory(directory, recursive):
+    """Entries ([name, kind, target]) directly in `directory`, and its subdirectories"""
+    entries = []
+    subdirs = []
+    try:
+        with os.scandir(directory) as listing:
+            for item in listing:
+                try:
+                    if item.is_dir():
+                        if recursive:
+                            subdirs.append(item.path)
+                        continue
+                    if not item.is_file():
+                        continue
+                except OSError:
+                    continue
+                stem, extension = os.path.splitext(item.name)
+                extension = extension.lower()
+                if extension == ".desktop":
+                    parsed = parse_desktop_file(item.path)
+                    if parsed:
+                        entries.append([normalize_name(parsed[0]), "desktop", parsed[1]])
+                elif extension in SHORTCUT_EXTENSIONS:
+                    if not stem.lower().startswith("uninstall"):
+                        entries.append([normalize_name(stem), "shortcut", item.path])
+                elif _is_executable(item.path, item.name):
+                    entries.append([normalize_name(stem if os.name == "nt" else item.name), "path", item.path])
+    except OSError:
+        pass
+    return [entry for entry in entries if entry[0]], sorted(subdirs)
+
+
+def command_stem(kind, target):
+    """'shutdown' for /usr/sbin/shutdown, C:\\Windows\\logoff.exe or 'mkfs.ext4 /dev/sda'"""
+    if kind == "desktop":
+        try:
+            target = shlex.split(target)[0]
+        except (ValueError, IndexError):
+            return ""
+    elif kind != "path":
+        return ""
+    return re.split(r"[\\/]", target)[-1].lower().split(".")[0]
+
+
+def is_denied(name, kind, target):
+    """True for entries that must never launch by voice ("shut down", logoff.exe, rm)"""
+    denied = Config.APP_DENYLIST
+    return name.replace(" ", "") in denied or command_stem(kind, target) in denied
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AppEntry:
+    """A launchable application"""
+
+    def __init__(self, name, kind, target):
+        self.name = name
+        self.kind = kind            # 'config', 'shortcut', 'desktop' or 'path'
+        self.target = target
+
+    def launch(self):
+        if self.kind == "config":
+            subprocess.Popen(self.target, shell=True)
+        elif self.kind == "shortcut":
+            if hasattr(os, "startfile"):
+                os.startfile(self.target)
+            else:
+                subprocess.Popen(["xdg-open", self.target])
+        elif self.kind == "desktop":
+            subprocess.Popen(shlex.split(self.target))
+        else:
+            subprocess.Popen([self.target])
+
+
+class FuzzyMatcher:
+    """Trigram inverted index over names; scores candidates by Dice coefficient"""
+
+    def __init__(self, names):
+        self.names = names
+        self.sizes = []
+        self.postings = {}          # trigram -> ids of names containing it
+        for index, name in enumerate(names):
+            grams = trigrams(name)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(index)
+
+    def best(self, query):
+        """(index, score) of the closest name, or (None, 0.0)"""
+        grams = trigrams(query)
+        shared = {}
+        for gram in grams:
+            for index in self.postings.get(gram, ()):
+                shared[index] = shared.get(index, 0) + 1
+        best_index, best_score = None, 0.0
+        query_size = len(grams)
+        for index, count in shared.items():
+            score = 2.0 * count / (query_size + self.sizes[index])
+            # Ties go to the earlier (higher-priority) name
+            if score > best_score or (score == best_score and index < best_index):
+                best_index, best_score = index, score
+        return best_index, best_score
+
+
+def config_entries():
+    """Config.APPS as index entries; they take priority over anything scanned"""
+    return {name: AppEntry(name, "config", executable) for name, executable in Config.APPS.items()}
+
+
+class AppIndex:
+    """Installed applications by spoken name, cached on disk"""
+
+    def __init__(self, sources=None, cache_path=None, threshold=None):
+        self.sources = sources if sources is not None else default_sources()
+        self.cache_path = cache_path
+        self.threshold = Config.APP_MATCH_THRESHOLD if threshold is None else threshold
+        # (name -> AppEntry in priority order, matcher over the fuzzy-matchable names),
+        # swapped in as one tuple so concurrent resolve() calls see a consistent pair
+        self._index = ({}, FuzzyMatcher([]))
+        self.loaded = False
+        self._dirs = {}             # directory -> {"mtime", "entries", "subdirs"}
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+
+    @property
+    def entries(self):
+        return self._index[0]
+
+    @property
+    def matcher(self):
+        return self._index[1]
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("version") == CACHE_VERSION:
+                self._dirs = cached["dirs"]
+        except Exception as e:
+            logger.log_error(f"Failed to load app index cache {self.cache_path}", e)
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        temp_path = self.cache_path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "dirs": self._dirs}, f)
+            os.replace(temp_path, self.cache_path)
+        except Exception as e:
+            logger.log_error(f"Failed to save app index cache {self.cache_path}", e)
+
+    def refresh(self):
+        """Rescan directories whose mtime changed; returns (scanned, reused) directory counts"""
+        with self._lock:
+            if not self.loaded and not self._dirs:
+                self._load_cache()
+            previous, dirs = self._dirs, {}
+            counts = {"scanned": 0, "reused": 0}
+            for directory, recursive in self.sources:
+                self._refresh_directory(directory, recursive, previous, dirs, counts)
+            self._dirs = dirs
+            self._build()
+            if counts["scanned"] or set(dirs) != set(previous):
+                self._save_cache()
+        logger.log_activity(f"App index: {len(self.entries)} applications "
+                            f"({counts['scanned']} directories scanned, {counts['reused']} from cache)")
+        return counts["scanned"], counts["reused"]
+
+    def _refresh_directory(self, directory, recursive, previous, dirs, counts):
+        if directory in dirs:
+            return
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError:
+            return
+        cached = previous.get(directory)
+        if cached and cached["mtime"] == mtime:
+            dirs[directory] = cached
+            counts["reused"] += 1
+        else:
+            entries, subdirs = scan_directory(directory, recursive)
+            dirs[directory] = {"mtime": mtime, "entries": entries, "subdirs": subdirs}
+            counts["scanned"] += 1
+        # A changed subdirectory doesn't change its parent's mtime, so visit each one
+        for subdir in dirs[directory]["subdirs"]:
+            self._refresh_directory(subdir, True, previous, dirs, counts)
+
+    def _build(self):
+        """Merge Config.APPS and the scanned entries (first name wins) and index them"""
+        entries = config_entries()
+        for directory in self._ordered_directories():
+            for name, kind, target in self._dirs[directory]["entries"]:
+                if name not in entries and not is_denied(name, kind, target):
+                    entries[name] = AppEntry(name, kind, target)
+        # Misheard names only match applications, not arbitrary PATH binaries
+        allowed = {normalize_name(name) for name in Config.APP_PATH_ALLOWLIST}
+        fuzzy = [name for name, entry in entries.items() if entry.kind != "path" or name in allowed]
+        self._index = (entries, FuzzyMatcher(fuzzy))
+        self.loaded = True
+
+    def _ordered_directories(self):
+        """Scanned directories in source priority order, parents before children"""
+        ordered, seen = [], set()
+
+        def visit(directory):
+            if directory in seen or directory not in self._dirs:
+                return
+            seen.add(directory)
+            ordered.append(directory)
+            for subdir in self._dirs[directory]["subdirs"]:
+                visit(subdir)
+
+        for directory, _ in self.sources:
+            visit(directory)
+        return ordered
+
+    def refresh_async(self):
+        """Refresh on a background thread (startup); joins a refresh already in flight"""
+        thread = self._refresh_thread
+        if thread and thread.is_alive():
+            return thread
+        thread = threading.Thread(target=self.refresh, name="jarvis-app-index", daemon=True)
+        self._refresh_thread = thread
+        thread.start()
+        return thread
+
+    def _first_index(self):
+        """The index before the first refresh: wait (bounded) for the one in flight, or run it"""
+        thread = self._refresh_thread
+        if thread and thread.is_alive():
+            thread.join(Config.APP_INDEX_WAIT_SECONDS)
+            if not self.loaded:
+                logger.log_activity("App index still scanning - resolving from Config.APPS only")
+                entries = config_entries()
+                return entries, FuzzyMatcher(list(entries))
+        if not self.loaded:
+            self.refresh()
+        return self._index
+
+    def resolve(self, command):
+        """The application a command names, or None if nothing is close enough"""
+        index = self._index if self.loaded else self._first_index()
+        words = [word for word in normalize_name(command).split() if word not in LAUNCH_WORDS]
+        if not words:
+            return None
+        # "launch shut down" must not fall through to the closest-sounding app
+        if "".join(words) in Config.APP_DENYLIST or any(word in Config.APP_DENYLIST for word in words):
+            return None
+
+        entries, matcher = index
+        # Exact names first, longest phrase first ("open visual studio code please")
+        for length in range(min(len(words), 5), 0, -1):
+            for start in range(len(words) - length + 1):
+                entry = entries.get(" ".join(words[start:start + length]))
+                if entry:
+                    return entry
+
+        index, score = matcher.best(" ".join(words))
+        if index is None or score < self.threshold:
+            return None
+        return entries[matcher.names[index]]
+
+
+# Global application index (refreshed in the background at startup)
+app_index = AppIndex(cache_path=Config.APP_INDEX_CACHE)
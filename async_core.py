@@ -0,0 +1,210 @@
+"""
+Asyncio core for JARVIS (optional, see main.py --async-core)
+One event loop replaces the polling threads: audio chunks arrive through a
+thread-safe callback, events are handled by coroutines, periodic jobs sleep
+on the loop instead of in their own threads, and blocking work (psutil,
+recognizers) is offloaded to executors. When nothing happens, nothing wakes up.
+"""
+
+import asyncio
+import functools
+import selectors
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from logger import logger
+
+
+class CountingSelector(selectors.DefaultSelector):
+    """Selector that counts how often the event loop wakes up"""
+
+    def __init__(self):
+        super().__init__()
+        self.wakeups = 0
+
+    def select(self, timeout=None):
+        events = super().select(timeout)
+        self.wakeups += 1
+        return events
+
+
+class Periodic:
+    """A coroutine function run every `interval` seconds on the core's loop"""
+
+    def __init__(self, interval, handler):
+        self.interval = interval
+        self.handler = handler
+        self.task = None
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        if self.task:
+            self.task.get_loop().call_soon_threadsafe(self.task.cancel)
+
+
+class AsyncCore:
+    """Event loop, coroutine event handlers and executors for blocking work"""
+
+    def __init__(self, blocking_workers=None):
+        self.loop = None
+        self.selector = None
+        self.handlers = {}              # event -> [coroutine function]
+        self.blocking = ThreadPoolExecutor(max_workers=blocking_workers or Config.ASYNC_BLOCKING_WORKERS,
+                                           thread_name_prefix="jarvis-blocking")
+        # Recognizers keep per-stream state, so chunks are fed strictly in order
+        self.recognition = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jarvis-recognition")
+        self.started_at = None
+        self._periodics = []
+        self._tasks = set()
+        self._stopping = None
+        self._ready = threading.Event()
+        self._draining = False
+
+    # ---------------- Handlers ---------------- #
+    def on(self, event, handler):
+        """Run coroutine function `handler(*args)` whenever `event` is posted"""
+        self.handlers.setdefault(event, []).append(handler)
+
+    def post(self, event, *args):
+        """Post an event from any thread"""
+        if self.loop is None or self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self._dispatch, event, args)
+
+    def _dispatch(self, event, args):
+        for handler in self.handlers.get(event, ()):
+            self._spawn(handler(*args))
+
+    def _spawn(self, coroutine):
+        task = self.loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.log_error("Error in async handler", task.exception())
+
+    async def run_blocking(self, function, *args, **kwargs):
+        """Await a blocking call on the executor"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.blocking, functools.partial(function, *args, **kwargs))
+
+    def every(self, interval, handler):
+        """Run coroutine function `handler()` every `interval` seconds; returns a Periodic"""
+        periodic = Periodic(interval, handler)
+        self._periodics.append(periodic)
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self._start_periodic, periodic)
+        return periodic
+
+    def _start_periodic(self, periodic):
+        if not periodic.cancelled and periodic.task is None:
+            periodic.task = self._spawn(self._run_periodic(periodic))
+
+    async def _run_periodic(self, periodic):
+        while not periodic.cancelled:
+            try:
+                await periodic.handler()
+            except Exception as e:
+                logger.log_error("Error in periodic task", e)
+            await asyncio.sleep(periodic.interval)
+
+    # ---------------- Audio ---------------- #
+    def attach_pipeline(self, pipeline):
+        """Drive a RecognitionPipeline from the loop instead of its two threads
+
+        A reader thread blocks on the source and hands each chunk to the loop,
+        which gates it through VAD; speech is recognized on a single worker.
+        """
+        pipeline.is_running = True
+        pipeline.buffer.reopen()
+        callback = functools.partial(self.feed_audio, pipeline)
+
+        def read():
+            while pipeline.is_running:
+                data = pipeline.source.read()
+                callback(data, time.monotonic())
+                if data is None:
+                    break
+
+        pipeline.capture_thread = threading.Thread(target=read, name="jarvis-audio", daemon=True)
+        pipeline.capture_thread.start()
+
+    def feed_audio(self, pipeline, data, stamp=None):
+        """Thread-safe audio callback: a PCM chunk, or None at end of stream"""
+        if self.loop is None or self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self._on_audio, pipeline, data, stamp)
+
+    def _on_audio(self, pipeline, data, stamp):
+        if data is None:
+            pipeline.end_of_stream()
+        else:
+            pipeline.capture(data, stamp)
+        if pipeline.buffer and not self._draining:
+            self._draining = True
+            self._spawn(self._recognize(pipeline))
+
+    async def _recognize(self, pipeline):
+        try:
+            await asyncio.get_running_loop().run_in_executor(self.recognition, pipeline._drain)
+        finally:
+            self._draining = False
+        # Speech captured while the recognizer was busy
+        if pipeline.buffer:
+            self._draining = True
+            self._spawn(self._recognize(pipeline))
+
+    # ---------------- Running ---------------- #
+    def run(self):
+        """Run the loop on the calling thread until stop()"""
+        self.selector = CountingSelector()
+        loop = asyncio.SelectorEventLoop(self.selector)
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._main())
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*self._tasks, return_exceptions=True))
+            asyncio.set_event_loop(None)
+            loop.close()
+            self.blocking.shutdown(wait=False)
+            self.recognition.shutdown(wait=False)
+
+    def start(self):
+        """Run the loop on a background thread; returns once it is accepting events"""
+        thread = threading.Thread(target=self.run, name="jarvis-async-core", daemon=True)
+        thread.start()
+        self._ready.wait(5.0)
+        return thread
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self.started_at = time.monotonic()
+        for periodic in self._periodics:
+            self._start_periodic(periodic)
+        self._ready.set()
+        logger.log_activity("Async core running")
+        await self._stopping.wait()
+
+    def stop(self):
+        """Stop the loop (from any thread)"""
+        if self.loop is not None and not self.loop.is_closed() and self._stopping is not None:
+            self.loop.call_soon_threadsafe(self._stopping.set)
+
+    def stats(self):
+        """Loop wakeups since start, and per second"""
+        wakeups = self.selector.wakeups if self.selector else 0
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {"wakeups": wakeups, "seconds": elapsed,
+                "wakeups_per_second": wakeups / elapsed if elapsed else 0.0}
+
+
+# Global async core (only started with main.py --async-core)
+async_core = AsyncCore()
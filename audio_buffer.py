@@ -0,0 +1,228 @@
+"""
+Audio buffering for JARVIS
+Preallocated, bounded ring buffer that hands PCM chunks from the capture
+thread to the recognition thread with a condition-variable wakeup, plus a
+timestamped history of recognized speech for cutting out command segments
+"""
+
+import math
+import threading
+from collections import deque
+
+DROP_OLDEST = "oldest"    # Overwrite the oldest queued chunk when full
+DROP_NEWEST = "newest"    # Discard the incoming chunk when full
+BLOCK = "block"           # Make the writer wait for space
+
+DROP_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+class AudioRingBuffer:
+    """Bounded FIFO of audio chunks backed by a single preallocated bytearray"""
+
+    def __init__(self, capacity=64, chunk_bytes=8192, drop_policy=DROP_OLDEST):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy '{drop_policy}', expected one of {DROP_POLICIES}")
+        if capacity < 1 or chunk_bytes < 1:
+            raise ValueError("Ring buffer capacity and chunk size must be positive")
+
+        self.capacity = capacity
+        self.chunk_bytes = chunk_bytes
+        self.drop_policy = drop_policy
+
+        self._storage = bytearray(capacity * chunk_bytes)
+        self._view = memoryview(self._storage)
+        self._lengths = [0] * capacity
+        self._stamps = [0.0] * capacity   # Capture time of each slot's last sample
+        self._sequences = [0] * capacity  # chunks_written once each slot was filled
+        self._ends = deque()      # chunks_written at each end-of-segment marker; never dropped
+        self._head = 0            # Slot of the oldest queued chunk
+        self._count = 0           # Number of queued chunks
+        self._cond = threading.Condition()
+        self._closed = False
+        self.last_stamp = None    # Capture time of the chunk most recently returned by get()
+
+        # Counters
+        self.chunks_written = 0
+        self.chunks_read = 0
+        self.dropped_oldest = 0
+        self.dropped_newest = 0
+        self.blocked_writes = 0
+        self.high_water = 0
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0 or bool(self._ends)
+
+    def _slot(self, index):
+        """Return the memoryview of a slot"""
+        start = index * self.chunk_bytes
+        return self._view[start:start + self.chunk_bytes]
+
+    def _write_slot(self, data, stamp):
+        """Copy one chunk into the next free slot (lock held)"""
+        index = (self._head + self._count) % self.capacity
+        length = len(data)
+        self._slot(index)[:length] = data
+        self._lengths[index] = length
+        self._stamps[index] = stamp
+        self._count += 1
+        self.chunks_written += 1
+        self._sequences[index] = self.chunks_written
+        if self._count > self.high_water:
+            self.high_water = self._count
+
+    def _read_slot(self):
+        """Copy the oldest chunk out of the buffer (lock held)"""
+        index = self._head
+        data = bytes(self._slot(index)[:self._lengths[index]])
+        self.last_stamp = self._stamps[index]
+        self._head = (self._head + 1) % self.capacity
+        self._count -= 1
+        self.chunks_read += 1
+        return data
+
+    def put(self, data, timeout=None, stamp=0.0):
+        """Queue a chunk (optionally with its capture time); returns False if it was dropped
+
+        A zero-length chunk marks the end of a speech segment. Markers take no
+        slot and are never dropped: get() returns one (as b'') once every chunk
+        queued before it has been read or overwritten.
+        """
+        if len(data) > self.chunk_bytes:
+            # Oversized reads are split across consecutive slots
+            accepted = True
+            view = memoryview(data)
+            for start in range(0, len(data), self.chunk_bytes):
+                accepted = self.put(view[start:start + self.chunk_bytes], timeout, stamp) and accepted
+            return accepted
+
+        with self._cond:
+            if self._closed:
+                return False
+
+            if not data:
+                self._ends.append(self.chunks_written)
+                self._cond.notify_all()
+                return True
+
+            if self._count == self.capacity:
+                if self.drop_policy == DROP_NEWEST:
+                    self.dropped_newest += 1
+                    return False
+                elif self.drop_policy == DROP_OLDEST:
+                    self._head = (self._head + 1) % self.capacity
+                    self._count -= 1
+                    self.dropped_oldest += 1
+                else:
+                    self.blocked_writes += 1
+                    if not self._cond.wait_for(lambda: self._count < self.capacity or self._closed, timeout):
+                        self.dropped_newest += 1
+                        return False
+                    if self._closed:
+                        return False
+
+            self._write_slot(data, stamp)
+            self._cond.notify_all()
+            return True
+
+    # Deque-compatible alias so callers can keep using append()
+    append = put
+
+    def get(self, timeout=None):
+        """Wait for and return the oldest chunk, or None on timeout/close"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._count > 0 or self._ends or self._closed, timeout):
+                return None
+            if self._ends and (self._count == 0 or self._sequences[self._head] > self._ends[0]):
+                self._ends.popleft()
+                return b''
+            if self._count == 0:
+                return None
+            data = self._read_slot()
+            self._cond.notify_all()
+            return data
+
+    def recent(self, count):
+        """Return copies of the newest queued chunks without consuming them"""
+        with self._cond:
+            count = min(count, self._count)
+            chunks = []
+            for offset in range(self._count - count, self._count):
+                index = (self._head + offset) % self.capacity
+                chunks.append(bytes(self._slot(index)[:self._lengths[index]]))
+            return chunks
+
+    def clear(self):
+        """Discard all queued chunks (end-of-segment markers stay queued)"""
+        with self._cond:
+            self._head = 0
+            self._count = 0
+            self._cond.notify_all()
+
+    def close(self):
+        """Wake all waiters and refuse further writes"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        """Accept writes again after close()"""
+        with self._cond:
+            self._closed = False
+
+    @property
+    def overflows(self):
+        """Total chunks lost to a full buffer"""
+        return self.dropped_oldest + self.dropped_newest
+
+    def get_stats(self):
+        """Return occupancy and overflow counters"""
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "queued": self._count,
+                "high_water": self.high_water,
+                "chunks_written": self.chunks_written,
+                "chunks_read": self.chunks_read,
+                "dropped_oldest": self.dropped_oldest,
+                "dropped_newest": self.dropped_newest,
+                "blocked_writes": self.blocked_writes,
+                "drop_policy": self.drop_policy
+            }
+
+
+class AudioHistory:
+    """Rolling record of recognized chunks tagged with capture time and VAD segment
+
+    Chunks are the immutable bytes already handed out by AudioRingBuffer.get(),
+    so the history keeps references instead of copying audio a second time.
+    """
+
+    def __init__(self, seconds=30.0, sample_rate=16000, chunk_frames=4096):
+        self.seconds = seconds
+        self._chunks = deque(maxlen=max(1, math.ceil(seconds * sample_rate / chunk_frames)))
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._chunks)
+
+    def append(self, data, stamp, segment):
+        """Record a chunk that ended at capture time `stamp`"""
+        with self._lock:
+            self._chunks.append((stamp, segment, data))
+
+    def chunks(self, segment, since=None):
+        """Chunks of one speech segment, optionally only those ending at or after `since`"""
+        with self._lock:
+            return [data for stamp, seg, data in self._chunks
+                    if seg == segment and (since is None or stamp >= since)]
+
+    def audio(self, segment, since=None):
+        """The PCM of one speech segment from `since` onwards"""
+        return b''.join(self.chunks(segment, since))
+
+    def clear(self):
+        with self._lock:
+            self._chunks.clear()
@@ -0,0 +1,165 @@
+"""
+Audio sources for JARVIS
+Sources deliver chunks of 16-bit mono PCM via read(), returning None once the
+stream has ended. Anything that reads audio (the recognition pipeline,
+SpeechRecognition, the benchmarks) takes an AudioSource, so the live
+microphone can be swapped for a file or generated audio.
+"""
+
+import time
+import wave
+from logger import logger
+
+try:
+    import pyaudio
+    PYAUDIO_AVAILABLE = True
+except ImportError:
+    PYAUDIO_AVAILABLE = False
+
+
+class AudioSource:
+    """Base class for chunked 16-bit mono PCM sources
+
+    Replayed sources run as fast as possible by default; with realtime=True
+    each read() is held back until the chunk would have finished arriving
+    from a microphone, so timing-sensitive code sees live behaviour.
+    """
+
+    def __init__(self, sample_rate=16000, chunk_frames=4096, realtime=False):
+        self.sample_rate = sample_rate
+        self.chunk_frames = chunk_frames
+        self.realtime = realtime
+        self._clock_start = None
+        self._frames_delivered = 0
+
+    def read(self):
+        """Return the next chunk of PCM bytes, or None at end of stream"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _pace(self, data):
+        """Account for a chunk and, in real-time mode, wait until it is due"""
+        if not data:
+            return None
+        if self._clock_start is None:
+            self._clock_start = time.monotonic()
+        self._frames_delivered += len(data) // 2
+        if self.realtime:
+            delay = self._clock_start + self._frames_delivered / self.sample_rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return data
+
+
+class WavFileSource(AudioSource):
+    """Replay a 16-bit mono WAV file as capture chunks"""
+
+    def __init__(self, path, chunk_frames=4096, realtime=False):
+        self.path = path
+        self._wav = wave.open(path, 'rb')
+        if self._wav.getsampwidth() != 2 or self._wav.getnchannels() != 1:
+            self._wav.close()
+            raise ValueError(f"{path} must be 16-bit mono PCM")
+        super().__init__(self._wav.getframerate(), chunk_frames, realtime)
+
+    def read(self):
+        """Return the next chunk, or None at end of file"""
+        return self._pace(self._wav.readframes(self.chunk_frames))
+
+    def close(self):
+        self._wav.close()
+
+
+class RawPCMSource(AudioSource):
+    """Replay a headerless 16-bit little-endian mono PCM file"""
+
+    def __init__(self, path, sample_rate=16000, chunk_frames=4096, realtime=False):
+        super().__init__(sample_rate, chunk_frames, realtime)
+        self.path = path
+        self._file = open(path, 'rb')
+
+    def read(self):
+        """Return the next chunk, or None at end of file"""
+        data = self._file.read(self.chunk_frames * 2)
+        return self._pace(data[:len(data) & ~1])
+
+    def close(self):
+        self._file.close()
+
+
+class GeneratorSource(AudioSource):
+    """Serve chunks from any iterable of PCM bytes (synthetic or in-memory audio)"""
+
+    def __init__(self, chunks, sample_rate=16000, realtime=False):
+        super().__init__(sample_rate, None, realtime)
+        self._chunks = iter(chunks)
+
+    def read(self):
+        """Return the next chunk, or None once the iterable is exhausted"""
+        for chunk in self._chunks:
+            if len(chunk):
+                return self._pace(bytes(chunk))
+        return None
+
+
+class MicrophoneSource(AudioSource):
+    """Live capture from PyAudio, honouring working_microphone.txt"""
+
+    def __init__(self, chunk_frames=4096, sample_rate=None, device_index=None):
+        from config import Config
+
+        if not PYAUDIO_AVAILABLE:
+            raise RuntimeError("PyAudio not available")
+
+        # Capture is paced by the device itself
+        super().__init__(sample_rate or Config.SAMPLE_RATE, chunk_frames)
+        self.audio = pyaudio.PyAudio()
+
+        try:
+            if device_index is None:
+                device_index = self._find_device()
+
+            self.stream = self.audio.open(
+                format=pyaudio.paInt16,
+                channels=1,
+                rate=self.sample_rate,
+                input=True,
+                input_device_index=device_index,
+                frames_per_buffer=Config.CHUNK_SIZE
+            )
+        except Exception:
+            self.audio.terminate()
+            raise
+        logger.log_activity("Microphone initialized successfully")
+
+    def _find_device(self):
+        """Use the device recorded by troubleshoot_microphone.py, else the default"""
+        try:
+            with open("working_microphone.txt", "r") as f:
+                device_index = int(f.read().strip())
+            device_info = self.audio.get_device_info_by_index(device_index)
+            logger.log_activity(f"Using working microphone device {device_index}: {device_info['name']}")
+            return device_index
+        except Exception:
+            device_info = self.audio.get_default_input_device_info()
+            logger.log_activity(f"Using default microphone: {device_info['name']}")
+            return None
+
+    def read(self):
+        """Block until the next chunk is captured"""
+        return self.stream.read(self.chunk_frames, exception_on_overflow=False)
+
+    def close(self):
+        try:
+            self.stream.stop_stream()
+            self.stream.close()
+        finally:
+            self.audio.terminate()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Command analysis benchmark for JARVIS
+Compares the old AdvancedNLP.analyze_command (every pattern of every category
+searched in turn, later categories overwriting earlier ones) with the single
+precompiled alternation, on short commands and on long rambling utterances
+"""
+
+import argparse
+import re
+import time
+
+from advanced_nlp import advanced_nlp
+
+COMMANDS = [
+    "open chrome", "what time is it", "take a screenshot", "hello jarvis",
+    "open chrome and then open notepad", "first open youtube then search for music",
+    "if the battery is low then lock the computer", "when cpu usage is high do close chrome",
+    "in 5 minutes remind me to stretch", "at 7:30 am play the news", "tomorrow send the report",
+    "what is the capital of france", "where is my downloads folder", "why is the sky blue",
+    "please open firefox quickly", "could you tell me the date",
+]
+
+# Recognizer run-ons: long and with no pattern keyword until the very end
+LONG_UTTERANCES = [
+    " ".join(["so i was thinking about the thing we talked about yesterday"] * 6) + " and open notepad",
+    " ".join(["would be a dime a dozen is asia and the diamond isn"] * 5),
+    " ".join(["uh the the music thing with the sound"] * 12),
+]
+
+
+def legacy_analyze(command, patterns=advanced_nlp.command_patterns, keywords=advanced_nlp.context_keywords):
+    """The sequential implementation analyze_command replaced"""
+    analysis = {'original': command, 'type': 'simple', 'urgency': 'normal', 'politeness': False, 'sub_commands': []}
+    if any(word in command.lower() for word in keywords['urgency']):
+        analysis['urgency'] = 'high'
+    if any(phrase in command.lower() for phrase in keywords['politeness']):
+        analysis['politeness'] = True
+    for pattern in patterns['multi_step']:
+        match = re.search(pattern, command.lower())
+        if match:
+            analysis['type'] = 'multi_step'
+            analysis['sub_commands'] = [match.group(1).strip(), match.groups()[-1].strip()]
+            break
+    for pattern in patterns['conditional']:
+        match = re.search(pattern, command.lower())
+        if match:
+            analysis['type'] = 'conditional'
+            analysis['condition'] = match.group(1).strip()
+            analysis['action'] = match.group(2).strip()
+            break
+    for pattern in patterns['scheduled']:
+        match = re.search(pattern, command.lower())
+        if match:
+            analysis['type'] = 'scheduled'
+            analysis['timing'] = match.groups()
+            analysis['action'] = match.groups()[-1].strip()
+            break
+    for pattern in patterns['questions']:
+        match = re.search(pattern, command.lower())
+        if match:
+            analysis['type'] = 'question'
+            analysis['query'] = match.group(1).strip()
+            break
+    return analysis
+
+
+def measure(analyze, commands, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for command in commands:
+            analyze(command)
+    return len(commands) * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AdvancedNLP.analyze_command throughput")
+    parser.add_argument("--repeat", type=int, default=2000, help="Passes over each corpus")
+    args = parser.parse_args()
+
+    print("JARVIS Command Analysis Benchmark")
+    print("=" * 50)
+    for label, commands in (("commands", COMMANDS), ("long utterances", LONG_UTTERANCES)):
+        legacy = measure(legacy_analyze, commands, args.repeat)
+        combined = measure(advanced_nlp.analyze_command, commands, args.repeat)
+        print(f"{label:16} sequential {legacy:10,.0f}/s   combined {combined:10,.0f}/s   ({combined / legacy:.2f}x)")
+
+    changed = [c for c in COMMANDS + LONG_UTTERANCES
+               if legacy_analyze(c)['type'] != advanced_nlp.analyze_command(c)['type']]
+    print(f"{len(changed)} commands classified differently")
+    return 1 if changed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
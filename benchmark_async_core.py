@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Async core benchmark for JARVIS
+Idles JarvisAssistant's background components - the activity monitor, the
+command scheduler, the TTS worker and the metrics cache - under the threading
+model (plus its 1 s tooltip loop and 100 ms keyboard polling, and with --audio
+the capture and recognition threads) and under the asyncio core, and reports
+each component's thread wakeups (voluntary context switches) per second and
+the process's CPU use
+"""
+
+import argparse
+import glob
+import itertools
+import os
+import threading
+import time
+
+import psutil
+
+from async_core import AsyncCore
+from audio_source import GeneratorSource
+from recognition_pipeline import RecognitionPipeline
+from activity_monitor import ActivityMonitor
+from scheduler import CommandScheduler
+from tts import tts
+
+CHUNK_FRAMES = 4096
+
+# (label, thread name prefix) of the components each model runs
+COMPONENTS = [
+    ("Metrics sampler", "jarvis-metrics"),
+    ("Activity monitor", "jarvis-activity-monitor"),
+    ("Command scheduler", "jarvis-scheduler"),
+    ("TTS worker", "jarvis-tts"),
+    ("Tooltip loop", "jarvis-main-loop"),
+    ("Keyboard polling", "jarvis-keyboard"),
+    ("Async core loop", "jarvis-async-core"),
+    ("Blocking executor", "jarvis-blocking"),
+]
+
+
+def thread_switches(exclude=()):
+    """Voluntary context switches per live Python thread: native id -> (name, count)"""
+    counts = {}
+    for thread in threading.enumerate():
+        if thread.native_id in exclude:
+            continue
+        path = f"/proc/{os.getpid()}/task/{thread.native_id}/status"
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.startswith("voluntary_ctxt_switches"):
+                        counts[thread.native_id] = (thread.name, int(line.split()[1]))
+        except OSError:
+            continue
+    return counts
+
+
+def live_threads():
+    """Threads already running, which a model's counts leave out: a previous model's may still be
+    winding down. The TTS worker is the global one both models share, so it always counts."""
+    shared = tts._worker.native_id if tts._worker else None
+    return {thread.native_id for thread in threading.enumerate()} - {shared}
+
+
+def context_switches():
+    """Voluntary context switches of every thread in this process"""
+    task_files = glob.glob(f"/proc/{os.getpid()}/task/*/status")
+    if not task_files:
+        return psutil.Process().num_ctx_switches().voluntary
+    total = 0
+    for path in task_files:
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.startswith("voluntary_ctxt_switches"):
+                        total += int(line.split()[1])
+        except OSError:
+            continue
+    return total
+
+
+def silent_pipeline():
+    """A pipeline fed live-paced microphone silence"""
+    silence = bytes(CHUNK_FRAMES * 2)
+    return RecognitionPipeline(GeneratorSource(itertools.repeat(silence), realtime=True), [])
+
+
+def status():
+    return "Listening for hotword | Monitoring active"
+
+
+def start_components(core=None):
+    """The monitor, scheduler and TTS worker JarvisAssistant.start() brings up"""
+    monitor = ActivityMonitor()
+    scheduler = CommandScheduler(path=None)
+    scheduler.start(lambda command: None)
+    tts._say = lambda text: None                # Bring the worker up without making a sound
+    tts.speak("benchmark", blocking=True)
+    monitor.start_monitoring(core=core)
+    # The first tick scans every process; idling starts once it is done
+    deadline = time.monotonic() + 30
+    while monitor.last_sample is None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return monitor, scheduler
+
+
+def measure(seconds, existing, warmup=0.5):
+    """(wakeups per second, CPU % of one core, per-component wakeups per second) over `seconds` of idling
+
+    Per-component counts cover only threads not in `existing`.
+    """
+    time.sleep(warmup)
+    process = psutil.Process()
+    per_thread, switches, cpu = thread_switches(existing), context_switches(), process.cpu_times()
+    time.sleep(seconds)
+    per_thread_after, switches = thread_switches(existing), context_switches() - switches
+    cpu_after = process.cpu_times()
+    used = (cpu_after.user + cpu_after.system) - (cpu.user + cpu.system)
+
+    components = {}
+    for label, prefix in COMPONENTS:
+        threads = [tid for tid, (name, _) in per_thread_after.items() if name.startswith(prefix)]
+        if threads:
+            woken = sum(per_thread_after[tid][1] - per_thread.get(tid, (None, 0))[1] for tid in threads)
+            components[label] = woken / seconds
+    # The measuring thread's own sleep is one switch
+    return (switches - 1) / seconds, used / seconds * 100, components
+
+
+def run_threaded(seconds, audio):
+    """The threading model: every subsystem waits on its own thread"""
+    existing = live_threads()
+    running = threading.Event()
+    running.set()
+
+    def main_loop():                  # JarvisAssistant._main_loop
+        while running.is_set():
+            time.sleep(1)
+            status()
+
+    def keyboard_override():          # SpeechRecognition._keyboard_override
+        while running.is_set():
+            time.sleep(0.1)
+
+    threading.Thread(target=main_loop, name="jarvis-main-loop", daemon=True).start()
+    threading.Thread(target=keyboard_override, name="jarvis-keyboard", daemon=True).start()
+    monitor, scheduler = start_components()
+    pipeline = silent_pipeline() if audio else None
+    if pipeline:
+        pipeline.start()
+    try:
+        return measure(seconds, existing)
+    finally:
+        running.clear()
+        if pipeline:
+            pipeline.stop()
+        monitor.stop_monitoring()
+        scheduler.stop()
+
+
+def run_async(seconds, audio):
+    """The async core: periodic jobs on the loop, keyboard via hook, audio via callback"""
+    existing = live_threads()
+    core = AsyncCore()
+
+    async def refresh_status():
+        status()
+
+    core.every(30, refresh_status)
+    core.start()
+    monitor, scheduler = start_components(core)
+    pipeline = silent_pipeline() if audio else None
+    if pipeline:
+        core.attach_pipeline(pipeline)
+    try:
+        return measure(seconds, existing) + (core.stats()["wakeups_per_second"],)
+    finally:
+        if pipeline:
+            pipeline.stop()
+        monitor.stop_monitoring()
+        scheduler.stop()
+        core.stop()
+
+
+def report(name, wakeups, cpu, components, extra=""):
+    print(f"{name:18} {wakeups:8.1f} wakeups/s   {cpu:6.3f}% CPU{extra}")
+    for label, _ in COMPONENTS:
+        if label in components:
+            print(f"  {label:18} {components[label]:6.1f} wakeups/s")
+        elif label in ("Metrics sampler", "Activity monitor"):
+            print(f"  {label:18}    no thread")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare idle wakeups of the threading model and the async core")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Idle period to measure per model")
+    parser.add_argument("--audio", action="store_true", help="Also stream live-paced microphone silence")
+    args = parser.parse_args()
+
+    print("JARVIS Async Core Benchmark")
+    print("=" * 60)
+    print(f"Idle for {args.seconds:.0f}s per model{' with streaming audio' if args.audio else ''}\n")
+
+    wakeups, cpu, components = run_threaded(args.seconds, args.audio)
+    report("Threading model", wakeups, cpu, components)
+    wakeups, cpu, components, loop_wakeups = run_async(args.seconds, args.audio)
+    report("Async core", wakeups, cpu, components, f"   ({loop_wakeups:.1f} loop wakeups/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Command corpus benchmark for JARVIS
+Runs CommandProcessor.process_command over a labeled synthetic corpus (and,
+optionally, commands from the activity logs) with every side effect - TTS,
+app launches, the browser, pyautogui, the camera, SMTP, os.system - replaced
+by recording fakes. Reports throughput, per-intent latency histograms and
+classification accuracy, and saves the results as JSON for comparing runs.
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+import types
+from collections import Counter
+from datetime import datetime
+
+from config import Config
+from latency_tracker import latency_tracker, percentile, DISPATCH
+
+# Latency histogram bucket upper bounds, milliseconds
+BUCKETS_MS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, float("inf")]
+
+
+class SideEffects:
+    """Every call a fake adapter received, as 'adapter.call' -> count"""
+
+    def __init__(self):
+        self.calls = Counter()
+
+    def record(self, adapter, call, *args):
+        self.calls[f"{adapter}.{call}"] += 1
+        return None
+
+
+side_effects = SideEffects()
+
+
+class FakeCamera:
+    def __init__(self, index):
+        side_effects.record("cv2", "VideoCapture", index)
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        return True, b"frame"
+
+    def release(self):
+        pass
+
+
+class FakeImage:
+    def save(self, path):
+        side_effects.record("pyautogui", "save", path)
+
+
+class FakeSMTP:
+    def __init__(self, server, port):
+        side_effects.record("smtplib", "SMTP", server, port)
+
+    def __getattr__(self, name):
+        # starttls, login, sendmail, quit
+        return lambda *args: side_effects.record("smtplib", name, *args)
+
+
+class FakeProcess:
+    def __init__(self, args, **kwargs):
+        side_effects.record("subprocess", "Popen", args)
+
+
+def install_fake_modules():
+    """cv2 and pyautogui are imported by command_processor itself, so they are faked before it loads"""
+    cv2 = types.ModuleType("cv2")
+    cv2.VideoCapture = FakeCamera
+    cv2.imwrite = lambda path, frame: side_effects.record("cv2", "imwrite", path) or True
+    pyautogui = types.ModuleType("pyautogui")
+    pyautogui.press = lambda key: side_effects.record("pyautogui", "press", key)
+    pyautogui.screenshot = lambda: side_effects.record("pyautogui", "screenshot") or FakeImage()
+    sys.modules["cv2"] = cv2
+    sys.modules["pyautogui"] = pyautogui
+
+
+def install_fakes():
+    """Import CommandProcessor with recording fakes for all of its side effects"""
+    install_fake_modules()
+    import command_processor
+    import advanced_nlp
+    import app_index
+    from tts import tts
+    from metrics_cache import metrics_cache
+    from scheduler import CommandScheduler
+    from condition_engine import ConditionEngine
+
+    command_processor.webbrowser = types.SimpleNamespace(
+        open=lambda url: side_effects.record("webbrowser", "open", url))
+    command_processor.smtplib = types.SimpleNamespace(SMTP=FakeSMTP)
+    command_processor.time = types.SimpleNamespace(sleep=lambda seconds: side_effects.record("time", "sleep", seconds))
+    command_processor.os = types.SimpleNamespace(
+        path=os.path, system=lambda command: side_effects.record("os", "system", command))
+    app_index.subprocess = types.SimpleNamespace(Popen=FakeProcess)
+
+    def speak(text, blocking=False, priority=None):
+        # Multi-step plans still collect their steps' replies into one summary
+        collected = getattr(tts._collecting, "lines", None)
+        if collected is not None:
+            collected.append(text)
+        else:
+            side_effects.record("tts", "speak", text)
+    tts.speak = speak
+
+    # Deterministic, in-memory stand-ins for state the commands touch
+    command_processor.app_index = app_index.AppIndex(sources=[], cache_path=None)
+    metrics_cache.reader = lambda: {"time": datetime.now(), "cpu": 12.5, "memory": 48.0,
+                                    "battery": 76.0, "plugged": True}
+    scheduler = CommandScheduler(path=None)
+    command_processor.scheduler = advanced_nlp.scheduler = scheduler
+    advanced_nlp.condition_engine = ConditionEngine(
+        runner=lambda action: side_effects.record("condition_engine", "run", action))
+    Config.EMAIL_CONFIG = dict(Config.EMAIL_CONFIG, sender_email="jarvis@example.com",
+                               sender_password="benchmark", recipient_email="me@example.com")
+    latency_tracker.log_path = None
+    return command_processor.command_processor
+
+
+# ---------------- Corpus ---------------- #
+VERBS = ["open", "launch", "start", "run"]
+MISHEARD = {"chrome": "crome", "notepad": "notpad", "calculator": "calculater", "firefox": "firefocks",
+            "powershell": "power shell"}
+QUERIES = ["python tutorials", "weather in london", "best pizza near me", "how to tie a tie", "cat videos",
+           "jarvis iron man", "latest news"]
+SITES = ["github.com", "wikipedia.org", "reddit.com", "stackoverflow.com"]
+FOLLOW_UPS = ["take a screenshot", "check cpu usage", "what time is it", "open notepad"]
+
+TEMPLATES = [
+    ("app", "{verb} {app}"),
+    ("app", "please {verb} {app}"),
+    ("app", "{verb} {misheard}"),
+    ("web", "search google for {query}"),
+    ("web", "search youtube for {query}"),
+    ("web", "open youtube"),
+    ("web", "go to {site}"),
+    ("camera", "take a photo"),
+    ("camera", "take a selfie"),
+    ("camera", "capture a picture of me"),
+    ("email", "send an email"),
+    ("email", "send a mail to my boss"),
+    ("system", "volume up"),
+    ("system", "turn the volume down"),
+    ("system", "mute"),
+    ("system", "lock the computer"),
+    ("screenshot", "take a screenshot"),
+    ("screenshot", "capture the screen"),
+    ("info", "check cpu usage"),
+    ("info", "how much memory is used"),
+    ("info", "battery status"),
+    ("info", "what is my cpu usage"),
+    ("time", "what time is it"),
+    ("time", "tell me the date"),
+    ("schedule", "list scheduled commands"),
+    ("schedule", "show my reminders"),
+    ("conversational", "hello"),
+    ("conversational", "how are you"),
+    ("conversational", "thank you"),
+    ("conversational", "who are you"),
+    ("question", "what is the weather like"),
+    ("question", "why is the sky blue"),
+    ("scheduled", "in {number} minutes {follow_up}"),
+    ("conditional", "if battery is below {number} then lock the computer"),
+    ("conditional", "when cpu is above {number} do take a screenshot"),
+    ("multi_step", "{verb} {app} and take a screenshot"),
+    ("multi_step", "{verb} {app} and then check cpu usage"),
+    ("unknown", "huh"),
+    ("unknown", "banana telescope"),
+]
+
+
+def synthetic_corpus(count, seed=0):
+    """[(command, expected intent)] sampled from TEMPLATES"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        intent, template = rng.choice(TEMPLATES)
+        app = rng.choice(list(Config.APPS))
+        command = template.format(
+            verb=rng.choice(VERBS), app=app, misheard=MISHEARD.get(app, app), query=rng.choice(QUERIES),
+            site=rng.choice(SITES), number=rng.randint(2, 90), follow_up=rng.choice(FOLLOW_UPS))
+        corpus.append((command, intent))
+    return corpus
+
+
+LOGGED_COMMAND = re.compile(r"Voice command executed - '(.+)' - ")
+
+
+def logged_corpus(pattern):
+    """[(command, None)] for every distinct command in the activity logs"""
+    seen = {}
+    for path in sorted(glob.glob(pattern)):
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                match = LOGGED_COMMAND.search(line)
+                if match:
+                    seen.setdefault(match.group(1).strip(), None)
+    return [(command, None) for command in seen if command]
+
+
+def load_corpus(path):
+    """[(command, expected intent or None)] from a JSONL file of {"command", "intent"}"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [(entry["command"], entry.get("intent")) for entry in map(json.loads, f) if entry.get("command")]
+
+
+# ---------------- Running ---------------- #
+def dispatched_intent():
+    """The handler the last finished interaction was dispatched to"""
+    if not latency_tracker.spans:
+        return "none"
+    for event, _, detail in latency_tracker.spans[-1].marks:
+        if event == DISPATCH:
+            return detail
+    return "none"
+
+
+def run_corpus(processor, corpus):
+    """[(command, expected, got, seconds)]"""
+    results = []
+    for command, expected in corpus:
+        start = time.perf_counter()
+        processor.process_command(command)
+        seconds = time.perf_counter() - start
+        results.append((command, expected, dispatched_intent(), seconds))
+    return results
+
+
+def histogram(values_ms):
+    counts = [0] * len(BUCKETS_MS)
+    for value in values_ms:
+        for index, bound in enumerate(BUCKETS_MS):
+            if value <= bound:
+                counts[index] += 1
+                break
+    return {f"<={bound}ms" if bound != float("inf") else f">{BUCKETS_MS[-2]}ms": count
+            for bound, count in zip(BUCKETS_MS, counts)}
+
+
+def summarize_results(results, total_seconds, corpus_sizes):
+    by_intent = {}
+    for _, _, got, seconds in results:
+        by_intent.setdefault(got, []).append(seconds * 1000)
+
+    intents = {}
+    for intent, values in sorted(by_intent.items()):
+        values.sort()
+        intents[intent] = {
+            "count": len(values),
+            "mean_ms": round(sum(values) / len(values), 4),
+            "p50_ms": round(percentile(values, 0.50), 4),
+            "p95_ms": round(percentile(values, 0.95), 4),
+            "p99_ms": round(percentile(values, 0.99), 4),
+            "histogram": histogram(values),
+        }
+
+    labeled = [(command, expected, got) for command, expected, got, _ in results if expected is not None]
+    per_expected = {}
+    confusions = Counter()
+    for command, expected, got in labeled:
+        entry = per_expected.setdefault(expected, {"count": 0, "correct": 0})
+        entry["count"] += 1
+        if got == expected:
+            entry["correct"] += 1
+        else:
+            confusions[f"{expected} -> {got}"] += 1
+    correct = sum(entry["correct"] for entry in per_expected.values())
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "corpus": corpus_sizes,
+        "commands": len(results),
+        "total_seconds": round(total_seconds, 4),
+        "throughput_per_second": round(len(results) / total_seconds, 1) if total_seconds else None,
+        "accuracy": round(correct / len(labeled), 4) if labeled else None,
+        "accuracy_by_intent": {intent: dict(entry, accuracy=round(entry["correct"] / entry["count"], 4))
+                               for intent, entry in sorted(per_expected.items())},
+        "confusions": dict(confusions.most_common()),
+        "intents": intents,
+        "side_effects": dict(sorted(side_effects.calls.items())),
+    }
+
+
+def print_report(summary):
+    print(f"{summary['commands']} commands in {summary['total_seconds']:.2f}s = "
+          f"{summary['throughput_per_second']:.0f} commands/s")
+    if summary["accuracy"] is not None:
+        print(f"Classification accuracy: {summary['accuracy'] * 100:.1f}%")
+    print()
+    print(f"{'intent':16} {'count':>6} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8}   (ms)")
+    for intent, stats in summary["intents"].items():
+        print(f"{intent:16} {stats['count']:6d} {stats['mean_ms']:8.3f} {stats['p50_ms']:8.3f} "
+              f"{stats['p95_ms']:8.3f} {stats['p99_ms']:8.3f}")
+
+    print("\nLatency histograms (commands per bucket)")
+    labels = list(next(iter(summary["intents"].values()))["histogram"]) if summary["intents"] else []
+    print(f"{'intent':16} " + " ".join(f"{label.replace('<=', '').replace('ms', ''):>6}" for label in labels))
+    for intent, stats in summary["intents"].items():
+        print(f"{intent:16} " + " ".join(f"{count:6d}" for count in stats["histogram"].values()))
+
+    if summary["confusions"]:
+        print("\nMisclassified (expected -> dispatched)")
+        for confusion, count in list(summary["confusions"].items())[:10]:
+            print(f"  {confusion:36} {count}")
+    print(f"\nSide effects recorded: {sum(summary['side_effects'].values())} "
+          f"({', '.join(f'{name} x{count}' for name, count in list(summary['side_effects'].items())[:6])}, ...)")
+
+
+def print_comparison(summary, previous_path):
+    with open(previous_path, "r", encoding="utf-8") as f:
+        previous = json.load(f)
+    print(f"\nCompared with {previous_path} ({previous['timestamp']})")
+    if previous.get("throughput_per_second") and summary["throughput_per_second"]:
+        change = summary["throughput_per_second"] / previous["throughput_per_second"]
+        print(f"  throughput   {previous['throughput_per_second']:>10.0f} -> {summary['throughput_per_second']:.0f} "
+              f"commands/s ({change:.2f}x)")
+    if previous.get("accuracy") is not None and summary["accuracy"] is not None:
+        print(f"  accuracy     {previous['accuracy'] * 100:>9.1f}% -> {summary['accuracy'] * 100:.1f}%")
+    for intent, stats in summary["intents"].items():
+        before = previous.get("intents", {}).get(intent)
+        if before:
+            print(f"  {intent:12} p50 {before['p50_ms']:8.3f} -> {stats['p50_ms']:.3f} ms, "
+                  f"p95 {before['p95_ms']:8.3f} -> {stats['p95_ms']:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CommandProcessor over a command corpus")
+    parser.add_argument("--count", type=int, default=5000, help="Synthetic commands to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--logs", action="store_true", help="Also replay commands found in the activity logs")
+    parser.add_argument("--corpus", help="JSONL file of {\"command\": ..., \"intent\": ...} to add")
+    parser.add_argument("--warmup", type=int, default=100, help="Unmeasured commands run first")
+    parser.add_argument("--output", help="Where to write the JSON results (default: logs/command_benchmark_*.json)")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    parser.add_argument("--verbose", action="store_true", help="Keep JARVIS logging enabled")
+    args = parser.parse_args()
+
+    print("JARVIS Command Processor Benchmark")
+    print("=" * 60)
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+    processor = install_fakes()
+
+    corpus = synthetic_corpus(args.count, args.seed)
+    sizes = {"synthetic": len(corpus)}
+    if args.logs:
+        logged = logged_corpus(os.path.join(Config.LOGS_DIR, "jarvis_activity_*.txt"))
+        corpus += logged
+        sizes["logged"] = len(logged)
+    if args.corpus:
+        extra = load_corpus(args.corpus)
+        corpus += extra
+        sizes["file"] = len(extra)
+
+    run_corpus(processor, synthetic_corpus(args.warmup, args.seed + 1))
+    side_effects.calls.clear()
+    latency_tracker.reset()
+
+    start = time.perf_counter()
+    results = run_corpus(processor, corpus)
+    summary = summarize_results(results, time.perf_counter() - start, sizes)
+    logging.disable(logging.NOTSET)
+
+    print_report(summary)
+    output = args.output or os.path.join(
+        Config.LOGS_DIR, f"command_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(f"\nResults saved to {output}")
+    if args.compare:
+        print_comparison(summary, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+End-to-end latency benchmark for JARVIS
+Replays "<wake word> <command>" through SpeechRecognition at real-time pace
+and reports how long after the speech ended the hotword and the command were
+handled. No microphone needed.
+
+With a recording, the real Vosk models recognize it. Without one, a
+synthetic clip (a tone burst the VAD gate passes) is recognized by stand-in
+engines, so the capture -> VAD -> hotword -> command path runs anywhere.
+"""
+
+import argparse
+import math
+import os
+import random
+import struct
+import sys
+import tempfile
+import threading
+import wave
+from concurrent.futures import Future
+
+from audio_source import WavFileSource
+from speech_recognition_safe import SpeechRecognition
+from latency_tracker import latency_tracker, ACTION_COMPLETE
+import speech_engines
+
+CHUNK_FRAMES = 4096
+
+
+class ScriptedSpotter(speech_engines.RecognizerEngine):
+    """Hears the wake word in the third speech chunk, like the grammar spotter would"""
+
+    name = "spotter"
+
+    def __init__(self):
+        self.fed = 0
+
+    def feed(self, chunk):
+        self.fed += 1
+        if self.fed == 3:
+            return speech_engines.RecognitionResult("jarvis", self.name, is_final=False)
+        return None
+
+    def finalize(self):
+        return None
+
+    def reset(self):
+        self.fed = 0
+
+
+class ScriptedRecognizer(speech_engines.BufferedEngine):
+    """Transcribes every segment as the same command"""
+
+    name = "recognizer"
+
+    def transcribe(self, audio_data):
+        return "jarvis open chrome"
+
+
+def write_synthetic_clip(path, sample_rate=16000):
+    """1 s of room noise, 1.5 s of tone ("jarvis open chrome" in one breath), 1.5 s of room noise"""
+    rng = random.Random(9)
+    seconds = [(False, 1.0), (True, 1.5), (False, 1.5)]
+    frames = []
+    for loud, length in seconds:
+        for i in range(int(length * sample_rate)):
+            value = rng.gauss(0, 50)
+            if loud:
+                value += 6000 * math.sin(2 * math.pi * 180 * i / sample_rate)
+            frames.append(max(-32768, min(32767, int(value))))
+    with wave.open(path, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(struct.pack(f"<{len(frames)}h", *frames))
+
+
+def use_stand_in_engines(recognition):
+    """Skip model loading: scripted engines take the place of Vosk"""
+    recognition.model = object()
+    recognition.recognizer = ScriptedRecognizer()
+    recognition.hotword_spotter = ScriptedSpotter()
+    recognition._enter_hotword_mode()
+    for name in ("models_ready", "whisper_ready"):
+        ready = Future()
+        ready.set_result(None)
+        setattr(recognition, name, ready)
+    recognition._initialize_audio_source()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure hotword -> command latency from a recording")
+    parser.add_argument("wav", nargs="?",
+                        help="16 kHz mono WAV of a wake word followed by a command, recognized with Vosk "
+                             "(default: a synthetic clip and stand-in engines)")
+    parser.add_argument("--fast", action="store_true",
+                        help="Replay as fast as possible instead of in real time")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for models")
+    args = parser.parse_args()
+
+    print("JARVIS End-to-End Latency Benchmark")
+    print("=" * 50)
+
+    if args.wav and (not speech_engines.VOSK_AVAILABLE or not speech_engines.find_vosk_model_path()):
+        print("❌ Vosk or its model is not installed - nothing to measure")
+        return 1
+
+    commands = []
+    handled = threading.Event()
+
+    def on_command(command):
+        # Stands in for command_processor, which closes the interaction's span
+        commands.append(command)
+        latency_tracker.mark(ACTION_COMPLETE)
+        latency_tracker.finish(command=command)
+        handled.set()
+
+    latency_tracker.reset()
+    path = args.wav
+    if not path:
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        write_synthetic_clip(path)
+    source = WavFileSource(path, CHUNK_FRAMES, realtime=not args.fast)
+    recognition = SpeechRecognition(source=source, command_handler=on_command)
+    try:
+        if args.wav:
+            # Load first so replay (and the clock) starts only once models are ready
+            recognition.load_models_async().result(timeout=args.timeout)
+            if not recognition.model:
+                print("❌ Vosk model failed to load")
+                return 1
+        else:
+            use_stand_in_engines(recognition)
+        recognition.start_listening()
+        recognition.pipeline.wait()
+        handled.wait(1.0)
+    finally:
+        recognition.cleanup()
+        source.close()
+        if not args.wav:
+            os.unlink(path)
+
+    stats = recognition.pipeline.get_stats()
+    print(f"{args.wav or 'Synthetic clip (stand-in engines)'}: {stats['audio_seconds']:.2f}s of audio, "
+          f"{stats['segments']} speech segments")
+    if stats["segments"] == 0:
+        print(f"❌ The VAD gate never opened (threshold {recognition.vad.energy_threshold}) - use a louder recording")
+        return 1
+    if recognition.last_hotword_latency is None:
+        print("❌ No hotword detected in the recording")
+        return 1
+    print(f"Hotword handled  {recognition.last_hotword_latency * 1000:8.1f} ms after the wake-word chunk")
+    if not commands:
+        print("❌ No command recognized after the hotword")
+        return 1
+    print(f"Command handled  {recognition.last_command_latency * 1000:8.1f} ms after speech ended")
+    print(f"Command: '{commands[0]}'")
+
+    spans = [span for span in latency_tracker.spans if "hotword" in span.stage_durations()]
+    if not spans:
+        print("❌ No hotword -> action span finished")
+        return 1
+    print()
+    print(latency_tracker.report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
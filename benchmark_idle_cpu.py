@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Idle CPU benchmark for JARVIS
+Replays an hour of mostly-silent audio with short speech-like bursts and
+measures recognizer CPU for the old single-tier loop (full Vosk recognizer
+plus a JSON-parsed PartialResult on every chunk) versus the two-tier setup
+(VAD + grammar-restricted hotword spotter)
+"""
+
+import argparse
+import json
+import struct
+import time
+
+import numpy as np
+
+from config import Config
+from audio_source import WavFileSource
+from recognition_pipeline import RecognitionPipeline
+import speech_engines
+
+CHUNK_FRAMES = 4096
+
+
+class SyntheticSource:
+    """Low background noise with a short voiced burst every minute"""
+
+    def __init__(self, seconds=3600, speech_every=60.0, speech_seconds=4.0, sample_rate=16000):
+        self.sample_rate = sample_rate
+        self.total_chunks = int(seconds * sample_rate / CHUNK_FRAMES)
+        self.position = 0
+        chunk_seconds = CHUNK_FRAMES / sample_rate
+        self.chunks_per_cycle = max(1, int(speech_every / chunk_seconds))
+        self.speech_chunks = max(1, int(speech_seconds / chunk_seconds))
+
+        rng = np.random.default_rng(0)
+        t = np.arange(CHUNK_FRAMES) / sample_rate
+        self.silence = [(rng.normal(0, 40, CHUNK_FRAMES)).astype(np.int16).tobytes() for _ in range(8)]
+        self.speech = []
+        for i in range(8):
+            f0 = 110 + 15 * i
+            voiced = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+            envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+            self.speech.append((voiced * envelope * 3000).astype(np.int16).tobytes())
+
+    def read(self):
+        if self.position >= self.total_chunks:
+            return None
+        index = self.position
+        self.position += 1
+        if index % self.chunks_per_cycle < self.speech_chunks:
+            return self.speech[index % len(self.speech)]
+        return self.silence[index % len(self.silence)]
+
+    def close(self):
+        pass
+
+
+def make_source(args):
+    if args.wav:
+        return WavFileSource(args.wav, CHUNK_FRAMES)
+    return SyntheticSource(seconds=args.seconds)
+
+
+def legacy_loop(source, model):
+    """The original _process_audio: RMS gate, full recognizer, JSON partial every chunk"""
+    import vosk
+    recognizer = vosk.KaldiRecognizer(model, Config.SAMPLE_RATE)
+    audio_bytes = 0
+    while True:
+        data = source.read()
+        if data is None:
+            break
+        audio_bytes += len(data)
+        audio_data = struct.unpack(f'{len(data)//2}h', data)
+        rms = (sum(x**2 for x in audio_data) / len(audio_data)) ** 0.5
+        if rms > 500:
+            if recognizer.AcceptWaveform(data):
+                json.loads(recognizer.Result())
+            else:
+                json.loads(recognizer.PartialResult())
+    return audio_bytes / 2 / Config.SAMPLE_RATE
+
+
+def pipeline_loop(source, engines):
+    """Run the VAD-gated pipeline with the given engines"""
+    stats = RecognitionPipeline(source, engines).run()
+    return stats["audio_seconds"], stats
+
+
+def report(name, cpu, audio_seconds):
+    print(f"{name:24} {cpu:8.2f}s CPU for {audio_seconds / 60:6.1f} min of audio "
+          f"= {cpu / audio_seconds * 100:6.3f}% of one core")
+
+
+def timed(func, *args):
+    start = time.process_time()
+    result = func(*args)
+    return time.process_time() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure idle recognizer CPU")
+    parser.add_argument("wav", nargs="?", help="Replay this 16 kHz mono WAV instead of synthetic audio")
+    parser.add_argument("--seconds", type=int, default=3600, help="Length of the synthetic recording")
+    args = parser.parse_args()
+
+    print("JARVIS Idle CPU Benchmark")
+    print("=" * 60)
+
+    cpu, (audio_seconds, stats) = timed(pipeline_loop, make_source(args), [])
+    report("VAD only", cpu, audio_seconds)
+    print(f"{'':24} {stats['vad']['speech_chunks']} of {stats['chunks_captured']} chunks "
+          f"reach the recognizer ({stats['segments']} segments)")
+
+    model = speech_engines.load_vosk_model()
+    if not model:
+        print("❌ No Vosk model installed - skipping recognizer timings")
+        return
+
+    cpu, audio_seconds = timed(legacy_loop, make_source(args), model)
+    report("Before: single tier", cpu, audio_seconds)
+
+    spotter_model = speech_engines.load_vosk_model(prefer_small=True) or model
+    spotter = speech_engines.HotwordSpotter(spotter_model, Config.WAKE_WORDS, Config.SAMPLE_RATE)
+    cpu, (audio_seconds, _) = timed(pipeline_loop, make_source(args), [spotter])
+    report("After: VAD + spotter", cpu, audio_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Intent routing benchmark for JARVIS
+Classifies the commands found in the activity logs (plus a built-in set of
+typical commands) with the old substring predicate chain and with the
+compiled intent router, and reports commands/sec and where they disagree
+"""
+
+import argparse
+import glob
+import os
+import re
+import time
+
+from config import Config
+from intent_router import intent_router
+
+COMMAND_PATTERN = re.compile(r"Voice command executed - '([^']*)'")
+
+BUILTIN_COMMANDS = [
+    "hello jarvis", "how are you", "thank you", "what can you do", "goodbye",
+    "open chrome", "launch notepad", "start calculator", "open file explorer", "run task manager",
+    "open google", "search youtube for lo-fi music", "go to github.com", "search for weather tomorrow",
+    "take a picture", "take a selfie", "open camera and click a picture of me",
+    "send an email", "send photo by email",
+    "volume up", "mute", "lock the computer", "minimize all windows", "close notepad",
+    "take a screenshot", "capture the screen",
+    "what is the cpu usage", "tell me the battery level", "how much memory is used",
+    "what time is it", "what's the date today", "what day is it",
+    "this is great", "play some music",
+]
+
+# The predicate chain CommandProcessor used before the router, in its order
+LEGACY_CHAIN = [
+    ("conversational", lambda c: any(k in c for k in [
+        "hello", "hi", "hey", "good morning", "good afternoon", "good evening",
+        "how are you", "what's up", "thanks", "thank you", "bye", "goodbye",
+        "who are you", "what can you do", "help", "what time", "what day"])),
+    ("app", lambda c: any(k in c for k in ["open", "launch", "start", "run"]) and
+        any(app in c for app in Config.APPS.keys())),
+    ("web", lambda c: any(k in c for k in ["open", "browse", "go to", "search", "youtube", "google"])),
+    ("camera", lambda c: any(k in c for k in ["take", "photo", "picture", "capture", "camera", "selfie"])),
+    ("email", lambda c: any(k in c for k in ["send", "email", "mail", "message"])),
+    ("system", lambda c: any(k in c for k in ["shutdown", "restart", "sleep", "lock", "volume", "minimize", "close"])),
+    ("screenshot", lambda c: any(k in c for k in ["screenshot", "screen capture", "capture screen"])),
+    ("info", lambda c: any(k in c for k in ["what is", "tell me", "system info", "cpu", "memory", "battery"])),
+    ("time", lambda c: any(k in c for k in ["time", "date", "what time", "what day"])),
+]
+
+
+def legacy_route(command):
+    for intent, matches in LEGACY_CHAIN:
+        if matches(command):
+            return intent
+    return None
+
+
+def logged_commands(pattern):
+    """Every voice command recorded in the activity logs"""
+    commands = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            commands.extend(match.group(1).lower().strip() for match in COMMAND_PATTERN.finditer(f.read()))
+    return commands
+
+
+def measure(route, commands, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for command in commands:
+            route(command)
+    return len(commands) * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark intent routing throughput")
+    parser.add_argument("--logs", default=os.path.join(Config.LOGS_DIR, "jarvis_activity_*.txt"),
+                        help="Glob of activity logs to take commands from")
+    parser.add_argument("--repeat", type=int, default=2000, help="Passes over the command corpus")
+    parser.add_argument("--show-changes", action="store_true", help="List commands that now route differently")
+    args = parser.parse_args()
+
+    logged = logged_commands(args.logs)
+    commands = logged + BUILTIN_COMMANDS
+
+    print("JARVIS Intent Routing Benchmark")
+    print("=" * 50)
+    print(f"Corpus: {len(logged)} logged + {len(BUILTIN_COMMANDS)} built-in commands, {args.repeat} passes")
+
+    legacy = measure(legacy_route, commands, args.repeat)
+    router = measure(intent_router.best, commands, args.repeat)
+    print(f"Predicate chain  {legacy:12,.0f} commands/sec")
+    print(f"Intent router    {router:12,.0f} commands/sec ({router / legacy:.2f}x)")
+
+    changed = [(c, legacy_route(c), intent_router.best(c)) for c in dict.fromkeys(commands)
+               if legacy_route(c) != intent_router.best(c)]
+    print(f"{len(changed)} of {len(dict.fromkeys(commands))} distinct commands route differently")
+    if args.show_changes:
+        for command, old, new in changed:
+            print(f"  {command!r:45} {old or 'unknown':>14} -> {new or 'unknown'}")
+
+
+if __name__ == "__main__":
+    main()
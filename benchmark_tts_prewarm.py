@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+TTS pre-warm benchmark for JARVIS
+Serves ElevenLabs from a local stub with a fixed synthesis delay and
+measures hotword -> acknowledgment audio (the latency tracker's "acknowledge"
+stage) over a run of wake-ups, first with a cold speech cache and then after
+pre-warming the personality phrases at startup
+"""
+
+import argparse
+import json
+import logging
+import random
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import Config
+from conversation_context import jarvis_personality, conversation_context
+from latency_tracker import latency_tracker, HOTWORD
+
+
+class SlowElevenLabs(BaseHTTPRequestHandler):
+    """Answers text-to-speech POSTs after `delay` seconds"""
+
+    delay = 0.3
+    requests = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        SlowElevenLabs.requests += 1
+        time.sleep(self.delay)
+        audio = b"ID3" + body["text"].encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Content-Length", str(len(audio)))
+        self.end_headers()
+        self.wfile.write(audio)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(wakeups, prewarm, seed):
+    """(acknowledge stage summary, synthesis requests during wake-ups)"""
+    from tts import TextToSpeech
+    directory = tempfile.mkdtemp()
+    Config.TTS_CACHE_DIR = directory
+    try:
+        engine = TextToSpeech()
+        engine._play_audio_bytes = lambda data: None
+        if prewarm:
+            engine.prewarm(jarvis_personality.common_phrases())
+        SlowElevenLabs.requests = 0
+        latency_tracker.spans.clear()
+        random.seed(seed)
+        for _ in range(wakeups):
+            latency_tracker.begin("voice")
+            latency_tracker.mark(HOTWORD)
+            engine.speak(jarvis_personality.get_acknowledgment(conversation_context), blocking=True)
+            latency_tracker.finish()
+        return latency_tracker.summary()["acknowledge"], SlowElevenLabs.requests
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare hotword -> acknowledgment latency with and without TTS pre-warm")
+    parser.add_argument("--wakeups", type=int, default=20, help="Hotword activations per run")
+    parser.add_argument("--delay", type=float, default=0.3, help="Simulated ElevenLabs synthesis time in seconds")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the acknowledgment choice")
+    parser.add_argument("--verbose", action="store_true", help="Keep JARVIS logging enabled")
+    args = parser.parse_args()
+
+    print("JARVIS TTS Pre-warm Benchmark")
+    print("=" * 60)
+    print(f"{args.wakeups} wake-ups, {args.delay * 1000:.0f} ms simulated synthesis\n")
+
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+    SlowElevenLabs.delay = args.delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowElevenLabs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    Config.ELEVENLABS_API_KEY = "benchmark"
+    Config.ELEVENLABS_API_URL = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    Config.TTS_ENGINE_ORDER = ["elevenlabs"]
+    Config.ELEVENLABS_STREAMING = False         # Whole responses; playback is not measured here
+    latency_tracker.log_path = None
+    try:
+        for label, prewarm in (("Cold cache", False), ("Pre-warmed", True)):
+            stage, synthesized = run(args.wakeups, prewarm, args.seed)
+            print(f"{label:12} p50 {stage['p50']:8.2f} ms   p95 {stage['p95']:8.2f} ms   "
+                  f"p99 {stage['p99']:8.2f} ms   ({synthesized} synthesized on the critical path)")
+    finally:
+        server.shutdown()
+        logging.disable(logging.NOTSET)
+
+
+if __name__ == "__main__":
+    main()
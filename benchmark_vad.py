@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+VAD benchmark for JARVIS
+Replays a synthetic clip (tone "words" between stretches of room noise and
+hiss), or a 16-bit mono WAV file, through the old struct/RMS gate and the new
+VoiceActivityDetector and reports chunks/sec and CPU per second of audio
+"""
+
+import argparse
+import math
+import random
+import struct
+import sys
+import time
+import wave
+
+from vad import VoiceActivityDetector
+
+CHUNK_FRAMES = 4096
+
+
+def load_chunks(path, repeat):
+    """Load a 16-bit mono WAV file as a list of fixed-size chunks"""
+    with wave.open(path, 'rb') as wav_file:
+        if wav_file.getsampwidth() != 2 or wav_file.getnchannels() != 1:
+            raise ValueError("Benchmark expects 16-bit mono audio")
+        sample_rate = wav_file.getframerate()
+        frames = wav_file.readframes(wav_file.getnframes())
+
+    chunk_bytes = CHUNK_FRAMES * 2
+    chunks = [frames[i:i + chunk_bytes] for i in range(0, len(frames), chunk_bytes)]
+    chunks = [chunk for chunk in chunks if len(chunk) == chunk_bytes] * repeat
+    audio_seconds = len(chunks) * CHUNK_FRAMES / sample_rate
+    return chunks, audio_seconds
+
+
+def synthetic_chunks(repeat, sample_rate=16000, seed=7):
+    """Quiet, spoken and hissing chunks in a fixed pattern the gate should cut into segments"""
+    rng = random.Random(seed)
+
+    def chunk(kind):
+        if kind == "tone":
+            frequency = rng.uniform(150, 300)
+            samples = (4000 * math.sin(2 * math.pi * frequency * i / sample_rate) + rng.gauss(0, 100)
+                       for i in range(CHUNK_FRAMES))
+        else:
+            level = 3000 if kind == "hiss" else 50
+            samples = (rng.gauss(0, level) for _ in range(CHUNK_FRAMES))
+        return struct.pack(f"<{CHUNK_FRAMES}h", *(max(-32768, min(32767, int(s))) for s in samples))
+
+    # ~4 s of audio holding one word and a burst of hiss
+    pattern = ["quiet"] * 2 + ["tone"] * 3 + ["quiet"] * 4 + ["hiss"] * 2 + ["quiet"] * 4
+    chunks = [chunk(kind) for kind in pattern] * repeat
+    return chunks, len(chunks) * CHUNK_FRAMES / sample_rate
+
+
+def legacy_gate(chunks, noise_threshold=500):
+    """The original _listen_loop gate: struct.unpack + generator sum"""
+    passed = 0
+    for data in chunks:
+        audio_data = struct.unpack(f'{len(data)//2}h', data)
+        rms = (sum(x**2 for x in audio_data) / len(audio_data)) ** 0.5
+        if rms > noise_threshold:
+            passed += 1
+    return passed
+
+
+def vad_gate(chunks, vad):
+    """The new gate: VoiceActivityDetector.process"""
+    passed = 0
+    for data in chunks:
+        passed += len(vad.process(data))
+    return passed
+
+
+def run(name, func, chunks, audio_seconds):
+    """Time one gate and print a summary line"""
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    passed = func(chunks)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+
+    print(f"{name:8} {len(chunks) / wall:12.0f} chunks/s "
+          f"{cpu / audio_seconds * 1000:10.3f} ms CPU per audio second "
+          f"({passed} chunks forwarded)")
+    return cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JARVIS voice activity detection")
+    parser.add_argument("wav", nargs="?", help="16 kHz mono WAV to replay (default: a synthetic clip)")
+    parser.add_argument("--repeat", type=int, default=50, help="Times to replay the recording")
+    args = parser.parse_args()
+
+    if args.wav:
+        chunks, audio_seconds = load_chunks(args.wav, args.repeat)
+        if not chunks:
+            print(f"❌ {args.wav} is shorter than one {CHUNK_FRAMES}-frame chunk")
+            sys.exit(1)
+    else:
+        chunks, audio_seconds = synthetic_chunks(args.repeat)
+
+    print("JARVIS VAD Benchmark")
+    print("=" * 50)
+    print(f"Replaying {len(chunks)} chunks ({audio_seconds:.1f}s of audio) from {args.wav or 'a synthetic clip'}")
+    print()
+
+    vad = VoiceActivityDetector()
+    legacy_cpu = run("legacy", legacy_gate, chunks, audio_seconds)
+    vad_cpu = run("vad", lambda c: vad_gate(c, vad), chunks, audio_seconds)
+
+    stats = vad.get_stats()
+    print()
+    print(f"VAD backend: {stats['backend']}, "
+          f"avg {stats['avg_cost_us']:.1f}us/chunk, max {stats['max_cost_us']:.1f}us/chunk, "
+          f"{stats['segments']} speech segments")
+    if vad_cpu > 0:
+        print(f"Speedup: {legacy_cpu / vad_cpu:.1f}x less CPU")
+    if stats["segments"] == 0:
+        # Nothing crossed the gate, so the numbers above only cover the silence path
+        print(f"❌ No speech detected (threshold {vad.energy_threshold}); use a louder clip")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
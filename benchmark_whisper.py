@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Whisper input-path benchmark for JARVIS
+Compares the old temp-WAV + ffmpeg path with feeding Whisper a float32
+array converted in memory, on test_recording.wav
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import wave
+
+import speech_engines
+from speech_engines import pcm16_to_float32
+
+
+def load_pcm(path):
+    """Read a 16-bit mono WAV file into raw PCM bytes"""
+    with wave.open(path, 'rb') as wav_file:
+        if wav_file.getsampwidth() != 2 or wav_file.getnchannels() != 1:
+            raise ValueError("Benchmark expects 16-bit mono audio")
+        return wav_file.readframes(wav_file.getnframes()), wav_file.getframerate()
+
+
+def file_input(audio_data, sample_rate):
+    """The old path: write a temp WAV and let Whisper decode it with ffmpeg"""
+    import whisper
+
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+        temp_path = temp_file.name
+    try:
+        with wave.open(temp_path, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframes(audio_data)
+        return whisper.load_audio(temp_path)
+    finally:
+        os.unlink(temp_path)
+
+
+def memory_input(audio_data, sample_rate):
+    """The new path: convert int16 PCM straight to float32"""
+    return pcm16_to_float32(audio_data, sample_rate)
+
+
+def measure(func, repeat):
+    """Return per-call latencies in milliseconds"""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name, latencies):
+    print(f"{name:22} mean {statistics.mean(latencies):9.2f} ms   "
+          f"p50 {statistics.median(latencies):9.2f} ms   max {max(latencies):9.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Whisper input paths")
+    parser.add_argument("wav", nargs="?", default="test_recording.wav", help="16-bit mono WAV")
+    parser.add_argument("--model", default="base", help="Whisper model size")
+    parser.add_argument("--repeat", type=int, default=5, help="Iterations per path")
+    args = parser.parse_args()
+
+    audio_data, sample_rate = load_pcm(args.wav)
+    print("JARVIS Whisper Input Benchmark")
+    print("=" * 50)
+    print(f"{args.wav}: {len(audio_data) / 2 / sample_rate:.2f}s of audio")
+    print()
+
+    report("prep (in-memory)", measure(lambda: memory_input(audio_data, sample_rate), args.repeat * 20))
+
+    if not speech_engines.WHISPER_AVAILABLE:
+        print("❌ Whisper not installed - skipping file path and transcription timings")
+        return
+
+    try:
+        report("prep (temp WAV+ffmpeg)", measure(lambda: file_input(audio_data, sample_rate), args.repeat * 20))
+    except Exception as e:
+        print(f"❌ File path failed (is ffmpeg installed?): {e}")
+
+    model = speech_engines.load_whisper_model(args.model)
+    if not model:
+        print("❌ Whisper model could not be loaded")
+        return
+
+    fp16 = speech_engines.WhisperEngine(model)._use_fp16()
+    print()
+    try:
+        report("transcribe (file)", measure(
+            lambda: model.transcribe(file_input(audio_data, sample_rate), fp16=fp16), args.repeat))
+    except Exception as e:
+        print(f"❌ File path transcription failed: {e}")
+    report("transcribe (memory)", measure(
+        lambda: model.transcribe(memory_input(audio_data, sample_rate), fp16=fp16), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Command executor for JARVIS
+Recognized, scheduled and rule-triggered commands run on one bounded worker
+pool instead of a thread each. Commands wait in a bounded queue, intents that
+share a device or state (camera, screenshots, email) run one at a time, a new
+voice command supersedes older ones still waiting, and queue depth and wait
+times are recorded so backpressure is visible
+"""
+
+import threading
+import time
+from collections import deque
+from config import Config
+from logger import logger
+from intent_router import intent_router
+from latency_tracker import latency_tracker
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Only commands the user just spoke go stale; timers and rules always run
+VOICE = "voice"
+
+
+class CommandTicket:
+    """A submitted command; wait() blocks until it has run or been cancelled"""
+
+    def __init__(self, ticket_id, command, intent, lane, source, run):
+        self.id = ticket_id
+        self.command = command
+        self.intent = intent
+        self.lane = lane
+        self.source = source
+        self.state = PENDING
+        self.reason = None              # Why it was cancelled
+        self.result = None
+        self.error = None
+        self.submitted = time.monotonic()
+        self.started = None
+        self._run = run
+        # Closes the submitter's latency span if the command never runs
+        self._abandon = latency_tracker.bind(lambda reason: latency_tracker.finish(status=reason))
+        self._done = threading.Event()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def done(self):
+        return self._done.is_set()
+
+    def _cancel(self, reason):
+        self.state = CANCELLED
+        self.reason = reason
+        self._abandon(reason)
+        self._done.set()
+
+
+class CommandExecutor:
+    """Bounded queue and worker pool for commands, with per-lane concurrency limits"""
+
+    def __init__(self, max_workers=None, max_queue=None, stale_after=None, lanes=None, limits=None,
+                 classify=None, runner=None):
+        self.max_workers = max_workers or Config.COMMAND_MAX_WORKERS
+        self.max_queue = Config.COMMAND_MAX_QUEUE if max_queue is None else max_queue
+        self.stale_after = Config.COMMAND_STALE_SECONDS if stale_after is None else stale_after
+        self.lanes = Config.COMMAND_LANES if lanes is None else lanes          # intent -> lane
+        self.limits = Config.COMMAND_LANE_LIMITS if limits is None else limits  # lane -> max running
+        self.classify = classify or intent_router.best
+        self.runner = runner
+        self.pending = deque()
+        self.running = {}               # lane -> commands running in it
+        self.counts = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0,
+                       "superseded": 0, "expired": 0}
+        self.max_queued = 0
+        self.total_wait = 0.0
+        self._next_id = 1
+        self._workers = []
+        self._idle = 0
+        self._shutdown = False
+        self._condition = threading.Condition()
+
+    def lane_of(self, intent):
+        """(lane, most commands running in it at once) for an intent"""
+        lane = self.lanes.get(intent, intent)
+        return lane, self.limits.get(lane, self.max_workers)
+
+    def submit(self, command, source=VOICE, runner=None):
+        """Queue a command; returns its ticket, or None if the queue is full"""
+        intent = self.classify(command)
+        lane, _ = self.lane_of(intent)
+        run = latency_tracker.bind(runner or self.runner or self._default_runner)
+        superseded = []
+        with self._condition:
+            if self._shutdown:
+                return None
+            if source == VOICE:
+                # The user has moved on; whatever they said before and is still waiting is stale
+                superseded = [ticket for ticket in self.pending if ticket.source == VOICE]
+                for ticket in superseded:
+                    self.pending.remove(ticket)
+                self.counts["superseded"] += len(superseded)
+            if len(self.pending) >= self.max_queue:
+                self.counts["rejected"] += 1
+                ticket = None
+            else:
+                ticket = CommandTicket(self._next_id, command, intent, lane, source, run)
+                self._next_id += 1
+                self.pending.append(ticket)
+                self.counts["submitted"] += 1
+                self.max_queued = max(self.max_queued, len(self.pending))
+                if len(self.pending) > self._idle and len(self._workers) < self.max_workers:
+                    self._start_worker()
+                self._condition.notify()
+
+        for stale in superseded:
+            logger.log_activity(f"Command superseded before it ran: {stale.command}")
+            stale._cancel("superseded")
+        if ticket is None:
+            logger.log_activity(f"Command queue full ({self.max_queue}), refused: {command}")
+        return ticket
+
+    def stats(self):
+        """Counters plus current queue depth, running commands and average queue wait"""
+        with self._condition:
+            started = self.counts["completed"] + self.counts["failed"] + sum(self.running.values())
+            return dict(self.counts, queued=len(self.pending), running=sum(self.running.values()),
+                        max_queued=self.max_queued, workers=len(self._workers),
+                        average_wait=self.total_wait / started if started else 0.0)
+
+    def shutdown(self, wait=True):
+        """Cancel waiting commands and stop the workers once running ones finish"""
+        with self._condition:
+            self._shutdown = True
+            cancelled = list(self.pending)
+            self.pending.clear()
+            workers = list(self._workers)
+            self._condition.notify_all()
+        for ticket in cancelled:
+            ticket._cancel("shutdown")
+        if wait:
+            for worker in workers:
+                if worker is not threading.current_thread():
+                    worker.join(timeout=5.0)
+
+    def _default_runner(self, command):
+        # Import here to avoid circular imports
+        from command_processor import process_command
+        return process_command(command)
+
+    def _start_worker(self):
+        worker = threading.Thread(target=self._work, name=f"jarvis-command-{len(self._workers) + 1}", daemon=True)
+        self._workers.append(worker)
+        worker.start()
+
+    def _take(self, now):
+        """First waiting command whose lane has room, plus the stale ones skipped over"""
+        expired = []
+        chosen = None
+        for ticket in self.pending:
+            if ticket.source == VOICE and now - ticket.submitted > self.stale_after:
+                expired.append(ticket)
+            elif self.running.get(ticket.lane, 0) < self.limits.get(ticket.lane, self.max_workers):
+                chosen = ticket
+                break
+        for ticket in expired:
+            self.pending.remove(ticket)
+        self.counts["expired"] += len(expired)
+        if chosen is not None:
+            self.pending.remove(chosen)
+            self.running[chosen.lane] = self.running.get(chosen.lane, 0) + 1
+            chosen.state, chosen.started = RUNNING, now
+            self.total_wait += now - chosen.submitted
+        return chosen, expired
+
+    def _work(self):
+        while True:
+            with self._condition:
+                ticket, expired = self._take(time.monotonic())
+                while ticket is None and not expired:
+                    if self._shutdown:
+                        return
+                    # Commands held back by a busy lane are retried when something finishes
+                    self._idle += 1
+                    self._condition.wait()
+                    self._idle -= 1
+                    ticket, expired = self._take(time.monotonic())
+
+            for stale in expired:
+                logger.log_activity(f"Command expired after waiting {self.stale_after}s: {stale.command}")
+                stale._cancel("expired")
+            if ticket is None:
+                continue
+
+            try:
+                ticket.result = ticket._run(ticket.command)
+                ticket.state = DONE
+            except Exception as e:
+                ticket.error, ticket.state = e, FAILED
+                logger.log_error(f"Error running command '{ticket.command}'", e)
+            finally:
+                with self._condition:
+                    self.running[ticket.lane] -= 1
+                    self.counts["completed" if ticket.state == DONE else "failed"] += 1
+                    self._condition.notify_all()
+                ticket._done.set()
+
+
+# Global command executor
+command_executor = CommandExecutor()
@@ -1,31 +1,68 @@
 import os
-import subprocess
 import webbrowser
 import smtplib
 import cv2
 import pyautogui
-import psutil
 import time
 import re
+import threading
 from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.image import MIMEImage
 
 from logger import logger
-from tts import tts
+from tts import tts, ERROR, SUGGESTION
 from config import Config
 from conversation_context import conversation_context, jarvis_personality
 from advanced_nlp import advanced_nlp
+from intent_router import intent_router, LAUNCH_VERBS
+from app_index import app_index
+from scheduler import scheduler, parse_job_reference
+from metrics_cache import metrics_cache
+from latency_tracker import latency_tracker, PROCESS_COMMAND, DISPATCH, ACTION_COMPLETE
 
 class CommandProcessor:
     """Process voice commands and execute corresponding actions"""
     
     def __init__(self):
         self.last_screenshot_path = None
+        self._nesting = threading.local()
+        
+        # Intent name (see intent_router) -> handler
+        self.handlers = {
+            "conversational": self._handle_conversational_command,
+            "app": self._handle_app_command,
+            "web": self._handle_web_command,
+            "camera": self._handle_camera_command,
+            "email": self._handle_email_command,
+            "system": self._handle_system_command,
+            "screenshot": self._handle_screenshot_command,
+            "info": self._handle_info_command,
+            "time": self._handle_time_command,
+            "schedule": self._handle_schedule_command,
+        }
     
-    def process_command(self, command):
+    def process_command(self, command, nested=False):
         """Main command processing function with conversational intelligence"""
+        # Multi-step commands re-enter here for every step (nested=True when a
+        # step runs on a plan worker thread); only the outermost call closes
+        # the latency span
+        was_active = getattr(self._nesting, "active", False)
+        outermost = not nested and not was_active
+        self._nesting.active = True
+        latency_tracker.mark(PROCESS_COMMAND, detail=command)
+        try:
+            # A plan step's failure is reported by the plan's summary (and skips its dependents)
+            return self._process_command(command, raise_errors=nested)
+        finally:
+            self._nesting.active = was_active
+            if outermost:
+                latency_tracker.mark(ACTION_COMPLETE)
+                latency_tracker.finish(command=command.lower().strip())
+    
+    def _process_command(self, command, raise_errors=False):
+        """Route a command to advanced NLP or the best-scoring intent handler"""
         command = command.lower().strip()
         logger.log_command(command)
         
@@ -39,49 +76,20 @@ class CommandProcessor:
             if advanced_response:
                 return advanced_response
             
-            # Handle conversational commands first
-            if self._is_conversational_command(command):
-                response = self._handle_conversational_command(command)
-            
-            # App launching commands
-            elif self._is_app_command(command):
-                response = self._handle_app_command(command)
-            
-            # Web commands
-            elif self._is_web_command(command):
-                response = self._handle_web_command(command)
-            
-            # Camera commands
-            elif self._is_camera_command(command):
-                response = self._handle_camera_command(command)
-            
-            # Email commands
-            elif self._is_email_command(command):
-                response = self._handle_email_command(command)
-            
-            # System commands
-            elif self._is_system_command(command):
-                response = self._handle_system_command(command)
-            
-            # Screenshot commands
-            elif self._is_screenshot_command(command):
-                response = self._handle_screenshot_command(command)
-            
-            # Information commands
-            elif self._is_info_command(command):
-                response = self._handle_info_command(command)
-            
-            # Time/Date commands
-            elif self._is_time_command(command):
-                response = self._handle_time_command(command)
-            
+            intent = self._route(command)
+            if intent in self.handlers:
+                latency_tracker.mark(DISPATCH, detail=intent)
+                response = self.handlers[intent](command)
             else:
+                latency_tracker.mark(DISPATCH, detail="unknown")
                 response = self._handle_unknown_command(command)
                 
         except Exception as e:
             logger.log_error(f"Error processing command '{command}'", e)
+            if raise_errors:
+                raise
             response = jarvis_personality.get_error_response()
-            tts.speak(response)
+            tts.speak(response, priority=ERROR)
         
         # Add interaction to conversation context
         if response:
@@ -90,16 +98,15 @@ class CommandProcessor:
             # Offer proactive suggestions occasionally
             suggestion = jarvis_personality.get_proactive_suggestion(conversation_context)
             if suggestion and len(conversation_context.conversation_history) % 3 == 0:  # Every 3rd command
-                tts.speak(suggestion)
+                tts.speak(suggestion, priority=SUGGESTION)
     
-    def _is_conversational_command(self, command):
-        """Check if command is conversational"""
-        conversational_keywords = [
-            "hello", "hi", "hey", "good morning", "good afternoon", "good evening",
-            "how are you", "what's up", "thanks", "thank you", "bye", "goodbye",
-            "who are you", "what can you do", "help", "what time", "what day"
-        ]
-        return any(keyword in command for keyword in conversational_keywords)
+    def _route(self, command):
+        """Best intent; "open <app not in Config.APPS>" goes to the app index before the web"""
+        ranked = intent_router.classify(command)
+        weak = not ranked or ranked[0] == ("web", 0.5)      # Only "open" matched
+        if weak and command.split(" ", 1)[0] in LAUNCH_VERBS and app_index.resolve(command):
+            return "app"
+        return ranked[0][0] if ranked else None
     
     def _handle_conversational_command(self, command):
         """Handle conversational commands with personality"""
@@ -166,32 +173,20 @@ class CommandProcessor:
         
         return None
     
-    def _is_app_command(self, command):
-        """Check if command is to open an application"""
-        app_keywords = ["open", "launch", "start", "run"]
-        return any(keyword in command for keyword in app_keywords) and \
-               any(app in command for app in Config.APPS.keys())
-    
     def _handle_app_command(self, command):
-        """Handle application launch commands"""
-        for app_name, app_executable in Config.APPS.items():
-            if app_name in command:
-                try:
-                    subprocess.Popen(app_executable, shell=True)
-                    tts.speak(f"Opening {app_name}")
-                    logger.log_system_event("APP_LAUNCH", app_name)
-                    return
-                except Exception as e:
-                    logger.log_error(f"Failed to open {app_name}", e)
-                    tts.speak(f"Sorry, I couldn't open {app_name}")
-                    return
+        """Handle application launch commands (names resolved through the app index)"""
+        app = app_index.resolve(command)
+        if app is None:
+            tts.speak("I couldn't find that application", priority=ERROR)
+            return
         
-        tts.speak("I couldn't find that application")
-    
-    def _is_web_command(self, command):
-        """Check if command is web-related"""
-        web_keywords = ["open", "browse", "go to", "search", "youtube", "google"]
-        return any(keyword in command for keyword in web_keywords)
+        try:
+            app.launch()
+            tts.speak(f"Opening {app.name}")
+            logger.log_system_event("APP_LAUNCH", app.name)
+        except Exception as e:
+            logger.log_error(f"Failed to open {app.name}", e)
+            tts.speak(f"Sorry, I couldn't open {app.name}", priority=ERROR)
     
     def _handle_web_command(self, command):
         """Handle web browsing commands"""
@@ -238,12 +233,7 @@ class CommandProcessor:
                 
         except Exception as e:
             logger.log_error("Error handling web command", e)
-            tts.speak("Sorry, I couldn't open that website")
-    
-    def _is_camera_command(self, command):
-        """Check if command is camera-related"""
-        camera_keywords = ["take", "photo", "picture", "capture", "camera", "selfie"]
-        return any(keyword in command for keyword in camera_keywords)
+            tts.speak("Sorry, I couldn't open that website", priority=ERROR)
     
     def _handle_camera_command(self, command):
         """Handle camera/photo commands"""
@@ -254,7 +244,7 @@ class CommandProcessor:
             cap = cv2.VideoCapture(0)
             
             if not cap.isOpened():
-                tts.speak("Sorry, I couldn't access the camera")
+                tts.speak("Sorry, I couldn't access the camera", priority=ERROR)
                 return
             
             # Give user time to pose
@@ -275,24 +265,19 @@ class CommandProcessor:
                 tts.speak("Photo captured successfully")
                 logger.log_system_event("PHOTO_CAPTURE", filepath)
             else:
-                tts.speak("Failed to capture photo")
+                tts.speak("Failed to capture photo", priority=ERROR)
             
             cap.release()
             
         except Exception as e:
             logger.log_error("Error taking photo", e)
-            tts.speak("Sorry, I couldn't take a photo")
-    
-    def _is_email_command(self, command):
-        """Check if command is email-related"""
-        email_keywords = ["send", "email", "mail", "message"]
-        return any(keyword in command for keyword in email_keywords)
+            tts.speak("Sorry, I couldn't take a photo", priority=ERROR)
     
     def _handle_email_command(self, command):
         """Handle email commands"""
         try:
             if not Config.EMAIL_CONFIG.get("sender_email"):
-                tts.speak("Email is not configured. Please set up email configuration first.")
+                tts.speak("Email is not configured. Please set up email configuration first.", priority=ERROR)
                 return
             
             if "photo" in command and self.last_screenshot_path:
@@ -304,7 +289,7 @@ class CommandProcessor:
                 
         except Exception as e:
             logger.log_error("Error handling email command", e)
-            tts.speak("Sorry, I couldn't send the email")
+            tts.speak("Sorry, I couldn't send the email", priority=ERROR)
     
     def _send_simple_email(self, subject, body):
         """Send a simple email"""
@@ -329,7 +314,7 @@ class CommandProcessor:
             
         except Exception as e:
             logger.log_error("Failed to send email", e)
-            tts.speak("Failed to send email")
+            tts.speak("Failed to send email", priority=ERROR)
     
     def _send_email_with_photo(self):
         """Send email with the last captured photo"""
@@ -361,12 +346,7 @@ class CommandProcessor:
             
         except Exception as e:
             logger.log_error("Failed to send photo email", e)
-            tts.speak("Failed to send photo via email")
-    
-    def _is_system_command(self, command):
-        """Check if command is system-related"""
-        system_keywords = ["shutdown", "restart", "sleep", "lock", "volume", "minimize", "close"]
-        return any(keyword in command for keyword in system_keywords)
+            tts.speak("Failed to send photo via email", priority=ERROR)
     
     def _handle_system_command(self, command):
         """Handle system commands"""
@@ -398,12 +378,7 @@ class CommandProcessor:
                 
         except Exception as e:
             logger.log_error("Error handling system command", e)
-            tts.speak("Sorry, I couldn't execute that system command")
-    
-    def _is_screenshot_command(self, command):
-        """Check if command is screenshot-related"""
-        screenshot_keywords = ["screenshot", "screen capture", "capture screen"]
-        return any(keyword in command for keyword in screenshot_keywords)
+            tts.speak("Sorry, I couldn't execute that system command", priority=ERROR)
     
     def _handle_screenshot_command(self, command):
         """Handle screenshot commands"""
@@ -423,33 +398,22 @@ class CommandProcessor:
             
         except Exception as e:
             logger.log_error("Error taking screenshot", e)
-            tts.speak("Sorry, I couldn't take a screenshot")
-    
-    def _is_info_command(self, command):
-        """Check if command is requesting information"""
-        info_keywords = ["what is", "tell me", "system info", "cpu", "memory", "battery"]
-        return any(keyword in command for keyword in info_keywords)
+            tts.speak("Sorry, I couldn't take a screenshot", priority=ERROR)
     
     def _handle_info_command(self, command):
-        """Handle information requests"""
+        """Handle information requests from the shared metrics cache"""
         try:
+            metrics = metrics_cache.get()
             if "cpu" in command:
-                cpu_percent = psutil.cpu_percent(interval=1)
-                tts.speak(f"CPU usage is {cpu_percent} percent")
+                tts.speak(f"CPU usage is {metrics['cpu']} percent")
                 
             elif "memory" in command or "ram" in command:
-                memory = psutil.virtual_memory()
-                memory_percent = memory.percent
-                tts.speak(f"Memory usage is {memory_percent} percent")
+                tts.speak(f"Memory usage is {metrics['memory']} percent")
                 
             elif "battery" in command:
-                try:
-                    battery = psutil.sensors_battery()
-                    if battery:
-                        tts.speak(f"Battery is at {battery.percent} percent")
-                    else:
-                        tts.speak("No battery information available")
-                except:
+                if metrics["battery"] is not None:
+                    tts.speak(f"Battery is at {metrics['battery']} percent")
+                else:
                     tts.speak("No battery information available")
                     
             else:
@@ -457,12 +421,7 @@ class CommandProcessor:
                 
         except Exception as e:
             logger.log_error("Error getting system info", e)
-            tts.speak("Sorry, I couldn't get that information")
-    
-    def _is_time_command(self, command):
-        """Check if command is time/date related"""
-        time_keywords = ["time", "date", "what time", "what day"]
-        return any(keyword in command for keyword in time_keywords)
+            tts.speak("Sorry, I couldn't get that information", priority=ERROR)
     
     def _handle_time_command(self, command):
         """Handle time/date commands"""
@@ -479,7 +438,44 @@ class CommandProcessor:
                 
         except Exception as e:
             logger.log_error("Error getting time/date", e)
-            tts.speak("Sorry, I couldn't get the time")
+            tts.speak("Sorry, I couldn't get the time", priority=ERROR)
+    
+    def _handle_schedule_command(self, command):
+        """List or cancel scheduled commands"""
+        try:
+            if any(word in command for word in ["cancel", "delete", "remove"]):
+                reference = parse_job_reference(command)
+                if reference == "all":
+                    count = scheduler.cancel_all()
+                    tts.speak(f"Cancelled all {count} scheduled commands")
+                    return
+                
+                if isinstance(reference, int):
+                    job = scheduler.cancel(reference)
+                else:
+                    matches = scheduler.find(reference) if reference else []
+                    if len(matches) > 1:
+                        tts.speak(f"{len(matches)} scheduled commands match that. Please tell me the number.")
+                        return
+                    job = scheduler.cancel(matches[0].id) if matches else None
+                
+                if job:
+                    tts.speak(f"Cancelled {job.describe()}")
+                else:
+                    tts.speak("I couldn't find that scheduled command", priority=ERROR)
+                return
+            
+            jobs = scheduler.list_jobs()
+            if not jobs:
+                tts.speak("You have no scheduled commands")
+                return
+            listed = "; ".join(f"number {job.id}, {job.describe()}" for job in jobs[:5])
+            more = f", and {len(jobs) - 5} more" if len(jobs) > 5 else ""
+            tts.speak(f"You have {len(jobs)} scheduled commands: {listed}{more}")
+            
+        except Exception as e:
+            logger.log_error("Error handling schedule command", e)
+            tts.speak("Sorry, I couldn't check your scheduled commands", priority=ERROR)
     
     def _handle_unknown_command(self, command):
         """Handle unrecognized commands with intelligent suggestions"""
@@ -0,0 +1,308 @@
+"""
+Condition engine for JARVIS
+Compiles "if/when ... then ..." conditions over CPU, memory, battery, power,
+processes starting or closing, and the time of day into predicates, and
+re-evaluates them against each ActivityMonitor sample - only the rules that
+read a metric which changed. Rules fire on the rising edge, with a cooldown.
+A new rule whose condition already holds ("if battery is below 20" at 15%)
+fires on its first evaluation; a rule restored from an earlier session only
+takes that evaluation as a baseline, so it doesn't fire again on restart.
+Samples arrive once per ActivityMonitor interval (30 s), so that is how late a
+rule can fire.
+"""
+
+import operator
+import os
+import re
+import threading
+import time
+from config import Config
+from logger import logger
+from command_executor import command_executor
+
+# Sample keys a condition can read
+METRICS = ("time", "cpu", "memory", "battery", "plugged", "processes", "started", "closed")
+
+UNITS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
+    "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18, "nineteen": 19
+}
+TENS = {"twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90}
+
+COMPARISONS = {
+    "below": operator.lt, "under": operator.lt, "less than": operator.lt, "lower than": operator.lt,
+    "above": operator.gt, "over": operator.gt, "more than": operator.gt, "greater than": operator.gt,
+    "higher than": operator.gt, "exceeds": operator.gt,
+    "reaches": operator.ge, "at least": operator.ge, "at most": operator.le,
+}
+
+METRIC_NAMES = {"battery": "battery", "cpu": "cpu", "processor": "cpu", "memory": "memory", "ram": "memory"}
+
+THRESHOLD_PATTERN = re.compile(
+    r"^(?:the )?(?P<metric>battery|cpu|processor|memory|ram)(?: level| usage| load)?"
+    r"(?: is| goes| drops| falls| rises| gets)? (?P<op>" + "|".join(COMPARISONS) + r") "
+    r"(?P<value>.+?)(?: ?percent| ?%)?$"
+)
+LEVEL_PATTERN = re.compile(
+    r"^(?:the )?(?P<metric>battery|cpu|processor|memory|ram)(?: level| usage| load)?"
+    r" (?:is |gets |goes |runs )?(?P<level>low|high|full|critical)$"
+)
+POWER_PATTERN = re.compile(
+    r"^(?:the )?(?:(?:battery|computer|laptop|pc) (?:is )?)?"
+    r"(?:(?P<on>charging|plugged in)|(?P<off>unplugged|not charging|on battery|discharging))$"
+)
+PROCESS_PATTERN = re.compile(
+    r"^(?:the )?(?P<app>[a-z0-9 .+]+?) (?:is )?"
+    r"(?P<event>opens|opened|starts|started|launches|launched|closes|closed|exits|quits|stops|not running|running)$"
+)
+USER_PROCESS_PATTERN = re.compile(r"^i (?P<event>open|start|launch|close|quit|exit) (?P<app>[a-z0-9 .+]+)$")
+TIME_PATTERN = re.compile(
+    r"^(?:it is |it's |the time is |time is )?(?:after |past )?(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?"
+    r"(?: ?(?P<meridiem>am|pm|a\.m\.|p\.m\.)| o'clock)?$"
+)
+
+PROCESS_EVENTS = {
+    "opens": "started", "opened": "started", "starts": "started", "started": "started",
+    "launches": "started", "launched": "started", "open": "started", "start": "started", "launch": "started",
+    "closes": "closed", "closed": "closed", "exits": "closed", "quits": "closed", "stops": "closed",
+    "close": "closed", "quit": "closed", "exit": "closed",
+    "running": "processes", "not running": "processes",
+}
+
+
+def parse_number(text):
+    """'20', '20.5', 'twenty', 'twenty five' or 'a hundred' -> float, else None"""
+    text = text.strip().replace("-", " ")
+    if re.fullmatch(r"\d+(?:\.\d+)?", text):
+        return float(text)
+    total = 0
+    seen = False
+    for word in text.split():
+        if word in UNITS:
+            total += UNITS[word]
+        elif word in TENS:
+            total += TENS[word]
+        elif word == "hundred":
+            total = max(total, 1) * 100
+        elif word in ("a", "and"):
+            continue
+        else:
+            return None
+        seen = True
+    return float(total) if seen else None
+
+
+def process_key(name):
+    """Comparable process name: 'Chrome.exe' and 'chrome' are the same"""
+    name = name.lower().strip()
+    return name[:-4] if name.endswith(".exe") else name
+
+
+def app_process_key(app):
+    """Process name for a spoken application name (via Config.APPS when known)"""
+    executable = Config.APPS.get(app)
+    if executable:
+        return process_key(os.path.basename(executable))
+    return process_key(app.replace(" ", ""))
+
+
+class Condition:
+    """A compiled predicate over a prepared ActivityMonitor sample"""
+
+    def __init__(self, description, metrics, test):
+        self.description = description
+        self.metrics = frozenset(metrics)
+        self.test = test
+
+
+def _compare(metric, compare, threshold):
+    def test(sample):
+        value = sample.get(metric)
+        return value is not None and compare(value, threshold)
+    return test
+
+
+def _compile_clause(text):
+    match = THRESHOLD_PATTERN.match(text)
+    if match:
+        threshold = parse_number(match.group("value"))
+        if threshold is not None:
+            metric = METRIC_NAMES[match.group("metric")]
+            return Condition(text, [metric], _compare(metric, COMPARISONS[match.group("op")], threshold))
+
+    match = LEVEL_PATTERN.match(text)
+    if match:
+        metric = METRIC_NAMES[match.group("metric")]
+        level = match.group("level")
+        if metric == "battery" and level in ("low", "critical", "full"):
+            threshold = {"low": Config.BATTERY_LOW_PERCENT, "critical": 10, "full": 100}[level]
+            compare = operator.ge if level == "full" else operator.lt
+            return Condition(text, [metric], _compare(metric, compare, threshold))
+        if metric in ("cpu", "memory") and level in ("high", "low"):
+            high = Config.CPU_HIGH_PERCENT if metric == "cpu" else Config.MEMORY_HIGH_PERCENT
+            if level == "high":
+                return Condition(text, [metric], _compare(metric, operator.gt, high))
+            return Condition(text, [metric], _compare(metric, operator.lt, 100 - high))
+
+    match = POWER_PATTERN.match(text)
+    if match:
+        plugged = bool(match.group("on"))
+        return Condition(text, ["plugged"], lambda sample: sample.get("plugged") is plugged)
+
+    match = PROCESS_PATTERN.match(text) or USER_PROCESS_PATTERN.match(text)
+    if match:
+        key = app_process_key(match.group("app").strip())
+        metric = PROCESS_EVENTS[match.group("event")]
+        if match.group("event") == "not running":
+            return Condition(text, [metric], lambda sample: key not in sample.get(metric, ()))
+        return Condition(text, [metric], lambda sample: key in sample.get(metric, ()))
+
+    match = TIME_PATTERN.match(text)
+    if match:
+        hour, minute = int(match.group("hour")), int(match.group("minute") or 0)
+        meridiem = (match.group("meridiem") or "").replace(".", "")
+        if meridiem:
+            hour = hour % 12 + (12 if meridiem == "pm" else 0)
+        if hour < 24 and minute < 60:
+            # True from that time until midnight, so it fires once a day
+            return Condition(text, ["time"],
+                             lambda sample: (sample["time"].hour, sample["time"].minute) >= (hour, minute))
+
+    raise ValueError(f"I don't know how to check whether {text}")
+
+
+def compile_condition(text):
+    """Compile a spoken condition ("battery is below 20 and chrome is running")
+
+    Raises ValueError for conditions the engine can't evaluate.
+    """
+    text = " ".join(text.lower().strip().rstrip(".?!").split())
+    alternatives = []
+    for either in text.split(" or "):
+        clauses = [_compile_clause(clause.strip()) for clause in either.split(" and ")]
+        if len(clauses) == 1:
+            alternatives.append(clauses[0])
+        else:
+            tests = [clause.test for clause in clauses]
+            alternatives.append(Condition(either, set().union(*(c.metrics for c in clauses)),
+                                          lambda sample, tests=tests: all(test(sample) for test in tests)))
+    if len(alternatives) == 1:
+        return alternatives[0]
+    tests = [alternative.test for alternative in alternatives]
+    return Condition(text, set().union(*(a.metrics for a in alternatives)),
+                     lambda sample: any(test(sample) for test in tests))
+
+
+def prepare_sample(sample):
+    """Shared per-tick view of a sample: process names normalized once for all rules"""
+    view = dict(sample)
+    for key in ("processes", "started", "closed"):
+        view[key] = frozenset(process_key(name) for name in sample.get(key) or ())
+    return view
+
+
+class ConditionRule:
+    """Run `action` each time `condition` becomes true (false, with `negate`)"""
+
+    def __init__(self, rule_id, condition, action, negate=False, restored=False):
+        self.id = rule_id
+        self.condition = condition
+        self.action = action
+        self.negate = negate
+        self.active = None if restored else False   # Held at the last evaluation; None: take a baseline
+        self.last_fired = None
+        self.fired = 0
+
+    def describe(self):
+        return f"{self.action} {'unless' if self.negate else 'when'} {self.condition.description}"
+
+    def holds(self, sample):
+        held = bool(self.condition.test(sample))
+        return not held if self.negate else held
+
+
+class ConditionEngine:
+    """Standing rules, re-evaluated only when a metric they read changes"""
+
+    def __init__(self, runner=None, cooldown=None):
+        self.runner = runner
+        self.cooldown = Config.CONDITION_COOLDOWN_SECONDS if cooldown is None else cooldown
+        self.rules = {}                 # id -> ConditionRule
+        self.evaluations = 0            # Predicate evaluations so far
+        self._by_metric = {}            # metric -> ids of rules reading it
+        self._unevaluated = set()       # Rules added since the last sample
+        self._previous = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def add(self, condition_text, action, negate=False, restored=False):
+        """Compile and register a rule; raises ValueError if the condition can't be checked
+
+        A `restored` rule (one reloaded from an earlier session) doesn't fire
+        for a condition that already holds, only on its next rising edge.
+        """
+        condition = compile_condition(condition_text)
+        with self._lock:
+            rule = ConditionRule(self._next_id, condition, action, negate, restored)
+            self._next_id += 1
+            self.rules[rule.id] = rule
+            for metric in condition.metrics:
+                self._by_metric.setdefault(metric, set()).add(rule.id)
+            self._unevaluated.add(rule.id)
+        logger.log_activity(f"Condition rule #{rule.id}: {rule.describe()}")
+        return rule
+
+    def remove(self, rule_id):
+        """Drop a rule; returns it, or None if there was no such rule"""
+        with self._lock:
+            rule = self.rules.pop(rule_id, None)
+            if rule is None:
+                return None
+            for metric in rule.condition.metrics:
+                self._by_metric.get(metric, set()).discard(rule_id)
+            self._unevaluated.discard(rule_id)
+        logger.log_activity(f"Removed condition rule #{rule_id}: {rule.describe()}")
+        return rule
+
+    def list_rules(self):
+        with self._lock:
+            return sorted(self.rules.values(), key=lambda rule: rule.id)
+
+    def on_sample(self, sample, now=None):
+        """Evaluate the rules a new ActivityMonitor sample can affect; returns the rules that fired"""
+        now = time.monotonic() if now is None else now
+        view = prepare_sample(sample)
+        fired = []
+        with self._lock:
+            changed = [metric for metric in METRICS if view.get(metric) != self._previous.get(metric)]
+            self._previous = {metric: view.get(metric) for metric in METRICS}
+
+            candidates = set(self._unevaluated)
+            self._unevaluated.clear()
+            for metric in changed:
+                candidates.update(self._by_metric.get(metric, ()))
+
+            for rule_id in sorted(candidates):
+                rule = self.rules[rule_id]
+                held = rule.holds(view)
+                self.evaluations += 1
+                rising = held and rule.active is False     # None: a restored rule's baseline
+                rule.active = held
+                if rising and (rule.last_fired is None or now - rule.last_fired >= self.cooldown):
+                    rule.last_fired = now
+                    rule.fired += 1
+                    fired.append(rule)
+
+        for rule in fired:
+            self._fire(rule)
+        return fired
+
+    def _fire(self, rule):
+        """Run a rule's action on the command pool"""
+        logger.log_activity(f"Condition met for rule #{rule.id}: {rule.describe()}")
+        command_executor.submit(rule.action, source="condition", runner=self.runner)
+
+
+# Global condition engine, fed by activity_monitor samples (see main.py)
+condition_engine = ConditionEngine()
@@ -13,6 +13,8 @@ class Config:
     
     # Voice settings
     HOTWORD = "jarvis"
+    # Vocabulary of the grammar-restricted hotword spotter (see speech_engines.HotwordSpotter)
+    WAKE_WORDS = ["hey jarvis", "jarvis", "hey", "hi", "hello", "activate"]
     VOICE_RATE = 150      # Working rate from test
     VOICE_VOLUME = 0.5    # Working volume from test
 
@@ -23,16 +25,42 @@ class Config:
     # Example voices (as of documentation): Rachel: 21m00Tcm4TlvDq8ikWAM, Adam: pNInz6obpgDQGcFmaJgB
     ELEVENLABS_VOICE_ID = os.environ.get("ELEVENLABS_VOICE_ID", "21m00Tcm4TlvDq8ikWAM")
     ELEVENLABS_MODEL_ID = os.environ.get("ELEVENLABS_MODEL_ID", "eleven_monolingual_v1")
+    ELEVENLABS_API_URL = os.environ.get("ELEVENLABS_API_URL", "https://api.elevenlabs.io/v1")
+    # Stream raw 16-bit mono PCM and play it as it arrives (needs pyaudio). Otherwise whole PCM
+    # responses play through winsound; MP3 + playsound, which a barge-in can't cut short, only without both
+    ELEVENLABS_STREAMING = True
+    ELEVENLABS_STREAM_FORMAT = "pcm_22050"
     # Engine priority order: 'elevenlabs', then fallback 'pyttsx3'
     TTS_ENGINE_ORDER = ["elevenlabs", "pyttsx3"]
+
+    # Synthesized speech cache (see tts_cache.py)
+    TTS_CACHE_DIR = os.path.join(BASE_DIR, "tts_cache")
+    TTS_CACHE_MAX_BYTES = 50 * 1024 * 1024   # On-disk tier
+    TTS_CACHE_MEMORY_ITEMS = 128            # Utterances kept in memory (room for the pre-warmed phrases)
+    # Multi-sentence replies: synthesize sentence N+1 while sentence N plays. pyttsx3 replies are
+    # pipelined (and pre-warmed) only when its WAVs can be played: through pyaudio, or winsound
+    TTS_SENTENCE_PIPELINING = True
+    TTS_CLAUSE_CHARS = 120                  # Longer sentences are split at commas/semicolons
     
     # Audio settings
     SAMPLE_RATE = 16000
     CHUNK_SIZE = 8192
     
+    # Voice activity detection (see vad.py)
+    VAD_ENERGY_THRESHOLD = 500    # RMS below this is treated as silence
+    VAD_ZCR_THRESHOLD = 0.35      # Zero-crossing rate above this is treated as hiss
+    VAD_HANGOVER_CHUNKS = 3       # Quiet chunks still forwarded after speech ends
+    VAD_PREROLL_CHUNKS = 2        # Quiet chunks replayed before speech starts
+    
+    # Capture -> recognition hand-off (see audio_buffer.py)
+    AUDIO_BUFFER_CHUNKS = 64      # ~16 seconds of 4096-frame chunks
+    AUDIO_DROP_POLICY = "oldest"  # 'oldest', 'newest' or 'block'
+    AUDIO_HISTORY_SECONDS = 30    # Recognized speech kept for cutting out command segments
+    
     # Vosk model (download if not exists)
     VOSK_MODEL_URL = "https://alphacephei.com/vosk/models/vosk-model-en-us-0.22.zip"
     VOSK_MODEL_PATH = os.path.join(MODELS_DIR, "vosk-model-en-us-0.22")
+    VOSK_SMALL_MODEL_PATH = os.path.join(MODELS_DIR, "vosk-model-small-en-us-0.15")
     
     # System tray icon
     ICON_PATH = os.path.join(ASSETS_DIR, "jarvis_icon.ico")
@@ -40,6 +68,51 @@ class Config:
     # Activity monitoring
     ACTIVITY_LOG_FILE = os.path.join(LOGS_DIR, f"jarvis_activity_{datetime.now().strftime('%Y%m%d')}.txt")
     ERROR_LOG_FILE = os.path.join(LOGS_DIR, f"jarvis_errors_{datetime.now().strftime('%Y%m%d')}.txt")
+    LATENCY_LOG_FILE = os.path.join(LOGS_DIR, f"jarvis_latency_{datetime.now().strftime('%Y%m%d')}.jsonl")
+    
+    # System metrics cache (see metrics_cache.py)
+    METRICS_CACHE_TTL = 5.0        # Oldest reading an informational command may answer from
+    
+    # Command execution (see command_executor.py)
+    COMMAND_MAX_WORKERS = 4        # Commands running at once
+    COMMAND_MAX_QUEUE = 16         # Further commands are refused while this many wait
+    COMMAND_STALE_SECONDS = 30     # A voice command that waited this long is dropped
+    # Intents sharing a device or state run in one lane (default: a lane per intent)
+    COMMAND_LANES = {"camera": "capture", "screenshot": "capture", "email": "capture"}
+    COMMAND_LANE_LIMITS = {"capture": 1, "system": 1}  # Most commands running in a lane at once
+    
+    # Asyncio core (see async_core.py, enabled with main.py --async-core)
+    ASYNC_BLOCKING_WORKERS = 2     # Executor threads for blocking calls (psutil) made from the loop
+    ASYNC_STATUS_INTERVAL = 30     # Tray tooltip refresh when no event has updated it, seconds
+    
+    # Multi-step commands (see plan_executor.py)
+    PLAN_MAX_WORKERS = 4          # Independent steps run concurrently, at most this many at once
+    
+    # Timed commands (see scheduler.py)
+    SCHEDULE_FILE = os.path.join(BASE_DIR, "scheduled_commands.json")
+    SCHEDULE_GRACE_SECONDS = 3600  # Commands missed while JARVIS was off still run if this recent
+    SCHEDULE_MAX_SLEEP = 60        # Longest scheduler sleep, so wall-clock changes are noticed
+    
+    # Application index (see app_index.py)
+    USER_APPS_DIR = os.path.join(BASE_DIR, "apps")             # Extra shortcuts, .desktop files or executables
+    APP_INDEX_CACHE = os.path.join(BASE_DIR, "app_index.json")
+    APP_MATCH_THRESHOLD = 0.5      # Lowest trigram similarity accepted for a misheard app name
+    APP_INDEX_WAIT_SECONDS = 3.0   # How long a first command waits for the startup scan before using Config.APPS
+    # PATH executables launch only when named exactly, unless listed here
+    APP_PATH_ALLOWLIST = []
+    # Never launched by voice: power, session and destructive commands (Config.APPS is trusted)
+    APP_DENYLIST = {
+        "shutdown", "reboot", "halt", "poweroff", "logoff", "logout", "init", "telinit", "systemctl",
+        "loginctl", "gnome-session-quit", "tsshutdn", "rm", "rmdir", "del", "erase", "format", "mkfs",
+        "dd", "shred", "wipefs", "fdisk", "sfdisk", "parted", "diskpart", "kill", "killall", "pkill",
+        "taskkill", "sudo", "su", "doas", "pkexec", "runas", "bcdedit", "reg", "cipher",
+    }
+    
+    # Standing "if/when ... then ..." rules (see condition_engine.py)
+    CONDITION_COOLDOWN_SECONDS = 300  # A rule fires at most once in this long
+    BATTERY_LOW_PERCENT = 20          # "battery is low"
+    CPU_HIGH_PERCENT = 80             # "cpu is high"
+    MEMORY_HIGH_PERCENT = 80          # "memory is high"
     
     # Email settings (can be configured by user)
     EMAIL_CONFIG = {
@@ -58,6 +58,97 @@ class ConversationContext:
 class JarvisPersonality:
     """JARVIS personality and response generation"""
     
+    GREETINGS = {
+        "morning": [
+            "Good morning! How may I assist you today?",
+            "Good morning, sir. Ready to tackle the day?",
+            "Morning! What shall we accomplish today?"
+        ],
+        "afternoon": [
+            "Good afternoon! How can I help you?",
+            "Good afternoon, sir. What can I do for you?",
+            "Afternoon! How may I be of service?"
+        ],
+        "evening": [
+            "Good evening! How may I assist you?",
+            "Good evening, sir. How can I help?",
+            "Evening! What do you need assistance with?"
+        ]
+    }
+    
+    BASIC_ACKNOWLEDGMENTS = [
+        "Yes sir?",
+        "I'm listening.",
+        "How can I help you?",
+        "At your service.",
+        "Yes?",
+        "Ready for your command.",
+        "I'm here."
+    ]
+    FOLLOW_UP_ACKNOWLEDGMENTS = [
+        "Yes, anything else?",
+        "What else can I do for you?",
+        "How else may I assist?",
+        "Continuing to assist..."
+    ]
+    EARLY_ACKNOWLEDGMENTS = [
+        "Up early today, I see. How can I help?",
+        "Good morning, sir. What can I do for you?"
+    ]
+    LATE_ACKNOWLEDGMENTS = [
+        "Working late tonight? How can I assist?",
+        "Evening, sir. What do you need?"
+    ]
+    
+    COMPLETION_RESPONSES = [
+        "Task completed, sir.",
+        "Done.",
+        "Complete.",
+        "All set.",
+        "Finished."
+    ]
+    TASK_COMPLETION_RESPONSES = {
+        "file_operation": [
+            "File operation completed successfully.",
+            "File handled as requested.",
+            "Done with the file operation."
+        ],
+        "web_search": [
+            "Search results ready for you.",
+            "Found what you were looking for.",
+            "Search completed."
+        ],
+        "system_operation": [
+            "System operation completed.",
+            "System updated as requested.",
+            "Changes applied successfully."
+        ]
+    }
+    
+    GENERAL_ERRORS = [
+        "I apologize, but I encountered an issue.",
+        "I'm sorry, something went wrong.",
+        "My apologies, I couldn't complete that task.",
+        "I'm afraid there was a problem."
+    ]
+    SPECIFIC_ERRORS = {
+        "not_found": [
+            "I couldn't locate what you're looking for.",
+            "That item doesn't seem to exist.",
+            "I'm unable to find that resource."
+        ],
+        "permission_denied": [
+            "I don't have the necessary permissions for that.",
+            "Access denied for that operation.",
+            "I'm not authorized to perform that action."
+        ],
+        "network_error": [
+            "I'm experiencing connectivity issues.",
+            "Network connection seems to be unavailable.",
+            "I can't reach the internet right now."
+        ]
+    }
+    
     def __init__(self):
         self.personality_traits = {
             'formal_but_friendly': True,
@@ -78,130 +169,54 @@ class JarvisPersonality:
             else:
                 time_of_day = "evening"
         
-        greetings = {
-            "morning": [
-                "Good morning! How may I assist you today?",
-                "Good morning, sir. Ready to tackle the day?",
-                "Morning! What shall we accomplish today?"
-            ],
-            "afternoon": [
-                "Good afternoon! How can I help you?",
-                "Good afternoon, sir. What can I do for you?",
-                "Afternoon! How may I be of service?"
-            ],
-            "evening": [
-                "Good evening! How may I assist you?",
-                "Good evening, sir. How can I help?",
-                "Evening! What do you need assistance with?"
-            ]
-        }
-        
         import random
-        return random.choice(greetings.get(time_of_day, greetings["morning"]))
+        return random.choice(self.GREETINGS.get(time_of_day, self.GREETINGS["morning"]))
     
     def get_acknowledgment(self, context=None):
         """Get contextual acknowledgment"""
-        basic_acknowledgments = [
-            "Yes sir?",
-            "I'm listening.",
-            "How can I help you?",
-            "At your service.",
-            "Yes?",
-            "Ready for your command.",
-            "I'm here."
-        ]
-        
         # Add contextual acknowledgments based on recent activity
         contextual_acknowledgments = []
         
         if context and context.is_follow_up_likely():
-            contextual_acknowledgments.extend([
-                "Yes, anything else?",
-                "What else can I do for you?",
-                "How else may I assist?",
-                "Continuing to assist..."
-            ])
+            contextual_acknowledgments.extend(self.FOLLOW_UP_ACKNOWLEDGMENTS)
         
         # Add time-based acknowledgments
         hour = datetime.now().hour
         if hour < 8:
-            contextual_acknowledgments.extend([
-                "Up early today, I see. How can I help?",
-                "Good morning, sir. What can I do for you?"
-            ])
+            contextual_acknowledgments.extend(self.EARLY_ACKNOWLEDGMENTS)
         elif hour > 22:
-            contextual_acknowledgments.extend([
-                "Working late tonight? How can I assist?",
-                "Evening, sir. What do you need?"
-            ])
+            contextual_acknowledgments.extend(self.LATE_ACKNOWLEDGMENTS)
         
         import random
-        all_acknowledgments = basic_acknowledgments + contextual_acknowledgments
+        all_acknowledgments = self.BASIC_ACKNOWLEDGMENTS + contextual_acknowledgments
         return random.choice(all_acknowledgments)
     
     def get_task_completion_response(self, task_type=None):
         """Get response for completed tasks"""
-        basic_responses = [
-            "Task completed, sir.",
-            "Done.",
-            "Complete.",
-            "All set.",
-            "Finished."
-        ]
-        
-        task_specific_responses = {
-            "file_operation": [
-                "File operation completed successfully.",
-                "File handled as requested.",
-                "Done with the file operation."
-            ],
-            "web_search": [
-                "Search results ready for you.",
-                "Found what you were looking for.",
-                "Search completed."
-            ],
-            "system_operation": [
-                "System operation completed.",
-                "System updated as requested.",
-                "Changes applied successfully."
-            ]
-        }
-        
         import random
-        responses = task_specific_responses.get(task_type, basic_responses)
+        responses = self.TASK_COMPLETION_RESPONSES.get(task_type, self.COMPLETION_RESPONSES)
         return random.choice(responses)
     
     def get_error_response(self, error_type=None):
         """Get polite error response"""
-        general_errors = [
-            "I apologize, but I encountered an issue.",
-            "I'm sorry, something went wrong.",
-            "My apologies, I couldn't complete that task.",
-            "I'm afraid there was a problem."
-        ]
-        
-        specific_errors = {
-            "not_found": [
-                "I couldn't locate what you're looking for.",
-                "That item doesn't seem to exist.",
-                "I'm unable to find that resource."
-            ],
-            "permission_denied": [
-                "I don't have the necessary permissions for that.",
-                "Access denied for that operation.",
-                "I'm not authorized to perform that action."
-            ],
-            "network_error": [
-                "I'm experiencing connectivity issues.",
-                "Network connection seems to be unavailable.",
-                "I can't reach the internet right now."
-            ]
-        }
-        
         import random
-        responses = specific_errors.get(error_type, general_errors)
+        responses = self.SPECIFIC_ERRORS.get(error_type, self.GENERAL_ERRORS)
         return random.choice(responses)
     
+    def common_phrases(self):
+        """Every fixed phrase JARVIS may say, acknowledgments first (used to pre-warm TTS)"""
+        groups = [self.BASIC_ACKNOWLEDGMENTS, self.FOLLOW_UP_ACKNOWLEDGMENTS,
+                  self.EARLY_ACKNOWLEDGMENTS, self.LATE_ACKNOWLEDGMENTS]
+        groups += list(self.GREETINGS.values())
+        groups += [self.COMPLETION_RESPONSES] + list(self.TASK_COMPLETION_RESPONSES.values())
+        groups += [self.GENERAL_ERRORS] + list(self.SPECIFIC_ERRORS.values())
+        phrases = []
+        for group in groups:
+            for phrase in group:
+                if phrase not in phrases:
+                    phrases.append(phrase)
+        return phrases
+    
     def get_clarification_request(self, unclear_command):
         """Get clarification for unclear commands"""
         clarifications = [
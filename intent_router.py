@@ -0,0 +1,148 @@
+"""
+Intent routing for JARVIS
+Compiles every intent keyword (and the application names in Config.APPS)
+into one token-level trie at startup, then classifies a command in a single
+pass over its words, returning every matching intent ranked by score
+"""
+
+import re
+from config import Config
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+LAUNCH_VERBS = ["open", "launch", "start", "run"]
+
+
+class IntentRule:
+    """Keyword weights for one intent
+
+    `requires` lists keyword groups; the intent only matches when every group
+    has at least one keyword in the command (e.g. an app launch needs both a
+    verb and an application name).
+    """
+
+    def __init__(self, name, keywords, requires=None):
+        self.name = name
+        self.keywords = keywords            # phrase -> weight
+        self.requires = requires or []      # list of phrase lists
+
+
+def default_rules(apps=None):
+    """The built-in intents, in tie-break priority order"""
+    apps = list((apps if apps is not None else Config.APPS).keys())
+    greetings = ["hello", "hi", "hey", "good morning", "good afternoon", "good evening"]
+    camera_subjects = ["photo", "picture", "selfie", "camera", "capture"]
+
+    # Greetings are weak so "hey, open chrome" still launches Chrome
+    conversational = {greeting: 1.0 for greeting in greetings}
+    conversational.update({phrase: 2.0 for phrase in [
+        "how are you", "what's up", "thanks", "thank you", "bye", "goodbye",
+        "who are you", "what are you", "what can you do", "help", "what day"
+    ]})
+    app = {verb: 1.0 for verb in LAUNCH_VERBS}
+    app.update({name: 2.0 for name in apps})
+
+    return [
+        IntentRule("conversational", conversational),
+        IntentRule("app", app, requires=[LAUNCH_VERBS, apps]),
+        IntentRule("web", {
+            "youtube": 2.5, "google": 2.5, "search": 1.5, "browse": 1.5, "go to": 1.5,
+            "website": 2.0, "site": 1.5, "open": 0.5
+        }),
+        IntentRule("camera", {
+            "photo": 2.0, "picture": 2.0, "selfie": 2.5, "camera": 2.0, "capture": 1.0, "take": 0.5
+        }, requires=[camera_subjects]),
+        IntentRule("email", {"email": 2.0, "mail": 2.0, "send": 1.0, "message": 1.0}),
+        IntentRule("system", {
+            "shutdown": 2.0, "restart": 2.0, "sleep": 2.0, "lock": 2.0, "mute": 2.0, "volume": 2.0,
+            "volume up": 3.0, "volume down": 3.0, "minimize": 2.0, "close": 1.5
+        }),
+        IntentRule("screenshot", {
+            "screenshot": 3.0, "screen shot": 3.0, "screen capture": 3.0, "capture screen": 3.0,
+            "capture the screen": 3.0
+        }),
+        IntentRule("info", {
+            "cpu": 2.0, "memory": 2.0, "ram": 2.0, "battery": 2.0, "system info": 2.5,
+            "system information": 2.5, "what is": 0.5, "tell me": 0.5
+        }),
+        IntentRule("time", {"time": 2.0, "date": 2.0, "what time": 2.5}),
+        # Strong enough that "cancel the reminder to open chrome" isn't an app launch
+        IntentRule("schedule", {
+            "scheduled": 3.0, "schedule": 3.0, "reminder": 3.0, "reminders": 3.0, "timer": 3.0, "timers": 3.0,
+            "list": 1.0, "cancel": 1.0, "pending": 1.0
+        }, requires=[["scheduled", "schedule", "reminder", "reminders", "timer", "timers"]]),
+    ]
+
+
+def tokenize(text):
+    """Lowercase words, keeping apostrophes (what's)"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class _TrieNode:
+    __slots__ = ("children", "hits")
+
+    def __init__(self):
+        self.children = {}
+        self.hits = []          # (rule index, phrase, weight) ending at this node
+
+
+class IntentRouter:
+    """Token trie over all intent keywords, classified in one pass"""
+
+    def __init__(self, rules=None):
+        self.rules = rules if rules is not None else default_rules()
+        self.root = _TrieNode()
+        self.max_depth = 0
+        for index, rule in enumerate(self.rules):
+            for phrase, weight in rule.keywords.items():
+                self._insert(phrase, (index, phrase, weight))
+
+    def _insert(self, phrase, hit):
+        tokens = tokenize(phrase)
+        node = self.root
+        for token in tokens:
+            node = node.children.setdefault(token, _TrieNode())
+        node.hits.append(hit)
+        self.max_depth = max(self.max_depth, len(tokens))
+
+    def matches(self, command):
+        """Every (rule index, phrase, weight) found in the command"""
+        tokens = tokenize(command)
+        root = self.root.children
+        found = []
+        for start, token in enumerate(tokens):
+            node = root.get(token)
+            if node is None:
+                continue
+            found.extend(node.hits)
+            # Longer phrases continue from here
+            for token in tokens[start + 1:start + self.max_depth]:
+                node = node.children.get(token)
+                if node is None:
+                    break
+                found.extend(node.hits)
+        return found
+
+    def classify(self, command):
+        """Return [(intent, score), ...] best first; ties keep rule order"""
+        phrases = {}
+        for index, phrase, weight in self.matches(command):
+            phrases.setdefault(index, {})[phrase] = weight
+
+        ranked = []
+        for index, matched in phrases.items():
+            rule = self.rules[index]
+            if all(not matched.keys().isdisjoint(group) for group in rule.requires):
+                ranked.append((-sum(matched.values()), index, rule.name))
+        ranked.sort()
+        return [(name, -negative_score) for negative_score, _, name in ranked]
+
+    def best(self, command):
+        """The top intent name, or None"""
+        ranked = self.classify(command)
+        return ranked[0][0] if ranked else None
+
+
+# Global router built from Config.APPS
+intent_router = IntentRouter()
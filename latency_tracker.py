@@ -0,0 +1,218 @@
+"""
+Latency tracking for JARVIS
+Records monotonic timestamps for each step of a voice interaction (speech
+end -> recognizer -> command processor -> handler -> TTS -> action done),
+exports every finished interaction as a JSON span record and summarizes
+each stage as p50/p95/p99 over the session
+"""
+
+import itertools
+import json
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from logger import logger
+
+# Events in the order they normally happen
+WAKE_END = "wake_end"                   # Capture time of the chunk the wake word ended in
+HOTWORD = "hotword"                     # Hotword decision
+SPEECH_END = "speech_end"               # VAD end of the command segment (capture time)
+RECOGNIZER_FINAL = "recognizer_final"   # Final transcript of the command
+PROCESS_COMMAND = "process_command"     # command_processor.process_command entry
+DISPATCH = "dispatch"                   # Handler chosen for the command
+TTS_AUDIO = "tts_audio"                 # Audio starts playing (any utterance)
+ACTION_COMPLETE = "action_complete"     # Handler returned
+
+# (stage, from event, to event); "to" is the first such event at or after "from"
+STAGES = [
+    ("hotword", WAKE_END, HOTWORD),
+    ("acknowledge", HOTWORD, TTS_AUDIO),
+    ("recognize", SPEECH_END, RECOGNIZER_FINAL),
+    ("hand_off", RECOGNIZER_FINAL, PROCESS_COMMAND),
+    ("route", PROCESS_COMMAND, DISPATCH),
+    ("first_audio", DISPATCH, TTS_AUDIO),
+    ("action", DISPATCH, ACTION_COMPLETE),
+    ("speech_to_action", SPEECH_END, ACTION_COMPLETE),
+]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Interaction:
+    """Timestamps for one hotword -> command -> action round trip"""
+
+    def __init__(self, interaction_id, kind):
+        self.id = interaction_id
+        self.kind = kind                # 'voice' or 'text'
+        self.started = datetime.now()
+        self.marks = []                 # (event, monotonic seconds, detail)
+        self.attributes = {}
+        self.finished = False
+
+    def mark(self, event, stamp=None, detail=None):
+        self.marks.append((event, time.monotonic() if stamp is None else stamp, detail))
+
+    def first(self, event, after=None):
+        """Time of the first `event` at or after `after`, or None"""
+        for name, stamp, _ in self.marks:
+            if name == event and (after is None or stamp >= after):
+                return stamp
+        return None
+
+    def stage_durations(self):
+        """Seconds spent in each stage this interaction went through"""
+        durations = {}
+        for stage, start_event, end_event in STAGES:
+            start = self.first(start_event)
+            if start is None:
+                continue
+            end = self.first(end_event, after=start)
+            if end is not None:
+                durations[stage] = end - start
+        return durations
+
+    def to_record(self):
+        """JSON-ready span record; mark times are ms from the command's speech end"""
+        origin = self.first(SPEECH_END)
+        if origin is None:
+            origin = min(stamp for _, stamp, _ in self.marks) if self.marks else 0.0
+        marks = []
+        for name, stamp, detail in sorted(self.marks, key=lambda m: m[1]):
+            mark = {"event": name, "ms": round((stamp - origin) * 1000, 2)}
+            if detail:
+                mark["detail"] = detail
+            marks.append(mark)
+
+        record = {
+            "id": self.id,
+            "kind": self.kind,
+            "started": self.started.isoformat(timespec="milliseconds"),
+            "marks": marks,
+            "stages_ms": {stage: round(seconds * 1000, 2) for stage, seconds in self.stage_durations().items()},
+        }
+        record.update(self.attributes)
+        return record
+
+
+class LatencyTracker:
+    """Collect interaction spans across the recognizer, command and TTS threads
+
+    An interaction is "active" for a thread if it was bound with bind();
+    otherwise the most recently begun interaction is used.
+    """
+
+    def __init__(self, log_path=None, history=1000):
+        self.log_path = log_path
+        self.spans = deque(maxlen=history)      # Finished interactions
+        self.current = None
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def begin(self, kind="voice"):
+        """Start a new interaction and make it current"""
+        with self._lock:
+            self.current = Interaction(next(self._ids), kind)
+            return self.current
+
+    def active(self):
+        """The interaction the calling thread is working on, or None"""
+        interaction = getattr(self._local, "interaction", None)
+        return interaction if interaction is not None else self.current
+
+    def mark(self, event, stamp=None, detail=None):
+        """Timestamp an event on the active interaction (starting one if needed)"""
+        interaction = self.active()
+        if interaction is None or interaction.finished:
+            if event != PROCESS_COMMAND:
+                return None
+            # Typed or simulated commands start their own interaction here
+            interaction = self.begin("text")
+            self._local.interaction = interaction
+        with self._lock:
+            interaction.mark(event, stamp, detail)
+        return interaction
+
+    def bind(self, function):
+        """Wrap `function` so it runs against the interaction active right now"""
+        interaction = self.active()
+
+        def bound(*args, **kwargs):
+            previous = getattr(self._local, "interaction", None)
+            self._local.interaction = interaction
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._local.interaction = previous
+        return bound
+
+    def finish(self, **attributes):
+        """Close the active interaction, export it and return its record"""
+        interaction = self.active()
+        if interaction is None or interaction.finished:
+            return None
+        with self._lock:
+            interaction.finished = True
+            interaction.attributes.update(attributes)
+            if self.current is interaction:
+                self.current = None
+            self.spans.append(interaction)
+        if getattr(self._local, "interaction", None) is interaction:
+            self._local.interaction = None
+
+        record = interaction.to_record()
+        if self.log_path:
+            try:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+            except Exception as e:
+                logger.log_error("Failed to write latency span", e)
+        return record
+
+    def summary(self):
+        """p50/p95/p99 in milliseconds for every stage seen this session"""
+        with self._lock:
+            spans = list(self.spans)
+        samples = {}
+        for interaction in spans:
+            for stage, seconds in interaction.stage_durations().items():
+                samples.setdefault(stage, []).append(seconds * 1000)
+
+        result = {}
+        for stage, _, _ in STAGES:
+            values = sorted(samples.get(stage, []))
+            if values:
+                result[stage] = {
+                    "count": len(values),
+                    "p50": round(percentile(values, 0.50), 2),
+                    "p95": round(percentile(values, 0.95), 2),
+                    "p99": round(percentile(values, 0.99), 2),
+                }
+        return result
+
+    def report(self):
+        """Human-readable summary table"""
+        lines = ["JARVIS latency summary (ms)", "=" * 60,
+                 f"{'stage':18} {'count':>6} {'p50':>9} {'p95':>9} {'p99':>9}"]
+        for stage, stats in self.summary().items():
+            lines.append(f"{stage:18} {stats['count']:6d} {stats['p50']:9.1f} {stats['p95']:9.1f} {stats['p99']:9.1f}")
+        return "\n".join(lines)
+
+    def reset(self):
+        """Forget all spans (e.g. between benchmark runs)"""
+        with self._lock:
+            self.spans.clear()
+            self.current = None
+
+
+# Global latency tracker; spans go to Config.LATENCY_LOG_FILE only once the
+# assistant starts (JarvisAssistant sets log_path), never from tests or tools
+latency_tracker = LatencyTracker()
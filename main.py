@@ -21,31 +21,59 @@ import sys
 import os
 import signal
 import time
+import argparse
 import threading
 from datetime import datetime
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from config import Config
-from logger import logger
-from tts import tts
-from speech_recognition_safe import speech_recognition
-from activity_monitor import activity_monitor
-from system_tray import SystemTray
-from startup_manager import startup_manager
+# `python main.py transcribe ...` runs the batch transcriber instead of the
+# assistant. It gets its own interpreter so that worker processes never
+# re-import this module (and the audio/tray setup below) as __main__.
+if __name__ == "__main__" and sys.argv[1:2] == ["transcribe"]:
+    import subprocess
+    transcribe_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "transcribe.py")
+    sys.exit(subprocess.call([sys.executable, transcribe_script] + sys.argv[2:]))
+
+from startup_profiler import startup_profiler
+
+with startup_profiler.phase("Import config and logger"):
+    from config import Config
+    from logger import logger
+    from latency_tracker import latency_tracker
+with startup_profiler.phase("Import TTS"):
+    from tts import tts
+    from conversation_context import jarvis_personality
+with startup_profiler.phase("Import speech recognition"):
+    from speech_recognition_safe import speech_recognition
+    from plan_executor import plan_executor
+    from command_executor import command_executor
+    from async_core import async_core
+    from scheduler import scheduler
+with startup_profiler.phase("Import activity monitor"):
+    from activity_monitor import activity_monitor
+    from condition_engine import condition_engine
+    from app_index import app_index
+with startup_profiler.phase("Import system tray"):
+    from system_tray import SystemTray
+    from startup_manager import startup_manager
 
 class JarvisAssistant:
     """Main JARVIS Assistant class"""
     
-    def __init__(self):
+    def __init__(self, profile_startup=False, use_async_core=False):
         self.is_running = False
         self.system_tray = None
+        self.profile_startup = profile_startup
+        self.use_async_core = use_async_core
+        self.last_status = None
         self.setup_signal_handlers()
         
         # Initialize configuration
         Config.ensure_directories()
         Config.load_email_config()
+        latency_tracker.log_path = Config.LATENCY_LOG_FILE
         
         logger.log_startup()
     
@@ -70,37 +98,76 @@ class JarvisAssistant:
             # Start components
             logger.log_activity("Starting JARVIS components...")
             
-            # Start activity monitoring
-            activity_monitor.start_monitoring()
+            # With --async-core, capture, the keyboard trigger and monitoring run on one event loop
+            core = async_core if self.use_async_core else None
+            if core:
+                speech_recognition.use_async_core(core)
+            
+            # Kick off model loading first; everything below runs while it loads
+            speech_recognition.load_models_async()
+            if self.profile_startup:
+                speech_recognition.whisper_ready.add_done_callback(self._report_startup_profile)
+            
+            # Synthesize acknowledgments and other stock phrases so they play from memory
+            with startup_profiler.phase("Pre-warm TTS"):
+                tts.prewarm_async(jarvis_personality.common_phrases())
+            
+            # Pick up newly installed applications (cached index is reused otherwise)
+            with startup_profiler.phase("Refresh app index"):
+                app_index.refresh_async()
             
-            # Start speech recognition
-            speech_recognition.start_listening()
+            # Start activity monitoring; its ticks also keep the metrics cache fresh
+            with startup_profiler.phase("Start activity monitor"):
+                # Standing "if ... then ..." rules are checked against every sample
+                activity_monitor.add_listener(condition_engine.on_sample)
+                activity_monitor.start_monitoring(core=core)
+            
+            # Run timed commands (including any saved before the last shutdown)
+            with startup_profiler.phase("Start command scheduler"):
+                scheduler.start()
+            
+            # Start speech recognition (keyboard trigger now, audio once models are ready)
+            with startup_profiler.phase("Start speech recognition"):
+                speech_recognition.start_listening()
             
             # Start system tray
-            self.system_tray = SystemTray(self)
-            self.system_tray.start()
+            with startup_profiler.phase("Start system tray"):
+                self.system_tray = SystemTray(self)
+                self.system_tray.start()
             
             # Try to add to startup if not already there (optional feature)
-            try:
-                if not startup_manager.is_in_startup():
-                    success = startup_manager.add_to_startup()
-                    if not success:
-                        logger.log_activity("Startup registration failed (non-critical)")
-            except Exception as e:
-                logger.log_activity(f"Startup registration skipped: {str(e)}")
+            with startup_profiler.phase("Startup registration"):
+                try:
+                    if not startup_manager.is_in_startup():
+                        success = startup_manager.add_to_startup()
+                        if not success:
+                            logger.log_activity("Startup registration failed (non-critical)")
+                except Exception as e:
+                    logger.log_activity(f"Startup registration skipped: {str(e)}")
             
             # Initial greeting
             tts.speak("JARVIS assistant is now active and ready for commands")
             
-            logger.log_activity("JARVIS Assistant fully started")
+            startup_profiler.mark("Tray and keyboard trigger usable")
+            logger.log_activity(f"JARVIS Assistant fully started in {startup_profiler.elapsed():.2f}s")
             
             # Keep the main thread alive
-            self._main_loop()
+            if core:
+                self._run_async_core()
+            else:
+                self._main_loop()
             
         except Exception as e:
             logger.log_error("Error starting JARVIS", e)
             self.stop()
     
+    def _report_startup_profile(self, future):
+        """Print and log per-phase startup timings once all models have loaded"""
+        startup_profiler.mark("All speech models loaded")
+        report = startup_profiler.report()
+        print(report)
+        logger.log_activity(report)
+    
     def stop(self):
         """Stop JARVIS assistant"""
         if not self.is_running:
@@ -114,11 +181,21 @@ class JarvisAssistant:
             if hasattr(speech_recognition, 'cleanup'):
                 speech_recognition.cleanup()
             
+            async_core.stop()
+            command_executor.shutdown()
+            plan_executor.shutdown()
+            scheduler.stop()
             activity_monitor.stop_monitoring()
             
             if self.system_tray:
                 self.system_tray.stop()
             
+            if latency_tracker.spans:
+                logger.log_activity("\n" + latency_tracker.report())
+            speech_stats = tts.queue_stats()
+            if speech_stats["spoken"]:
+                logger.log_activity(f"TTS queue: {speech_stats}, cache: {tts.cache_stats()}")
+            
             logger.log_shutdown()
             
             # Give time for cleanup
@@ -149,6 +226,26 @@ class JarvisAssistant:
             logger.log_error("Error in main loop", e)
             self.stop()
     
+    def _run_async_core(self):
+        """Event-driven main loop: the tooltip refreshes on events, plus a slow periodic check"""
+        async_core.on("status", self._refresh_status)
+        async_core.every(Config.ASYNC_STATUS_INTERVAL, self._refresh_status)
+        try:
+            async_core.run()
+        except KeyboardInterrupt:
+            logger.log_activity("Keyboard interrupt received")
+            self.stop()
+        except Exception as e:
+            logger.log_error("Error in async core", e)
+            self.stop()
+    
+    async def _refresh_status(self):
+        """Push the status to the tray tooltip if it changed"""
+        status = self.get_status()
+        if self.system_tray and status != self.last_status:
+            self.last_status = status
+            self.system_tray.update_icon_tooltip(status)
+    
     def get_status(self):
         """Get current status of JARVIS"""
         components_status = []
@@ -180,6 +277,14 @@ class JarvisAssistant:
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="JARVIS Desktop Assistant",
+                                     epilog="Run 'main.py transcribe --help' for batch transcription")
+    parser.add_argument("--async-core", action="store_true",
+                        help="Run capture, monitoring and the keyboard trigger on one asyncio event loop")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print how long each startup phase takes")
+    args = parser.parse_args()
+    
     try:
         # Check if another instance is already running
         import psutil
@@ -198,7 +303,7 @@ def main():
                 continue
         
         # Create and start JARVIS
-        jarvis = JarvisAssistant()
+        jarvis = JarvisAssistant(profile_startup=args.profile_startup, use_async_core=args.async_core)
         jarvis.start()
         
     except Exception as e:
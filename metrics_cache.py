@@ -0,0 +1,96 @@
+"""
+System metrics cache for JARVIS
+Keeps the latest CPU, memory and battery readings so informational commands
+answer in milliseconds instead of blocking on psutil.cpu_percent(interval=1),
+and concurrent requests share one sample. There is no sampler thread: the
+activity monitor's tick takes a reading, and a stale one is refreshed on demand.
+"""
+
+import threading
+import time
+from datetime import datetime
+import psutil
+from config import Config
+
+
+class SystemMetricsReader:
+    """Reads CPU, memory and battery (battery fields None without one)
+
+    CPU usage is measured over the time since the previous reading, whichever
+    thread took it (psutil's own non-blocking cpu_percent is per thread).
+    """
+
+    def __init__(self):
+        self._last_cpu_times = None
+        self._lock = threading.Lock()
+
+    def cpu_percent(self):
+        with self._lock:
+            previous, current = self._last_cpu_times, psutil.cpu_times()
+            self._last_cpu_times = current
+        if previous is None:
+            # Nothing to compare against yet
+            return psutil.cpu_percent(interval=0.1)
+        total = sum(current) - sum(previous)
+        idle = (current.idle + getattr(current, "iowait", 0)) - (previous.idle + getattr(previous, "iowait", 0))
+        if total <= 0:
+            return 0.0
+        return round(max(0.0, min(100.0, (total - idle) / total * 100)), 1)
+
+    def __call__(self):
+        sample = {
+            "time": datetime.now(),
+            "cpu": self.cpu_percent(),
+            "memory": psutil.virtual_memory().percent,
+            "battery": None,
+            "plugged": None,
+        }
+        try:
+            battery = psutil.sensors_battery()
+            if battery:
+                sample["battery"] = battery.percent
+                sample["plugged"] = battery.power_plugged
+        except Exception:
+            pass
+        return sample
+
+
+class MetricsCache:
+    """Latest system metrics, refreshed on demand when stale"""
+
+    def __init__(self, ttl=None, reader=None):
+        self.ttl = Config.METRICS_CACHE_TTL if ttl is None else ttl
+        self.reader = reader or SystemMetricsReader()
+        self.sample = None
+        self.sampled_at = None          # time.monotonic() of the sample
+        self.refreshes = 0
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self):
+        """Take a new sample now"""
+        sample = self.reader()
+        self.sample, self.sampled_at = sample, time.monotonic()
+        self.refreshes += 1
+        return sample
+
+    def age(self):
+        """Seconds since the last sample, or None"""
+        return None if self.sampled_at is None else time.monotonic() - self.sampled_at
+
+    def get(self, max_age=None):
+        """A sample no older than max_age (default: the TTL)"""
+        max_age = self.ttl if max_age is None else max_age
+        sample, age = self.sample, self.age()
+        if sample is not None and age <= max_age:
+            return sample
+
+        # Stale: one caller refreshes, concurrent callers wait for its sample
+        with self._refresh_lock:
+            sample, age = self.sample, self.age()
+            if sample is not None and age <= max_age:
+                return sample
+            return self.refresh()
+
+
+# Global metrics cache
+metrics_cache = MetricsCache()
@@ -0,0 +1,191 @@
+"""
+Multi-step command execution for JARVIS
+Splits an utterance like "open chrome and open notepad and tell me cpu" into
+steps, works out which steps have to wait for others, runs the rest
+concurrently on a bounded worker pool (keeping the command executor's lane
+limits, so two capture steps never overlap) and folds everything the steps
+would have said into one spoken summary
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from logger import logger
+from tts import tts
+from intent_router import intent_router, tokenize
+from latency_tracker import latency_tracker
+from command_executor import command_executor
+
+# "," and "and" separate independent steps; ", then" and "and then" keep order
+SEPARATOR_PATTERN = re.compile(r"\s*(?:,|\s+and)\s+(then\s+)?")
+ORDERED_FORMS = [
+    re.compile(r"^first (.+?) then (.+)$"),
+    re.compile(r"^after (.+?) do (.+)$"),
+]
+
+# Steps whose side effects (the last photo or screenshot) later steps use
+PRODUCER_INTENTS = {"camera", "screenshot"}
+CONSUMER_INTENTS = {"email"}
+REFERENCE_WORDS = {"it", "that", "them", "those"}
+
+
+class PlanStep:
+    """One command of a multi-step utterance and what happened when it ran"""
+
+    def __init__(self, index, command, intent, depends_on):
+        self.index = index
+        self.command = command
+        self.intent = intent
+        self.depends_on = depends_on        # Indexes of steps that must finish first
+        self.after = []                     # Same-lane steps to wait for (ordering only, never skips)
+        self.spoken = []                    # What the step would have said
+        self.error = None                   # Exception the step raised
+        self.skipped = False
+        self.cause = None                   # The failed step that made this one skip
+        self.started = None
+        self.finished = None
+
+
+def split_steps(command):
+    """[(step, ordered), ...]; an ordered step waits for every earlier step"""
+    text = command.lower().strip()
+    steps = []
+    ordered = False
+    for form in ORDERED_FORMS:
+        match = form.match(text)
+        if match:
+            steps.append((match.group(1).strip(), False))
+            text = match.group(2)
+            ordered = True
+            break
+
+    position = 0
+    for separator in SEPARATOR_PATTERN.finditer(text):
+        steps.append((text[position:separator.start()].strip(), ordered))
+        ordered = bool(separator.group(1))
+        position = separator.end()
+    steps.append((text[position:].strip(), ordered))
+    return [(step, ordered) for step, ordered in steps if step]
+
+
+def build_plan(command):
+    """Split a command into PlanSteps with their dependencies"""
+    steps = []
+    lanes = {}                              # lane -> indexes of its steps so far
+    for index, (text, ordered) in enumerate(split_steps(command)):
+        intent = intent_router.best(text)
+        if ordered:
+            depends_on = set(range(index))
+        else:
+            depends_on = set()
+            # "take a screenshot and email it"
+            if index and REFERENCE_WORDS.intersection(tokenize(text)):
+                depends_on.add(index - 1)
+            if intent in CONSUMER_INTENTS:
+                depends_on.update(step.index for step in steps if step.intent in PRODUCER_INTENTS)
+        step = PlanStep(index, text, intent, sorted(depends_on))
+        # A lane limited to N (camera, screenshot and email share "capture", limit 1)
+        # runs a step only after the one N places before it in that lane
+        lane, limit = command_executor.lane_of(intent)
+        in_lane = lanes.setdefault(lane, [])
+        if len(in_lane) >= limit and in_lane[-limit] not in depends_on:
+            step.after = [in_lane[-limit]]
+        in_lane.append(index)
+        steps.append(step)
+    return steps
+
+
+def _sentence(text):
+    text = text.strip()
+    return text if text[-1:] in (".", "!", "?") else text + "."
+
+
+def summarize(steps):
+    """One reply covering every step, in the order they were asked for"""
+    parts = []
+    for step in steps:
+        if step.error is not None:
+            parts.append(f"I couldn't {step.command}.")
+        elif step.skipped:
+            parts.append(f"I skipped {step.command} because I couldn't {step.cause.command}.")
+        elif step.spoken:
+            parts.extend(_sentence(line) for line in step.spoken)
+        else:
+            parts.append(f"Done: {step.command}.")
+    return " ".join(parts)
+
+
+class PlanExecutor:
+    """Run plan steps on a bounded pool, each as soon as its dependencies finish"""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or Config.PLAN_MAX_WORKERS
+        self.pool = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="jarvis-plan")
+            return self.pool
+
+    def execute(self, steps, run_step):
+        """Run every step through run_step(command) and return the steps"""
+        if len(steps) < 2 or getattr(self._local, "in_plan", False):
+            # A plan inside a plan step runs inline rather than waiting on its own pool
+            for step in steps:
+                self._run(step, run_step, [steps[i] for i in step.depends_on], [])
+            return steps
+
+        # Steps are queued in order and only depend on earlier ones, so a
+        # step waiting on its dependencies never holds up one of them
+        pool = self._get_pool()
+        futures = []
+        for step in steps:
+            futures.append(pool.submit(latency_tracker.bind(self._run), step, run_step,
+                                       [steps[i] for i in step.depends_on],
+                                       [futures[i] for i in step.depends_on + step.after]))
+        for future in futures:
+            future.result()
+        return steps
+
+    def _run(self, step, run_step, dependencies, waits):
+        for future in waits:
+            future.result()
+        for dependency in dependencies:
+            if dependency.error is not None or dependency.skipped:
+                step.skipped = True
+                step.cause = dependency.cause or dependency
+                logger.log_activity(f"Skipping plan step '{step.command}': "
+                                    f"'{step.cause.command}' failed ({step.cause.error})")
+                return
+
+        previous = getattr(self._local, "in_plan", False)
+        self._local.in_plan = True
+        step.started = time.monotonic()
+        spoken = []
+        try:
+            with tts.collect() as spoken:
+                run_step(step.command)
+        except Exception as e:
+            step.error = e
+            logger.log_error(f"Plan step '{step.command}' failed", e)
+        finally:
+            step.finished = time.monotonic()
+            step.spoken = spoken
+            self._local.in_plan = previous
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        with self._lock:
+            if self.pool is not None:
+                self.pool.shutdown(wait=False)
+                self.pool = None
+
+
+# Global plan executor
+plan_executor = PlanExecutor()
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Streaming recognition pipeline for JARVIS
+source -> VAD -> ring buffer -> recognizer engine(s) -> hotword/command stage
+
+Every stage is a replaceable component. Engines follow the feed()/finalize()
+protocol from speech_engines.py, so several can run side by side on the same
+audio without duplicating the capture loop. With a WavFileSource the whole
+pipeline runs headless, which is how it is benchmarked.
+"""
+
+import threading
+import time
+from logger import logger
+from vad import VoiceActivityDetector
+from audio_buffer import AudioRingBuffer, AudioHistory
+
+# Zero-length chunk the capture side queues when VAD closes a speech segment;
+# the ring buffer never drops it, even when it overwrites the segment's audio
+END_OF_SEGMENT = b''
+
+# Partial results that are almost always noise
+NOISE_PATTERNS = ['uh', 'um', 'ah', 'eh', 'mm', 'hmm']
+
+# Primary hotword is now "hey"
+PRIMARY_HOTWORDS = ["hey", "hi", "hello"]
+
+# Secondary alternatives (less sensitive); "huh" is what Vosk sometimes recognizes
+ALTERNATIVE_HOTWORDS = ["jarvis", "activate", "huh"]
+
+
+def contains_hotword(text):
+    """Check if text contains the hotword"""
+    text_lower = text.lower().strip()
+
+    # Skip very short or empty text
+    if len(text_lower) < 2:
+        return False
+
+    # Check for exact matches or keywords at start of text
+    for keyword in PRIMARY_HOTWORDS:
+        if text_lower == keyword or text_lower.startswith(keyword + " "):
+            logger.log_activity(f"Hotword detected: '{keyword}' in '{text}'")
+            return True
+
+    for alt in ALTERNATIVE_HOTWORDS:
+        if alt in text_lower:
+            logger.log_activity(f"Alternative hotword detected: '{alt}' in '{text}'")
+            return True
+
+    return False
+
+
+def strip_hotword(text):
+    """Drop leading wake words a command segment picked up from the wake-word chunk"""
+    words = text.split()
+    while words and words[0].strip(",.!?").lower() in PRIMARY_HOTWORDS + ALTERNATIVE_HOTWORDS:
+        words.pop(0)
+    return " ".join(words)
+
+
+class HotwordCommandStage:
+    """Turn recognition results into hotword and command events"""
+
+    def __init__(self, on_hotword=None, on_command=None, hotword_matcher=contains_hotword,
+                 partial_commands=True, command_filter=strip_hotword):
+        self.on_hotword = on_hotword
+        self.on_command = on_command
+        self.hotword_matcher = hotword_matcher
+        self.command_filter = command_filter      # Cleans command text; empty means ignore it
+        self.partial_commands = partial_commands  # Accept long partials as commands
+        self.hotword_detected = False
+        self._handled = {}                        # "hotword"/"command" -> (segment, engine) that acted
+
+    def on_result(self, result):
+        """Handle one result from any engine"""
+        if result.is_final:
+            self._on_final(result)
+        else:
+            self._on_partial(result)
+
+    def _on_final(self, result):
+        # With engines side by side, act on the first engine that finalizes a
+        # segment - per role, so after a spotter -> recognizer handoff the
+        # recognizer's final for the same segment still carries the command
+        role = "command" if self.hotword_detected else "hotword"
+        handled = self._handled.get(role)
+        if handled and handled[0] == result.segment and handled[1] != result.engine:
+            return
+
+        text = result.text
+        logger.log_activity(f"Speech result ({result.engine}): '{text}'")
+        if role == "hotword":
+            logger.log_activity(f"Checking for hotword in: '{text}'")
+            if self.hotword_matcher(text):
+                self._handled[role] = (result.segment, result.engine)
+                self._fire_hotword()
+        else:
+            command = self.command_filter(text)
+            if command:
+                logger.log_activity(f"Processing command: '{command}'")
+                self._handled[role] = (result.segment, result.engine)
+                self._fire_command(command)
+
+    def _on_partial(self, result):
+        partial_text = result.text
+
+        # Only process meaningful partial results and avoid noise
+        if len(partial_text) < 3 or any(pattern in partial_text for pattern in NOISE_PATTERNS):
+            return
+
+        if not self.hotword_detected:
+            logger.log_activity(f"Partial result: '{partial_text}'")
+            if self.hotword_matcher(partial_text):
+                self._fire_hotword()
+        elif self.partial_commands and len(partial_text) >= 6:
+            # Longer partial text might be a complete command
+            command = self.command_filter(partial_text)
+            if command:
+                logger.log_activity(f"Command from partial result: '{command}'")
+                self._fire_command(command)
+
+    def _fire_hotword(self):
+        self.hotword_detected = True
+        if self.on_hotword:
+            self.on_hotword()
+
+    def _fire_command(self, text):
+        if self.on_command:
+            self.on_command(text)
+        self.hotword_detected = False
+
+
+class RecognitionPipeline:
+    """Wire a source, VAD, engines and a result stage together"""
+
+    def __init__(self, source=None, engines=None, stage=None, vad=None, buffer=None, history=None):
+        self.source = source
+        self.engines = list(engines or [])
+        self.stage = stage
+        self.vad = vad or VoiceActivityDetector()
+        # Empty buffers are falsy, so test for None
+        self.buffer = buffer if buffer is not None else AudioRingBuffer()
+        self.history = history if history is not None else AudioHistory()
+
+        self.is_running = False
+        self.segment = 0
+        self.last_stamp = None    # Capture time of the chunk most recently recognized
+        self.segment_start = None # Capture time of the current segment's first sample
+        self._in_segment = False
+        self._source_ended = False
+        self._lock = threading.RLock()   # Engines are fed from stage callbacks too (see handoff)
+        self.capture_thread = None
+        self.recognition_thread = None
+
+        # Statistics
+        self.chunks_captured = 0
+        self.bytes_captured = 0
+        self.results = 0
+        self.engine_time = {}
+
+    # ---------------- Configuration ---------------- #
+    def set_engines(self, engines):
+        """Replace the engines (e.g. once models finish loading)"""
+        self.engines = list(engines)
+
+    def add_engine(self, engine):
+        """Run another engine side by side with the existing ones"""
+        self.engines.append(engine)
+
+    def handoff(self, engines, since):
+        """Switch engines mid-segment, replaying the open segment's audio from `since`
+
+        After a wake word the full recognizer starts from the chunk the wake
+        word ended in, so a command spoken in the same breath is not clipped.
+        """
+        with self._lock:
+            self.set_engines(engines)
+            if self._in_segment:
+                for chunk in self.history.chunks(self.segment, since):
+                    self._feed(chunk)
+
+    # ---------------- Capture side ---------------- #
+    def capture(self, data, stamp=None):
+        """Gate a captured chunk through VAD and queue the speech
+
+        `stamp` is the capture time of the chunk's last sample (default: now);
+        pre-roll chunks released along with it are back-dated by their length.
+        """
+        if stamp is None:
+            stamp = time.monotonic()
+        self.chunks_captured += 1
+        self.bytes_captured += len(data)
+
+        was_in_speech = self.vad.in_speech
+        forwarded = self.vad.process(data)
+        bytes_per_second = 2 * getattr(self.source, "sample_rate", 16000)
+        remaining = sum(len(chunk) for chunk in forwarded)
+        for chunk in forwarded:
+            remaining -= len(chunk)
+            self.buffer.put(chunk, stamp=stamp - remaining / bytes_per_second)
+        if was_in_speech and not self.vad.in_speech:
+            self.buffer.put(END_OF_SEGMENT, stamp=stamp)
+
+    def end_of_stream(self):
+        """Close any open speech segment once the source is exhausted"""
+        if self.vad.in_speech:
+            self.vad.reset()
+            self.buffer.put(END_OF_SEGMENT)
+
+    # ---------------- Recognition side ---------------- #
+    def recognize(self, chunk, stamp=None):
+        """Feed one queued chunk (or end-of-segment marker) to the engines"""
+        with self._lock:
+            if not chunk:
+                self._finish_segment()
+                return
+
+            self.last_stamp = time.monotonic() if stamp is None else stamp
+            if not self._in_segment:
+                self._in_segment = True
+                self.segment += 1
+                sample_rate = getattr(self.source, "sample_rate", 16000)
+                self.segment_start = self.last_stamp - len(chunk) / 2 / sample_rate
+
+            self.history.append(chunk, self.last_stamp, self.segment)
+            self._feed(chunk)
+
+    def _feed(self, chunk):
+        for engine in self.engines:
+            start = time.perf_counter()
+            result = engine.feed(chunk)
+            self._account(engine, start)
+            if result:
+                self._emit(result)
+
+    def _finish_segment(self):
+        if not self._in_segment:
+            return
+        self._in_segment = False
+
+        for engine in self.engines:
+            start = time.perf_counter()
+            result = engine.finalize()
+            self._account(engine, start)
+            if result:
+                self._emit(result)
+
+    def _account(self, engine, start):
+        self.engine_time[engine.name] = self.engine_time.get(engine.name, 0.0) + time.perf_counter() - start
+
+    def _emit(self, result):
+        result.segment = self.segment
+        result.start = self.segment_start
+        self.results += 1
+        if self.stage:
+            self.stage.on_result(result)
+
+    def _drain(self):
+        while True:
+            chunk = self.buffer.get(timeout=0)
+            if chunk is None:
+                return
+            self.recognize(chunk, self.buffer.last_stamp)
+
+    # ---------------- Drivers ---------------- #
+    def run(self):
+        """Process the whole source on the calling thread (headless replay)
+
+        Chunks are stamped with their position in the stream rather than the
+        wall clock, so segment timing matches the audio however fast it replays.
+        """
+        self.is_running = True
+        bytes_per_second = 2 * getattr(self.source, "sample_rate", 16000)
+        try:
+            while self.is_running:
+                data = self.source.read()
+                if data is None:
+                    break
+                self.capture(data, stamp=(self.bytes_captured + len(data)) / bytes_per_second)
+                self._drain()
+            self.end_of_stream()
+            self._drain()
+        finally:
+            self.is_running = False
+        return self.get_stats()
+
+    def start(self):
+        """Run capture and recognition on background threads"""
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self._source_ended = False
+        self.buffer.reopen()
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.recognition_thread = threading.Thread(target=self._recognition_loop, daemon=True)
+        self.capture_thread.start()
+        self.recognition_thread.start()
+
+    def stop(self):
+        """Stop both threads"""
+        self.is_running = False
+        self.buffer.close()  # Wake the recognition thread immediately
+
+        for thread in (self.capture_thread, self.recognition_thread):
+            if thread and thread is not threading.current_thread():
+                thread.join(timeout=1.0)
+
+    def wait(self, timeout=None):
+        """Block until a finite source has been fully recognized"""
+        if self.recognition_thread:
+            self.recognition_thread.join(timeout)
+
+    def _capture_loop(self):
+        logger.log_activity("Audio capture loop started with voice activity detection")
+
+        while self.is_running:
+            try:
+                data = self.source.read()
+                if data is None:
+                    break
+                self.capture(data)
+
+                # Log occasionally with volume level and gate cost
+                if self.chunks_captured % 50 == 0:
+                    stats = self.vad.get_stats()
+                    logger.log_activity(
+                        f"Captured {self.chunks_captured} audio chunks "
+                        f"(vol: {self.vad.last_rms:.0f}, vad: {stats['avg_cost_us']:.0f}us/chunk, "
+                        f"dropped: {self.buffer.overflows})"
+                    )
+            except Exception as e:
+                logger.log_error("Error in listen loop", e)
+                break
+
+        self.end_of_stream()
+        self._source_ended = True
+
+    def _recognition_loop(self):
+        logger.log_activity("Speech recognition processing started")
+
+        while self.is_running:
+            try:
+                # Sleep on the ring buffer's condition until the capture thread delivers audio
+                chunk = self.buffer.get(timeout=0.5)
+                if chunk is None:
+                    if self._source_ended and not self.buffer:
+                        break
+                    continue
+                self.recognize(chunk, self.buffer.last_stamp)
+            except Exception as e:
+                logger.log_error("Error processing audio", e)
+
+    def get_stats(self):
+        """Return throughput and per-engine cost"""
+        sample_rate = getattr(self.source, "sample_rate", 16000)
+        audio_seconds = self.bytes_captured / 2 / sample_rate
+        return {
+            "chunks_captured": self.chunks_captured,
+            "audio_seconds": audio_seconds,
+            "segments": self.segment,
+            "results": self.results,
+            "engine_seconds": dict(self.engine_time),
+            "engine_rtf": {
+                name: (seconds / audio_seconds if audio_seconds else 0.0)
+                for name, seconds in self.engine_time.items()
+            },
+            "vad": self.vad.get_stats(),
+            "buffer": self.buffer.get_stats()
+        }
+
+
+def main():
+    """Replay a WAV file through the pipeline and print results and timing"""
+    import argparse
+    import json
+    import speech_engines
+    from audio_source import WavFileSource
+
+    parser = argparse.ArgumentParser(description="Run the JARVIS recognition pipeline headless")
+    parser.add_argument("wav", nargs="?", default="test_recording.wav", help="16 kHz mono WAV to replay")
+    parser.add_argument("--engines", nargs="+", default=["vosk"], choices=["vosk", "whisper", "google"])
+    args = parser.parse_args()
+
+    engines = []
+    for name in args.engines:
+        if name == "vosk":
+            model = speech_engines.load_vosk_model()
+            if model:
+                engines.append(speech_engines.VoskEngine(model))
+        elif name == "whisper":
+            model = speech_engines.load_whisper_model("base")
+            if model:
+                engines.append(speech_engines.WhisperEngine(model))
+        elif name == "google":
+            engine = speech_engines.create_google_engine()
+            if engine:
+                engines.append(engine)
+
+    if not engines:
+        print("❌ None of the requested engines are available")
+
+    class PrintStage:
+        def on_result(self, result):
+            print(f"[segment {result.segment}] {result.engine}: {result.text}")
+
+    pipeline = RecognitionPipeline(WavFileSource(args.wav), engines, PrintStage())
+    start = time.perf_counter()
+    stats = pipeline.run()
+    stats["wall_seconds"] = time.perf_counter() - start
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Command scheduler for JARVIS
+Keeps timed commands ("in 5 minutes ...", "at 7 pm ...") in a heap served by
+a single thread that sleeps until the next job is due, and saves them to
+disk so they survive restarts
+"""
+
+import heapq
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from config import Config
+from logger import logger
+from command_executor import command_executor
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+    "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
+    "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18, "nineteen": 19, "twenty": 20
+}
+
+# Words that only say *what kind* of thing to cancel, not which one
+REFERENCE_FILLER = {
+    "cancel", "delete", "remove", "the", "my", "a", "scheduled", "schedule", "command", "commands",
+    "job", "jobs", "reminder", "reminders", "timer", "timers", "task", "tasks", "number", "to", "please"
+}
+
+# Words a job id follows, as in "job 5" or "number five"
+ID_MARKERS = {"job", "number", "command", "id"}
+
+
+class ScheduledJob:
+    """A command to run at `due` (seconds since the epoch)"""
+
+    def __init__(self, job_id, due, command, created=None):
+        self.id = job_id
+        self.due = due
+        self.command = command
+        self.created = created if created is not None else time.time()
+
+    def to_dict(self):
+        return {"id": self.id, "due": self.due, "command": self.command, "created": self.created}
+
+    def describe(self, now=None):
+        """e.g. "open chrome at 07:30 PM" or "open chrome tomorrow at 09:00 AM" """
+        return f"{self.command} {describe_time(self.due, now)}"
+
+
+def describe_time(due, now=None):
+    """When a due time is, relative to today"""
+    due = datetime.fromtimestamp(due)
+    today = (now or datetime.now()).date()
+    clock = due.strftime("%I:%M %p")
+    if due.date() == today:
+        return f"at {clock}"
+    if due.date() == today + timedelta(days=1):
+        return f"tomorrow at {clock}"
+    return f"on {due.strftime('%A, %B %d')} at {clock}"
+
+
+def spoken_times(due):
+    """Ways to say a due time, e.g. "5 pm 5:00 pm 05:00 pm 17:00", for matching cancel commands"""
+    due = datetime.fromtimestamp(due)
+    hour = due.strftime("%I").lstrip("0")
+    suffix = due.strftime("%p").lower()
+    forms = [f"{hour}:{due.minute:02d} {suffix}", due.strftime("%I:%M ") + suffix, due.strftime("%H:%M")]
+    if due.minute == 0:
+        forms.insert(0, f"{hour} {suffix}")
+    return " ".join(forms)
+
+
+def parse_job_reference(command):
+    """Which job(s) a cancel command means: 'all', a job id, or words of its command
+
+    Only an explicit id ("job 5", "#5", "number five", "command 12") counts as
+    one, so the 5 in "cancel the 5 pm reminder" stays part of the job's words.
+    """
+    words = re.findall(r"#?[a-z0-9']+", command.lower())
+    if "all" in words or "everything" in words:
+        return "all"
+    for previous, word in zip([None] + words, words):
+        if word.startswith("#") and word[1:].isdigit():
+            return int(word[1:])
+        if previous in ID_MARKERS:
+            if word.isdigit():
+                return int(word)
+            if word in NUMBER_WORDS:
+                return NUMBER_WORDS[word]
+    remaining = [word.lstrip("#") for word in words if word not in REFERENCE_FILLER]
+    return " ".join(remaining) or None
+
+
+class CommandScheduler:
+    """Heap of pending jobs; one thread wakes once per due time to run them
+
+    Cancelled jobs are dropped from `jobs` right away and their heap entries
+    skipped when they reach the top (compacted once they pile up), so add and
+    cancel stay O(log n).
+    """
+
+    def __init__(self, path=None, grace=None):
+        self.path = path
+        self.grace = Config.SCHEDULE_GRACE_SECONDS if grace is None else grace
+        self.runner = None
+        self.jobs = {}                  # id -> ScheduledJob
+        self._heap = []                 # (due, id), may hold cancelled ids
+        self._next_id = 1
+        self._condition = threading.Condition()
+        self._dirty = False
+        self._thread = None
+        self._running = False
+        if path:
+            self._load()
+
+    def _load(self):
+        """Read saved jobs, dropping any that were missed by more than the grace period"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except Exception as e:
+            logger.log_error(f"Failed to load scheduled commands from {self.path}", e)
+            return
+
+        cutoff = time.time() - self.grace
+        for entry in saved.get("jobs", []):
+            job = ScheduledJob(entry["id"], entry["due"], entry["command"], entry.get("created"))
+            if job.due < cutoff:
+                logger.log_activity(f"Dropped scheduled command missed while offline: {job.describe()}")
+                self._dirty = True
+                continue
+            self.jobs[job.id] = job
+            self._heap.append((job.due, job.id))
+        heapq.heapify(self._heap)
+        self._next_id = max([saved.get("next_id", 1)] + [job.id + 1 for job in self.jobs.values()])
+        logger.log_activity(f"Loaded {len(self.jobs)} scheduled commands")
+
+    def _snapshot(self):
+        """Pending jobs as saved on disk (called with the lock held)"""
+        self._dirty = False
+        return {"next_id": self._next_id, "jobs": [job.to_dict() for job in self.jobs.values()]}
+
+    def _save(self, data):
+        """Write a snapshot atomically"""
+        if not self.path:
+            return
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.log_error(f"Failed to save scheduled commands to {self.path}", e)
+
+    def add(self, command, due):
+        """Schedule `command` to run at `due` (epoch seconds)"""
+        with self._condition:
+            job = ScheduledJob(self._next_id, due, command)
+            self._next_id += 1
+            self.jobs[job.id] = job
+            heapq.heappush(self._heap, (due, job.id))
+            self._changed()
+        logger.log_activity(f"Scheduled command #{job.id}: {job.describe()}")
+        return job
+
+    def cancel(self, job_id):
+        """Cancel one job; returns it, or None if there was no such job"""
+        with self._condition:
+            job = self.jobs.pop(job_id, None)
+            if job is None:
+                return None
+            if len(self._heap) > 2 * len(self.jobs) + 64:
+                self._heap = [(due, i) for due, i in self._heap if i in self.jobs]
+                heapq.heapify(self._heap)
+            self._changed()
+        logger.log_activity(f"Cancelled scheduled command #{job.id}: {job.command}")
+        return job
+
+    def cancel_all(self):
+        """Cancel every pending job; returns how many there were"""
+        with self._condition:
+            count = len(self.jobs)
+            self.jobs.clear()
+            self._heap = []
+            self._changed()
+        logger.log_activity(f"Cancelled all {count} scheduled commands")
+        return count
+
+    def find(self, text):
+        """Pending jobs whose command contains `text`, or that are due at the time it names, soonest first"""
+        return [job for job in self.list_jobs() if text in job.command or text in spoken_times(job.due)]
+
+    def list_jobs(self):
+        """Pending jobs, soonest first"""
+        with self._condition:
+            jobs = list(self.jobs.values())
+        return sorted(jobs, key=lambda job: (job.due, job.id))
+
+    def _changed(self):
+        self._dirty = True
+        self._condition.notify()
+
+    def _pop_due(self, now):
+        """Remove and return every job due at `now` (called with the lock held)"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, job_id = heapq.heappop(self._heap)
+            job = self.jobs.pop(job_id, None)
+            if job is not None:
+                due.append(job)
+        if due:
+            self._dirty = True
+        return due
+
+    def start(self, runner=None):
+        """Start the scheduler thread; due commands go to runner(command)"""
+        if runner is not None:
+            self.runner = runner
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._loop, name="jarvis-scheduler", daemon=True)
+        self._thread.start()
+        logger.log_activity("Command scheduler started")
+
+    def stop(self):
+        """Stop the scheduler thread and save pending jobs"""
+        with self._condition:
+            if not self._running:
+                return
+            self._running = False
+            self._condition.notify()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        with self._condition:
+            data = self._snapshot() if self._dirty else None
+        if data is not None:
+            self._save(data)
+
+    def _loop(self):
+        while True:
+            with self._condition:
+                if not self._running:
+                    return
+                for job in self._pop_due(time.time()):
+                    self._fire(job)
+                data = self._snapshot() if self._dirty else None
+
+            if data is not None:
+                # Written outside the lock so adds and cancels never wait on
+                # the disk; changes made meanwhile are picked up next pass
+                self._save(data)
+                continue
+
+            with self._condition:
+                while self._heap and self._heap[0][1] not in self.jobs:
+                    heapq.heappop(self._heap)       # Cancelled
+                timeout = None
+                if self._heap:
+                    # Capped so a changed wall clock (or a suspended PC) is noticed
+                    timeout = min(max(0.0, self._heap[0][0] - time.time()), Config.SCHEDULE_MAX_SLEEP)
+                if self._running and not self._dirty:
+                    self._condition.wait(timeout)
+
+    def _fire(self, job):
+        """Run a due job's command on the command pool"""
+        logger.log_activity(f"Running scheduled command #{job.id}: {job.command}")
+        command_executor.submit(job.command, source="schedule", runner=self.runner)
+
+
+# Global command scheduler
+scheduler = CommandScheduler(path=Config.SCHEDULE_FILE)
@@ -0,0 +1,386 @@
+"""
+Speech recognition engines for JARVIS
+Every engine implements the same streaming protocol so the recognition
+pipeline can swap them or run several side by side:
+
+    feed(chunk)  -> RecognitionResult or None   (partial or early final)
+    finalize()   -> RecognitionResult or None   (end of the speech segment)
+    reset()      -> drop any buffered audio
+"""
+
+import os
+import json
+import time
+import importlib.util
+from logger import logger
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Recognizers are optional (callers log what is missing) and are only imported
+# when a model is loaded: Whisper alone pulls in torch, which takes seconds
+VOSK_AVAILABLE = importlib.util.find_spec("vosk") is not None
+WHISPER_AVAILABLE = importlib.util.find_spec("whisper") is not None
+
+# The legacy speech_recognition.py in this folder shadows the PyPI package of
+# the same name (and opens the microphone on import), so check where it resolves
+_sr_spec = importlib.util.find_spec("speech_recognition")
+if _sr_spec and os.path.dirname(os.path.abspath(_sr_spec.origin or "")) != os.path.dirname(os.path.abspath(__file__)):
+    import speech_recognition as sr
+    GOOGLE_SR_AVAILABLE = True
+else:
+    GOOGLE_SR_AVAILABLE = False
+
+
+WHISPER_SAMPLE_RATE = 16000
+
+
+def pcm16_to_float32(audio_data, sample_rate=WHISPER_SAMPLE_RATE):
+    """Convert 16-bit mono PCM to the float32 [-1, 1) array Whisper expects"""
+    samples = np.frombuffer(audio_data, dtype=np.int16, count=len(audio_data) // 2).astype(np.float32)
+    samples *= 1.0 / 32768.0
+
+    if sample_rate != WHISPER_SAMPLE_RATE and len(samples):
+        # Linear resample; capture normally already runs at 16 kHz
+        duration = len(samples) / sample_rate
+        target = np.linspace(0.0, duration, int(duration * WHISPER_SAMPLE_RATE), endpoint=False)
+        source = np.arange(len(samples)) / sample_rate
+        samples = np.interp(target, source, samples).astype(np.float32)
+
+    return samples
+
+
+class RecognitionResult:
+    """Text produced by an engine for part of a speech segment"""
+
+    def __init__(self, text, engine, is_final=True, segment=0, latency=0.0, words=None):
+        self.text = text
+        self.engine = engine
+        self.is_final = is_final
+        self.segment = segment      # Set by the pipeline
+        self.latency = latency      # Seconds the engine spent producing this result
+        self.words = words or []    # (word, start, end) in seconds from the segment start
+        self.start = None           # Capture time of the segment start, set by the pipeline
+
+    def __repr__(self):
+        kind = "final" if self.is_final else "partial"
+        return f"RecognitionResult({self.engine}, {kind}, {self.text!r})"
+
+
+class RecognizerEngine:
+    """Base class for streaming recognizer engines"""
+
+    name = "base"
+
+    def feed(self, chunk):
+        """Consume a chunk of 16-bit mono PCM; may return an interim result"""
+        raise NotImplementedError
+
+    def finalize(self):
+        """Flush the current segment and return its final result"""
+        raise NotImplementedError
+
+    def reset(self):
+        """Discard buffered audio without producing a result"""
+        pass
+
+
+class BufferedEngine(RecognizerEngine):
+    """Engine that collects a whole segment and recognizes it at finalize()"""
+
+    def __init__(self, sample_rate=16000):
+        self.sample_rate = sample_rate
+        self._segment = bytearray()
+
+    def feed(self, chunk):
+        self._segment += chunk
+        return None
+
+    def finalize(self):
+        if not self._segment:
+            return None
+        audio_data = bytes(self._segment)
+        self._segment.clear()
+
+        start = time.perf_counter()
+        text, words = self.transcribe_words(audio_data)
+        if not text:
+            return None
+        return RecognitionResult(text, self.name, latency=time.perf_counter() - start, words=words)
+
+    def reset(self):
+        self._segment.clear()
+
+    def transcribe(self, audio_data):
+        """Recognize a complete utterance of 16-bit mono PCM"""
+        raise NotImplementedError
+
+    def transcribe_words(self, audio_data):
+        """Return (text, word timings); engines without timings report none"""
+        return self.transcribe(audio_data), []
+
+
+class VoskEngine(RecognizerEngine):
+    """Streaming Vosk (Kaldi) recognizer"""
+
+    name = "vosk"
+
+    def __init__(self, model, sample_rate=16000, partial_results=False, words=False):
+        self.model = model
+        self.sample_rate = sample_rate
+        self.partial_results = partial_results
+
+        import vosk
+        self.recognizer = vosk.KaldiRecognizer(model, sample_rate)
+        if words:
+            self.recognizer.SetWords(True)
+
+        # Vosk times words from the first sample it was ever fed (Reset()
+        # doesn't rewind), so track that to make timings segment-relative
+        self._stream_seconds = 0.0
+        self._segment_start = None
+
+    def feed(self, chunk):
+        start = time.perf_counter()
+        if self._segment_start is None:
+            self._segment_start = self._stream_seconds
+        self._stream_seconds += len(chunk) / 2 / self.sample_rate
+
+        if self.recognizer.AcceptWaveform(bytes(chunk)):
+            result = self._final(self.recognizer.Result(), start)
+            if result:
+                return result
+        elif self.partial_results:
+            partial = json.loads(self.recognizer.PartialResult()).get('partial', '').strip().lower()
+            if partial:
+                return RecognitionResult(partial, self.name, is_final=False,
+                                         latency=time.perf_counter() - start)
+        return None
+
+    def finalize(self):
+        start = time.perf_counter()
+        result = self._final(self.recognizer.FinalResult(), start)
+        self._segment_start = None
+        return result
+
+    def reset(self):
+        self.recognizer.Reset()
+        self._segment_start = None
+
+    def _final(self, raw, start):
+        """Build a final result, with word timings when SetWords is on"""
+        parsed = json.loads(raw)
+        text = parsed.get('text', '').strip().lower()
+        if not text:
+            return None
+        offset = self._segment_start or 0.0
+        words = [(w['word'], w['start'] - offset, w['end'] - offset) for w in parsed.get('result', [])]
+        return RecognitionResult(text, self.name, latency=time.perf_counter() - start, words=words)
+
+    def transcribe(self, audio_data):
+        """Recognize a complete utterance in one call"""
+        self.reset()
+        self._stream_seconds += len(audio_data) / 2 / self.sample_rate
+        self.recognizer.AcceptWaveform(bytes(audio_data))
+        return json.loads(self.recognizer.FinalResult()).get('text', '').strip().lower()
+
+
+class HotwordSpotter(RecognizerEngine):
+    """Vosk recognizer restricted by grammar to the wake words
+
+    Far cheaper than the full large-vocabulary recognizer, so it is the only
+    engine running while JARVIS waits for the hotword.
+    """
+
+    name = "hotword"
+
+    def __init__(self, model, wake_words, sample_rate=16000):
+        import vosk
+
+        self.wake_words = [word.lower() for word in wake_words]
+        self._tokens = sorted({token for word in self.wake_words for token in word.split()})
+        grammar = json.dumps(self.wake_words + ["[unk]"])
+        self.recognizer = vosk.KaldiRecognizer(model, sample_rate, grammar)
+
+    def feed(self, chunk):
+        start = time.perf_counter()
+        if self.recognizer.AcceptWaveform(bytes(chunk)):
+            return self._result(self.recognizer.Result(), 'text', True, start)
+
+        # Substring test on the raw partial JSON; only parse it when a wake word shows up
+        partial = self.recognizer.PartialResult()
+        if any(token in partial for token in self._tokens):
+            return self._result(partial, 'partial', False, start)
+        return None
+
+    def finalize(self):
+        start = time.perf_counter()
+        return self._result(self.recognizer.FinalResult(), 'text', True, start)
+
+    def reset(self):
+        self.recognizer.Reset()
+
+    def _result(self, raw, key, is_final, start):
+        text = json.loads(raw).get(key, '').replace('[unk]', '').strip()
+        if not text:
+            return None
+        return RecognitionResult(text, self.name, is_final=is_final, latency=time.perf_counter() - start)
+
+
+class WhisperEngine(BufferedEngine):
+    """OpenAI Whisper run over whole speech segments"""
+
+    name = "whisper"
+
+    def __init__(self, model, sample_rate=16000, word_timestamps=False):
+        super().__init__(sample_rate)
+        self.model = model
+        self.word_timestamps = word_timestamps
+
+    def transcribe(self, audio_data):
+        return self.transcribe_words(audio_data)[0]
+
+    def transcribe_words(self, audio_data):
+        try:
+            # Whisper takes 16 kHz float32 directly, so skip the WAV/ffmpeg round-trip
+            audio = pcm16_to_float32(audio_data, self.sample_rate)
+            if self.word_timestamps:
+                result = self.model.transcribe(audio, fp16=self._use_fp16(), word_timestamps=True)
+            else:
+                result = self.model.transcribe(audio, fp16=self._use_fp16())
+            words = [(w['word'].strip().lower(), w['start'], w['end'])
+                     for segment in result.get('segments', []) for w in segment.get('words', [])]
+            return result.get('text', '').lower().strip(), words
+        except Exception as e:
+            logger.log_error("Whisper recognition error", e)
+            return "", []
+
+    def _use_fp16(self):
+        """Half precision only helps (and only works quietly) on a GPU"""
+        device = getattr(self.model, "device", None)
+        return getattr(device, "type", "cpu") == "cuda"
+
+
+class GoogleEngine(BufferedEngine):
+    """Google Web Speech API via the SpeechRecognition package (online)"""
+
+    name = "google"
+
+    def __init__(self, recognizer=None, sample_rate=16000, language='en-US'):
+        super().__init__(sample_rate)
+        self.recognizer = recognizer or sr.Recognizer()
+        self.language = language
+
+    def transcribe(self, audio_data):
+        try:
+            audio = sr.AudioData(audio_data, self.sample_rate, 2)
+            return self.recognizer.recognize_google(audio, language=self.language).lower().strip()
+        except sr.UnknownValueError:
+            return ""
+        except sr.RequestError as e:
+            logger.log_error("Google Speech Recognition error", e)
+            return ""
+
+
+class FallbackEngine(BufferedEngine):
+    """Try engines in order on the whole segment until one returns text"""
+
+    name = "fallback"
+
+    def __init__(self, engines, sample_rate=16000):
+        super().__init__(sample_rate)
+        self.engines = list(engines)
+
+    def finalize(self):
+        if not self._segment:
+            return None
+        audio_data = bytes(self._segment)
+        self._segment.clear()
+
+        for engine in self.engines:
+            start = time.perf_counter()
+            try:
+                text = engine.transcribe(audio_data)
+            except Exception as e:
+                logger.log_error(f"Speech recognition error with {engine.name}", e)
+                continue
+            if text:
+                return RecognitionResult(text, engine.name, latency=time.perf_counter() - start)
+        return None
+
+    def transcribe(self, audio_data):
+        for engine in self.engines:
+            text = engine.transcribe(audio_data)
+            if text:
+                return text
+        return ""
+
+
+def find_vosk_model_path(prefer_small=False):
+    """Return the best installed Vosk model directory, or None
+
+    Large models are preferred for recognition; the hotword spotter asks for
+    a small one because only small models support runtime grammars.
+    """
+    from config import Config
+
+    large = [Config.VOSK_MODEL_PATH, "models/vosk-model-en-us-0.22"]
+    small = [Config.VOSK_SMALL_MODEL_PATH, "models/vosk-model-small-en-us-0.15"]
+    candidates = small + large if prefer_small else large + small
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def load_vosk_model(prefer_small=False):
+    """Load the best available Vosk model, or return None"""
+    if not VOSK_AVAILABLE:
+        return None
+
+    model_path = find_vosk_model_path(prefer_small)
+    if not model_path:
+        from config import Config
+        logger.log_error(f"Vosk model not found at {Config.VOSK_MODEL_PATH}")
+        logger.log_error("Please download the Vosk model manually from: https://alphacephei.com/vosk/models/")
+        logger.log_error("Or run: python setup_vosk_small.py")
+        return None
+
+    try:
+        import vosk
+        model = vosk.Model(model_path)
+        logger.log_activity(f"Vosk model loaded: {model_path}")
+        return model
+    except Exception as e:
+        logger.log_error("Failed to initialize Vosk", e)
+        return None
+
+
+def load_whisper_model(name="base"):
+    """Load a Whisper model, or return None"""
+    if not WHISPER_AVAILABLE:
+        return None
+
+    try:
+        import whisper
+        model = whisper.load_model(name)
+        logger.log_activity(f"Whisper model loaded: {name}")
+        return model
+    except Exception as e:
+        logger.log_error("Failed to initialize Whisper", e)
+        return None
+
+
+def create_google_engine():
+    """Create a Google engine if the SpeechRecognition package is installed"""
+    if not GOOGLE_SR_AVAILABLE:
+        return None
+
+    try:
+        return GoogleEngine()
+    except Exception as e:
+        logger.log_error("Failed to initialize Google Speech Recognition", e)
+        return None
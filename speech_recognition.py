@@ -6,7 +6,8 @@ import threading
 import time
 from collections import deque
 from logger import logger
-from tts import tts
+from tts import tts, ACK, ERROR
+from command_executor import command_executor
 
 class SpeechRecognition:
     """Speech recognition using Vosk for offline processing"""
@@ -142,7 +143,8 @@ class SpeechRecognition:
     def _on_hotword_detected(self):
         """Handle hotword detection"""
         logger.log_activity("Hotword detected")
-        tts.speak("Yes?")
+        tts.interrupt()
+        tts.speak("Yes?", priority=ACK)
         
         # Set a timeout for command listening
         threading.Timer(10.0, self._reset_hotword_detection).start()
@@ -151,16 +153,9 @@ class SpeechRecognition:
         """Handle command detection"""
         logger.log_activity(f"Command detected: {command}")
         
-        # Import here to avoid circular imports
-        from command_processor import process_command
-        
-        # Process command in separate thread
-        thread = threading.Thread(
-            target=process_command, 
-            args=(command,), 
-            daemon=True
-        )
-        thread.start()
+        # Process command on the shared command pool
+        if command_executor.submit(command) is None:
+            tts.speak("I'm still working on your earlier commands", priority=ERROR)
     
     def _reset_hotword_detection(self):
         """Reset hotword detection after timeout"""
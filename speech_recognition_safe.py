@@ -1,145 +1,246 @@
-import os
-import json
 import threading
 import time
-from collections import deque
+from concurrent.futures import Future
 from logger import logger
-from tts import tts
+from tts import tts, ACK, ERROR
+from vad import VoiceActivityDetector
+from audio_buffer import AudioRingBuffer, AudioHistory
+from audio_source import MicrophoneSource, PYAUDIO_AVAILABLE
+from recognition_pipeline import RecognitionPipeline, HotwordCommandStage, contains_hotword, strip_hotword
+from startup_profiler import startup_profiler
+from command_executor import command_executor
+from latency_tracker import latency_tracker, WAKE_END, HOTWORD, SPEECH_END, RECOGNIZER_FINAL
+from speech_engines import (
+    VOSK_AVAILABLE, WHISPER_AVAILABLE, VoskEngine, WhisperEngine, HotwordSpotter,
+    find_vosk_model_path, load_vosk_model, load_whisper_model
+)
 
-# Try to import dependencies, but make them optional
-try:
-    import vosk
-    VOSK_AVAILABLE = True
-except ImportError:
-    VOSK_AVAILABLE = False
+if not VOSK_AVAILABLE:
     logger.log_error("Vosk not available - speech recognition will be disabled")
-
-try:
-    import pyaudio
-    PYAUDIO_AVAILABLE = True
-except ImportError:
-    PYAUDIO_AVAILABLE = False
+if not PYAUDIO_AVAILABLE:
     logger.log_error("PyAudio not available - using alternative audio method")
-
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
+if not WHISPER_AVAILABLE:
     logger.log_activity("Whisper not available - using Vosk only")
 
 class SpeechRecognition:
     """Speech recognition using Vosk for offline processing"""
     
-    def __init__(self):
+    def __init__(self, source=None, command_handler=None):
         self.model = None
         self.recognizer = None
+        self.hotword_spotter = None
         self.microphone = None
-        self.audio_queue = deque()
+        self.source = source                    # Any AudioSource; None opens the microphone
+        self.command_handler = command_handler  # Defaults to command_processor.process_command
         self.is_listening = False
         self.is_recording = False
-        self.hotword_detected = False
-        self.listen_thread = None
-        self.process_thread = None
+        self.keyboard_thread = None
         self.audio_available = False
         
+        # Capture -> VAD -> ring buffer -> Vosk -> hotword/command stage
+        # Two tiers: only the cheap hotword spotter runs until the wake word
+        # fires, then the full recognizer takes over for the command
+        # Commands are whole VAD segments, cut from where the wake word ended
+        self.vad = self._create_vad()
+        self.audio_queue = self._create_audio_buffer()
+        self.stage = HotwordCommandStage(
+            on_hotword=self._on_hotword_detected,
+            on_command=self._on_command_detected,
+            partial_commands=False,
+            command_filter=self._clean_command
+        )
+        self.pipeline = RecognitionPipeline(stage=self.stage, vad=self.vad, buffer=self.audio_queue,
+                                            history=self._create_audio_history())
+        self.wake_end = None          # Capture time the last wake word ended
+        self.last_acknowledgment = ""
+        self._command_timer = None
+        self.core = None              # AsyncCore, when main.py runs with --async-core
+        
+        # Seconds from the end of speech to the hotword / command being handled
+        self.last_hotword_latency = None
+        self.last_command_latency = None
+        
         # Whisper for better accuracy
         self.whisper_model = None
-        if WHISPER_AVAILABLE:
-            try:
-                self.whisper_model = whisper.load_model("base")
-                logger.log_activity("Whisper model loaded successfully")
-            except Exception as e:
-                logger.log_error("Failed to initialize Whisper", e)
+        self.whisper_engine = None
         
-        if VOSK_AVAILABLE and PYAUDIO_AVAILABLE:
-            self._initialize_vosk()
-            self._initialize_microphone()
-        else:
-            logger.log_error("Speech recognition disabled due to missing dependencies")
+        # Models load on a background thread (see load_models_async) so that
+        # importing this module never blocks startup
+        self.models_ready = None      # Resolves once Vosk + microphone are usable
+        self.whisper_ready = None     # Resolves once Whisper has loaded (or failed)
+        self._load_lock = threading.Lock()
+    
+    @property
+    def hotword_detected(self):
+        """True while waiting for a command after the hotword"""
+        return self.stage.hotword_detected
+    
+    @hotword_detected.setter
+    def hotword_detected(self, value):
+        self.stage.hotword_detected = value
+    
+    def load_models_async(self):
+        """Start loading models in the background; returns the readiness future"""
+        with self._load_lock:
+            if self.models_ready is None:
+                self.models_ready = Future()
+                self.whisper_ready = Future()
+                threading.Thread(target=self._load_models, name="ModelLoader", daemon=True).start()
+            return self.models_ready
+    
+    def _load_models(self):
+        """Load Vosk and open the audio source, then load Whisper"""
+        try:
+            if VOSK_AVAILABLE and (PYAUDIO_AVAILABLE or self.source):
+                with startup_profiler.phase("Vosk model"):
+                    self._initialize_vosk()
+                with startup_profiler.phase("Audio source"):
+                    self._initialize_audio_source()
+            else:
+                logger.log_error("Speech recognition disabled due to missing dependencies")
+            self.models_ready.set_result(self)
+        except Exception as e:
+            logger.log_error("Failed to load speech recognition models", e)
+            self.models_ready.set_exception(e)
+        
+        # Whisper only refines commands, so hotword listening doesn't wait for it
+        try:
+            if WHISPER_AVAILABLE:
+                with startup_profiler.phase("Whisper model"):
+                    model = load_whisper_model("base")
+                if model:
+                    self.whisper_engine = WhisperEngine(model)
+                    self.whisper_model = model
+            self.whisper_ready.set_result(self.whisper_model)
+        except Exception as e:
+            logger.log_error("Failed to initialize Whisper", e)
+            self.whisper_ready.set_exception(e)
+    
+    def _create_vad(self):
+        """Create the voice activity gate from configuration"""
+        from config import Config
+        return VoiceActivityDetector(
+            energy_threshold=Config.VAD_ENERGY_THRESHOLD,
+            zcr_threshold=Config.VAD_ZCR_THRESHOLD,
+            hangover_chunks=Config.VAD_HANGOVER_CHUNKS,
+            preroll_chunks=Config.VAD_PREROLL_CHUNKS
+        )
+    
+    def _create_audio_buffer(self):
+        """Create the bounded capture -> recognition ring buffer"""
+        from config import Config
+        return AudioRingBuffer(
+            capacity=Config.AUDIO_BUFFER_CHUNKS,
+            chunk_bytes=4096 * 2,  # 4096 int16 frames per capture read
+            drop_policy=Config.AUDIO_DROP_POLICY
+        )
+    
+    def _create_audio_history(self):
+        """Create the timestamped record of recognized speech"""
+        from config import Config
+        return AudioHistory(seconds=Config.AUDIO_HISTORY_SECONDS, sample_rate=Config.SAMPLE_RATE)
     
     def _initialize_vosk(self):
-        """Initialize Vosk speech recognition model"""
+        """Initialize the full Vosk recognizer and the wake-word spotter"""
+        from config import Config
+        
+        self.model = load_vosk_model()
+        if not self.model:
+            return
+        
         try:
-            from config import Config
-            
-            # Check if model exists, if not, user needs to download it
-            model_path = Config.VOSK_MODEL_PATH
-            if not os.path.exists(model_path):
-                # Try small model as fallback
-                small_model_path = "models/vosk-model-small-en-us-0.15"
-                if os.path.exists(small_model_path):
-                    model_path = small_model_path
-                    logger.log_activity(f"Using small Vosk model: {model_path}")
-                else:
-                    logger.log_error(f"Vosk model not found at {Config.VOSK_MODEL_PATH}")
-                    logger.log_error("Please download the Vosk model manually from: https://alphacephei.com/vosk/models/")
-                    logger.log_error("Or run: python setup_vosk_small.py")
-                    return
-            
-            self.model = vosk.Model(model_path)
-            self.recognizer = vosk.KaldiRecognizer(self.model, Config.SAMPLE_RATE)
+            self.recognizer = VoskEngine(self.model, Config.SAMPLE_RATE, partial_results=True)
             logger.log_activity("Vosk speech recognition initialized")
-            
         except Exception as e:
             logger.log_error("Failed to initialize Vosk", e)
+            return
+        
+        # Runtime grammars need a small model; reuse the main one if it already is
+        try:
+            spotter_model = self.model
+            if find_vosk_model_path(prefer_small=True) != find_vosk_model_path():
+                spotter_model = load_vosk_model(prefer_small=True) or self.model
+            self.hotword_spotter = HotwordSpotter(spotter_model, Config.WAKE_WORDS, Config.SAMPLE_RATE)
+            logger.log_activity(f"Hotword spotter initialized for: {', '.join(Config.WAKE_WORDS)}")
+        except Exception as e:
+            logger.log_error("Failed to initialize hotword spotter - using full recognizer", e)
+        
+        self._enter_hotword_mode()
+    
+    def _enter_hotword_mode(self):
+        """Idle tier: only the wake-word spotter sees audio"""
+        self._update_tray_status("ready")
+        if self.hotword_spotter:
+            self.hotword_spotter.reset()
+            self.pipeline.set_engines([self.hotword_spotter])
+        elif self.recognizer:
+            self.pipeline.set_engines([self.recognizer])
     
-    def _initialize_microphone(self):
-        """Initialize microphone using PyAudio"""
+    def _enter_command_mode(self, since):
+        """Active tier: the full recognizer transcribes the command from `since` onwards"""
+        if self.recognizer and self.hotword_spotter:
+            self.recognizer.reset()
+            self.pipeline.handoff([self.recognizer], since)
+    
+    def _initialize_audio_source(self):
+        """Use the injected audio source, or open the microphone using PyAudio"""
+        if self.source:
+            self.pipeline.source = self.source
+            self.audio_available = True
+            return
+        
         try:
-            self.audio = pyaudio.PyAudio()
-            
-            # Try to use the working microphone device if available
-            device_index = None
-            try:
-                with open("working_microphone.txt", "r") as f:
-                    device_index = int(f.read().strip())
-                    device_info = self.audio.get_device_info_by_index(device_index)
-                    logger.log_activity(f"Using working microphone device {device_index}: {device_info['name']}")
-            except:
-                # Fall back to default device
-                device_info = self.audio.get_default_input_device_info()
-                logger.log_activity(f"Using default microphone: {device_info['name']}")
-            
-            from config import Config
-            self.microphone = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=Config.SAMPLE_RATE,
-                input=True,
-                input_device_index=device_index,
-                frames_per_buffer=Config.CHUNK_SIZE
-            )
-            
+            self.microphone = MicrophoneSource(chunk_frames=4096)
+            self.source = self.microphone
+            self.pipeline.source = self.microphone
             self.audio_available = True
-            logger.log_activity("Microphone initialized successfully")
-            
         except Exception as e:
             logger.log_error("Failed to initialize microphone", e)
             self.audio_available = False
     
     def start_listening(self):
-        """Start listening for hotword and commands"""
+        """Start listening; recognition begins as soon as the models are ready"""
+        self.is_listening = True
+        
+        # The keyboard trigger works immediately, even while models are loading
+        # (only for the live microphone; replayed audio runs unattended)
+        if not self.source:
+            if self.core:
+                self._hook_keyboard()
+            else:
+                self.keyboard_thread = threading.Thread(target=self._keyboard_override, daemon=True)
+                self.keyboard_thread.start()
+            logger.log_activity("Keyboard override: Press 'h' key to manually trigger hotword")
+        
+        self.load_models_async().add_done_callback(self._on_models_ready)
+    
+    def _on_models_ready(self, future):
+        """Start the recognition pipeline once Vosk and the microphone are up"""
+        if not self.is_listening or future.exception():
+            return
+        
         if not self.audio_available:
             logger.log_error("Audio not available - starting in text-only mode")
             self._start_text_mode()
             return
         
-        if not self.model or not self.microphone:
+        if not self.model or not self.source:
             logger.log_error("Speech recognition not properly initialized")
             return
         
-        self.is_listening = True
-        self.listen_thread = threading.Thread(target=self._listen_loop, daemon=True)
-        self.process_thread = threading.Thread(target=self._process_audio, daemon=True)
-        self.keyboard_thread = threading.Thread(target=self._keyboard_override, daemon=True)
-        
-        self.listen_thread.start()
-        self.process_thread.start()
-        self.keyboard_thread.start()
-        
+        if self.core:
+            self.core.attach_pipeline(self.pipeline)
+        else:
+            self.pipeline.start()
+        startup_profiler.mark("Listening for hotword")
         logger.log_activity("Started listening for hotword")
-        logger.log_activity("Keyboard override: Press 'h' key to manually trigger hotword")
+    
+    def trigger_hotword(self):
+        """Act as if the hotword was heard (keyboard trigger)"""
+        if not self.hotword_detected:
+            logger.log_activity("Manual hotword trigger via keyboard!")
+            self.hotword_detected = True
+            self._on_hotword_detected(wake_end=time.monotonic())
     
     def _keyboard_override(self):
         """Keyboard override for testing - press 'h' to trigger hotword"""
@@ -147,20 +248,36 @@ class SpeechRecognition:
             import keyboard
             while self.is_listening:
                 if keyboard.is_pressed('h'):
-                    if not self.hotword_detected:
-                        logger.log_activity("Manual hotword trigger via keyboard!")
-                        self.hotword_detected = True
-                        self._on_hotword_detected()
-                        
-                        # Wait for key release to avoid repeated triggers
-                        while keyboard.is_pressed('h'):
-                            time.sleep(0.1)
+                    self.trigger_hotword()
+                    
+                    # Wait for key release to avoid repeated triggers
+                    while keyboard.is_pressed('h'):
+                        time.sleep(0.1)
                 time.sleep(0.1)
         except ImportError:
             logger.log_activity("Keyboard module not available - no keyboard override")
         except Exception as e:
             logger.log_error("Error in keyboard override", e)
     
+    def use_async_core(self, core):
+        """Let an AsyncCore drive audio capture and the keyboard trigger instead of threads"""
+        self.core = core
+        core.on("hotword_key", self._on_hotword_key)
+    
+    def _hook_keyboard(self):
+        """Keyboard override via a key hook: no polling"""
+        try:
+            import keyboard
+            keyboard.on_press_key('h', lambda event: self.core.post("hotword_key"))
+        except ImportError:
+            logger.log_activity("Keyboard module not available - no keyboard override")
+        except Exception as e:
+            logger.log_error("Error hooking keyboard override", e)
+    
+    async def _on_hotword_key(self):
+        await self.core.run_blocking(self.trigger_hotword)
+        self.core.post("status")
+    
     def _start_text_mode(self):
         """Start in text-only mode for testing without audio"""
         self.is_listening = True
@@ -172,245 +289,124 @@ class SpeechRecognition:
         """Stop listening"""
         self.is_listening = False
         self.is_recording = False
-        
-        if self.listen_thread:
-            self.listen_thread.join(timeout=1.0)
-        if self.process_thread:
-            self.process_thread.join(timeout=1.0)
+        self.pipeline.stop()
         
         logger.log_activity("Stopped listening")
     
-    def _listen_loop(self):
-        """Continuous audio capture loop with noise filtering"""
-        import struct
-        
-        logger.log_activity("Audio capture loop started with noise filtering")
-        audio_chunks_processed = 0
-        noise_threshold = 500  # Lowered threshold for better sensitivity
-        
-        while self.is_listening:
-            try:
-                if self.microphone:
-                    data = self.microphone.read(4096, exception_on_overflow=False)
-                    
-                    # Calculate audio level to filter background noise
-                    try:
-                        audio_data = struct.unpack(f'{len(data)//2}h', data)
-                        rms = (sum(x**2 for x in audio_data) / len(audio_data)) ** 0.5
-                        
-                        # Only process audio above threshold to reduce background noise
-                        if rms > noise_threshold:
-                            self.audio_queue.append(data)
-                            audio_chunks_processed += 1
-                            
-                            # Log occasionally with volume level
-                            if audio_chunks_processed % 50 == 0:  # More frequent logging
-                                logger.log_activity(f"Processed {audio_chunks_processed} audio chunks (vol: {rms:.0f})")
-                        
-                    except struct.error:
-                        # If we can't calculate volume, process anyway
-                        self.audio_queue.append(data)
-                        audio_chunks_processed += 1
-                
-                time.sleep(0.01)  # Small delay to prevent high CPU usage
-            except Exception as e:
-                logger.log_error("Error in listen loop", e)
-                break
-    
     def _recognize_with_whisper(self, audio_data):
         """Use Whisper for better accuracy"""
-        if not self.whisper_model:
-            return ""
-        
-        try:
-            import tempfile
-            import wave
-            
-            # Save audio data to temporary file for Whisper
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                # Create wav file
-                with wave.open(temp_file.name, 'wb') as wav_file:
-                    wav_file.setnchannels(1)
-                    wav_file.setsampwidth(2)  # 16-bit
-                    wav_file.setframerate(16000)
-                    wav_file.writeframes(audio_data)
-                
-                # Recognize with Whisper
-                result = self.whisper_model.transcribe(temp_file.name)
-                
-                # Clean up
-                import os
-                os.unlink(temp_file.name)
-                
-                return result['text'].lower().strip()
-        except Exception as e:
-            logger.log_error(f"Error in Whisper recognition: {e}")
+        if not self.whisper_engine:
             return ""
-    
-    def _process_audio(self):
-        """Process audio data for speech recognition"""
-        logger.log_activity("Speech recognition processing started")
-        processed_results = 0
-        
-        while self.is_listening:
-            try:
-                if self.audio_queue and self.recognizer:
-                    audio_data = self.audio_queue.popleft()
-                    
-                    # Try both AcceptWaveform and PartialResult for better detection
-                    if self.recognizer.AcceptWaveform(audio_data):
-                        result = json.loads(self.recognizer.Result())
-                        text = result.get('text', '').strip().lower()
-                        processed_results += 1
-                        
-                        # Only log non-empty results to reduce noise
-                        if text:
-                            logger.log_activity(f"Speech result #{processed_results}: '{text}'")
-                            
-                            if not self.hotword_detected:
-                                # Listen for hotword
-                                logger.log_activity(f"Checking for hotword in: '{text}'")
-                                if self._contains_hotword(text):
-                                    self.hotword_detected = True
-                                    self._on_hotword_detected()
-                            else:
-                                # Process command - be more flexible with what we accept
-                                if text and len(text.strip()) > 0:
-                                    logger.log_activity(f"Processing command: '{text}'")
-                                    self._on_command_detected(text)
-                                    self.hotword_detected = False
-                    else:
-                        # Check partial results too for faster response
-                        partial_result = json.loads(self.recognizer.PartialResult())
-                        partial_text = partial_result.get('partial', '').strip().lower()
-                        
-                        # Only process meaningful partial results and avoid noise
-                        if partial_text and len(partial_text) >= 3:
-                            # Filter out common noise patterns
-                            noise_patterns = ['uh', 'um', 'ah', 'eh', 'mm', 'hmm']
-                            if not any(pattern in partial_text for pattern in noise_patterns):
-                                
-                                if not self.hotword_detected:
-                                    logger.log_activity(f"Partial result: '{partial_text}'")
-                                    if self._contains_hotword(partial_text):
-                                        self.hotword_detected = True
-                                        self._on_hotword_detected()
-                                else:
-                                    # In command mode, also accept longer partial results as commands
-                                    if len(partial_text) >= 6:  # Longer partial text might be a complete command
-                                        logger.log_activity(f"Command from partial result: '{partial_text}'")
-                                        self._on_command_detected(partial_text)
-                                        self.hotword_detected = False
-                
-                time.sleep(0.01)
-                
-            except Exception as e:
-                logger.log_error("Error processing audio", e)
-                continue
+        return self.whisper_engine.transcribe(audio_data)
     
     def _contains_hotword(self, text):
         """Check if text contains the hotword"""
-        text_lower = text.lower().strip()
-        
-        # Skip very short or empty text
-        if len(text_lower) < 2:
-            return False
-        
-        # Primary hotword is now "hey"
-        primary_keywords = [
-            "hey",
-            "hi",
-            "hello"
-        ]
-        
-        # Check for exact matches or keywords at start of text
-        for keyword in primary_keywords:
-            if text_lower == keyword or text_lower.startswith(keyword + " "):
-                logger.log_activity(f"Hotword detected: '{keyword}' in '{text}'")
-                return True
-        
-        # Secondary alternatives (less sensitive)
-        alternatives = [
-            "jarvis",
-            "activate",
-            "huh"  # What Vosk sometimes recognizes
-        ]
-        
-        for alt in alternatives:
-            if alt in text_lower:
-                logger.log_activity(f"Alternative hotword detected: '{alt}' in '{text}'")
-                return True
-                
-        return False
-    
-    def _on_hotword_detected(self):
-        """Handle hotword detection"""
-        logger.log_activity("Hotword detected")
-        
-        # Update system tray status
+        return contains_hotword(text)
+    
+    def _clean_command(self, text):
+        """Strip wake words and ignore our own acknowledgment picked up by the mic"""
+        command = strip_hotword(text)
+        if command and self._normalize(command) == self._normalize(self.last_acknowledgment):
+            logger.log_activity(f"Ignoring echo of acknowledgment: '{command}'")
+            return ""
+        return command
+    
+    def _normalize(self, text):
+        """Lowercase words without punctuation, for comparing transcripts"""
+        return " ".join("".join(c for c in text.lower() if c.isalnum() or c.isspace()).split())
+    
+    def _update_tray_status(self, status):
+        """Update the system tray icon if JARVIS is running with one"""
         try:
             from main import jarvis_instance
             if hasattr(jarvis_instance, 'system_tray') and jarvis_instance.system_tray:
-                jarvis_instance.system_tray.update_status("processing")
+                jarvis_instance.system_tray.update_status(status)
         except:
             pass
+    
+    def _on_hotword_detected(self, wake_end=None):
+        """Handle hotword detection"""
+        logger.log_activity("Hotword detected")
+        
+        # The wake word ended in the chunk being recognized; the command is
+        # cut from there, so nothing the user says next is lost
+        if wake_end is None:
+            wake_end = self.pipeline.last_stamp or time.monotonic()
+        self.wake_end = wake_end
+        self.last_hotword_latency = time.monotonic() - wake_end
+        latency_tracker.begin("voice")
+        latency_tracker.mark(WAKE_END, stamp=wake_end)
+        latency_tracker.mark(HOTWORD)
+        self._enter_command_mode(wake_end)
+        self._update_tray_status("processing")
         
         # Choose a personalized acknowledgment response
         from conversation_context import jarvis_personality, conversation_context
         response = jarvis_personality.get_acknowledgment(conversation_context)
         logger.log_activity(f"Responding with: {response}")
         
-        # Speak acknowledgment with higher priority (blocking)
-        tts.speak(response, blocking=True)
-        
-        # Brief pause to let user prepare to speak command
-        import time
-        time.sleep(0.5)  # Small pause after acknowledgment
-        
-        # Update status back to listening
-        try:
-            from main import jarvis_instance
-            if hasattr(jarvis_instance, 'system_tray') and jarvis_instance.system_tray:
-                jarvis_instance.system_tray.update_status("ready")
-        except:
-            pass
+        # Barge-in: the user is talking again, so whatever JARVIS was saying stops.
+        # Speak without blocking: recognition keeps consuming audio meanwhile
+        self.last_acknowledgment = response
+        tts.interrupt()
+        tts.speak(response, priority=ACK)
         
         # Set a timeout for command listening
-        threading.Timer(15.0, self._reset_hotword_detection).start()
+        if self._command_timer:
+            self._command_timer.cancel()
+        self._command_timer = threading.Timer(15.0, self._reset_hotword_detection)
+        self._command_timer.daemon = True
+        self._command_timer.start()
+    
+    def _command_audio(self):
+        """PCM of the command segment, from the wake word's end to the VAD boundary"""
+        if self.wake_end is None:
+            return b''
+        return self.pipeline.history.audio(self.pipeline.segment, since=self.wake_end)
     
     def _on_command_detected(self, command):
         """Handle command detection with enhanced recognition"""
         logger.log_activity(f"Command detected (Vosk): {command}")
+        speech_end = self.pipeline.last_stamp if self.wake_end is not None else None
+        if speech_end is not None:
+            latency_tracker.mark(SPEECH_END, stamp=speech_end)
+            latency_tracker.mark(RECOGNIZER_FINAL, detail=command)
         
-        # Try to get better transcription with Whisper if available
+        # Whisper gets exactly the segment Vosk just finalized
         enhanced_command = command
-        if self.whisper_model and len(self.audio_queue) > 0:
+        if self.whisper_model:
             try:
-                # Get recent audio data for Whisper
-                recent_audio = b''.join(list(self.audio_queue)[-10:])  # Last 10 chunks
-                if len(recent_audio) > 1000:  # Ensure meaningful audio
-                    whisper_result = self._recognize_with_whisper(recent_audio)
+                command_audio = self._command_audio()
+                if len(command_audio) > 1000:  # Ensure meaningful audio
+                    whisper_result = strip_hotword(self._recognize_with_whisper(command_audio))
                     if whisper_result and len(whisper_result) > len(command):
                         enhanced_command = whisper_result
                         logger.log_activity(f"Enhanced command (Whisper): {enhanced_command}")
+                        latency_tracker.mark("whisper_final", detail=enhanced_command)
             except Exception as e:
                 logger.log_error("Error with Whisper enhancement", e)
+        self.wake_end = None
+        if self._command_timer:
+            self._command_timer.cancel()
+        self._enter_hotword_mode()
         
-        # Import here to avoid circular imports
-        from command_processor import process_command
+        if speech_end is not None:
+            self.last_command_latency = time.monotonic() - speech_end
+            logger.log_activity(f"Command ready {self.last_command_latency * 1000:.0f} ms after speech ended")
         
-        # Process enhanced command in separate thread
-        thread = threading.Thread(
-            target=process_command, 
-            args=(enhanced_command,), 
-            daemon=True
-        )
-        thread.start()
+        # Runs on the shared command pool, within this interaction's span
+        ticket = command_executor.submit(enhanced_command, runner=self.command_handler)
+        if ticket is None:
+            tts.speak("I'm still working on your earlier commands", priority=ERROR)
+            latency_tracker.finish(status="rejected")
     
     def _reset_hotword_detection(self):
         """Reset hotword detection after timeout"""
         if self.hotword_detected:
             self.hotword_detected = False
+            self.wake_end = None
+            self._enter_hotword_mode()
+            latency_tracker.finish(status="timeout")
             logger.log_activity("Command timeout - returning to hotword listening")
     
     def simulate_command(self, command):
@@ -422,10 +418,10 @@ class SpeechRecognition:
         """Clean up resources"""
         self.stop_listening()
         
-        if self.microphone:
-            self.microphone.close()
-        if hasattr(self, 'audio') and self.audio:
-            self.audio.terminate()
+        if self.source:
+            self.source.close()
+            self.source = None
+            self.microphone = None
         
         logger.log_activity("Speech recognition cleaned up")
 
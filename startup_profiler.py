@@ -0,0 +1,58 @@
+"""
+Startup profiling for JARVIS
+Records how long each startup phase takes, including phases that finish on
+background threads, for main.py --profile-startup
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Collect named startup phases relative to process start"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases = []          # (name, start offset, duration, thread name)
+        self.marks = []           # (name, offset)
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block of startup work"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self.lock:
+                self.phases.append((name, start - self.origin, end - start, threading.current_thread().name))
+
+    def mark(self, name):
+        """Record a point in time (e.g. 'tray usable')"""
+        with self.lock:
+            self.marks.append((name, time.perf_counter() - self.origin))
+
+    def elapsed(self):
+        """Seconds since the profiler was created"""
+        return time.perf_counter() - self.origin
+
+    def report(self):
+        """Return a human-readable table of phases and marks"""
+        with self.lock:
+            phases = sorted(self.phases, key=lambda p: p[1])
+            marks = sorted(self.marks, key=lambda m: m[1])
+
+        lines = ["JARVIS startup profile", "=" * 60]
+        for name, start, duration, thread in phases:
+            where = "" if thread == "MainThread" else f"  [{thread}]"
+            lines.append(f"{start * 1000:8.1f} ms  +{duration * 1000:8.1f} ms  {name}{where}")
+        if marks:
+            lines.append("-" * 60)
+            for name, offset in marks:
+                lines.append(f"{offset * 1000:8.1f} ms  {name}")
+        return "\n".join(lines)
+
+# Global profiler, created as early as main.py can import it
+startup_profiler = StartupProfiler()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Advanced NLP test for JARVIS
+Golden outputs for analyze_command, so speeding up the pattern engine can't
+silently change how commands are classified
+"""
+
+from advanced_nlp import advanced_nlp
+from benchmark_advanced_nlp import legacy_analyze, COMMANDS, LONG_UTTERANCES
+
+# Fields each analysis type fills in
+TYPE_FIELDS = {
+    'simple': [],
+    'multi_step': ['sub_commands'],
+    'conditional': ['condition', 'action'],
+    'scheduled': ['timing', 'action'],
+    'question': ['query'],
+}
+
+GOLDEN = [
+    ('open chrome',
+     {'type': 'simple'}),
+    ('open chrome and then open notepad',
+     {'type': 'multi_step', 'sub_commands': ['open chrome', 'open notepad']}),
+    ('open chrome, then open notepad',
+     {'type': 'multi_step', 'sub_commands': ['open chrome', 'open notepad']}),
+    ('first open youtube then search for music',
+     {'type': 'multi_step', 'sub_commands': ['open youtube', 'search for music']}),
+    ('after lunch do lock the computer',
+     {'type': 'multi_step', 'sub_commands': ['lunch', 'lock the computer']}),
+    ('if the battery is low then lock the computer',
+     {'type': 'conditional', 'condition': 'the battery is low', 'action': 'lock the computer'}),
+    ('when cpu usage is high do close chrome',
+     {'type': 'conditional', 'condition': 'cpu usage is high', 'action': 'close chrome'}),
+    ('in 5 minutes remind me to stretch',
+     {'type': 'scheduled', 'timing': ('5', 'minutes', 'remind me to stretch'), 'action': 'remind me to stretch'}),
+    ('in 2 hours open chrome and notepad',
+     {'type': 'scheduled', 'timing': ('2', 'hours', 'open chrome and notepad'), 'action': 'open chrome and notepad'}),
+    ('at 7:30 am play the news',
+     {'type': 'scheduled', 'timing': ('7', '30', 'am', 'play the news'), 'action': 'play the news'}),
+    ('tomorrow send the report',
+     {'type': 'scheduled', 'timing': ('send the report',), 'action': 'send the report'}),
+    ('next week check the backups',
+     {'type': 'scheduled', 'timing': ('week', 'check the backups'), 'action': 'check the backups'}),
+    ('what is the capital of france',
+     {'type': 'question', 'query': 'the capital of france'}),
+    ('what is the time and open chrome',
+     {'type': 'question', 'query': 'the time and open chrome'}),
+    ('where is my downloads folder',
+     {'type': 'question', 'query': 'my downloads folder'}),
+    ('when is my meeting',
+     {'type': 'question', 'query': 'is'}),
+    ('why is the sky blue',
+     {'type': 'question', 'query': 'is the sky blue'}),
+    ('please open firefox quickly',
+     {'type': 'simple', 'urgency': 'high', 'politeness': True}),
+    ('could you tell me the date',
+     {'type': 'simple', 'politeness': True}),
+    ('i know that',
+     {'type': 'simple', 'urgency': 'high'}),
+    ('this is great',
+     {'type': 'simple'}),
+]
+
+
+def summarize(analysis):
+    """The classification-relevant part of an analysis"""
+    summary = {'type': analysis['type']}
+    for field in TYPE_FIELDS[analysis['type']]:
+        summary[field] = analysis[field]
+    if analysis['urgency'] != 'normal':
+        summary['urgency'] = analysis['urgency']
+    if analysis['politeness']:
+        summary['politeness'] = True
+    return summary
+
+
+def test_golden_outputs():
+    for command, expected in GOLDEN:
+        assert summarize(advanced_nlp.analyze_command(command)) == expected, command
+        # Case is normalized before matching
+        assert summarize(advanced_nlp.analyze_command(command.upper()))['type'] == expected['type'], command
+    print(f"✅ {len(GOLDEN)} golden analyses unchanged")
+
+
+def test_matches_sequential_engine():
+    for command in [command for command, _ in GOLDEN] + COMMANDS + LONG_UTTERANCES:
+        assert summarize(advanced_nlp.analyze_command(command)) == summarize(legacy_analyze(command)), command
+    print("✅ Combined pattern agrees with the sequential per-category search")
+
+
+def main():
+    print("JARVIS Advanced NLP Test")
+    print("=" * 40)
+    test_golden_outputs()
+    test_matches_sequential_engine()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+App index test for JARVIS
+Builds an index from temporary .desktop, shortcut and PATH directories,
+checks fuzzy resolution of misheard names, mtime-based incremental refresh of
+the disk cache, and sub-millisecond lookups over thousands of entries
+"""
+
+import os
+import random
+import shutil
+import stat
+import tempfile
+import time
+
+from config import Config
+from app_index import AppIndex, FuzzyMatcher, parse_desktop_file, normalize_name
+
+
+def write_desktop(directory, filename, name, exec_line, extra=""):
+    path = os.path.join(directory, filename)
+    with open(path, "w") as f:
+        f.write(f"[Desktop Entry]\nType=Application\nName={name}\nExec={exec_line}\n{extra}"
+                f"[Desktop Action new-window]\nName=New Window\nExec={exec_line} --new-window\n")
+    return path
+
+
+def write_executable(directory, filename):
+    path = os.path.join(directory, filename)
+    with open(path, "w") as f:
+        f.write("#!/bin/sh\n")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+    return path
+
+
+def make_tree(root):
+    applications = os.path.join(root, "applications")
+    os.makedirs(os.path.join(applications, "dev"))
+    write_desktop(applications, "code.desktop", "Visual Studio Code", "/usr/share/code/code %F")
+    write_desktop(applications, "hidden.desktop", "Hidden Helper", "helper", "NoDisplay=true\n")
+    write_desktop(os.path.join(applications, "dev"), "gimp.desktop", "GNU Image Manipulation Program", "gimp %U")
+    with open(os.path.join(applications, "Spotify.lnk"), "w") as f:
+        f.write("shortcut")
+    with open(os.path.join(applications, "Uninstall Spotify.lnk"), "w") as f:
+        f.write("shortcut")
+
+    bin_dir = os.path.join(root, "bin")
+    os.makedirs(bin_dir)
+    write_executable(bin_dir, "vlc")
+    with open(os.path.join(bin_dir, "README"), "w") as f:
+        f.write("not executable")
+    return [(applications, True), (bin_dir, False)]
+
+
+def test_desktop_parsing():
+    root = tempfile.mkdtemp()
+    try:
+        path = write_desktop(root, "a.desktop", "Visual Studio Code", "/usr/share/code/code --unity-launch %F")
+        assert parse_desktop_file(path) == ("Visual Studio Code", "/usr/share/code/code --unity-launch")
+        hidden = write_desktop(root, "b.desktop", "Helper", "helper", "NoDisplay=true\n")
+        assert parse_desktop_file(hidden) is None
+        assert normalize_name("Notepad++ (x64)") == "notepad++ x64"
+    finally:
+        shutil.rmtree(root)
+    print("✅ .desktop entries parse to a name and a command line")
+
+
+def test_index_sources_and_fuzzy_resolution():
+    root = tempfile.mkdtemp()
+    try:
+        index = AppIndex(sources=make_tree(root), cache_path=os.path.join(root, "index.json"))
+        index.refresh()
+
+        code = index.resolve("open visual studio code")
+        assert (code.name, code.kind, code.target) == ("visual studio code", "desktop", "/usr/share/code/code")
+        assert index.resolve("launch gnu image manipulation program").target == "gimp"
+        assert index.resolve("open spotify").kind == "shortcut"
+        assert index.resolve("run vlc").kind == "path"
+        assert index.resolve("open hidden helper") is None
+        assert "uninstall spotify" not in index.entries and "readme" not in index.entries
+
+        # Config.APPS stay available, and misrecognitions still resolve
+        assert index.resolve("open chrome please").kind == "config"
+        assert index.resolve("open crome").name == "chrome"
+        assert index.resolve("open notpad").name == "notepad"
+        assert index.resolve("start visual studio").name == "visual studio code"
+        assert index.resolve("open the weather forecast") is None
+    finally:
+        shutil.rmtree(root)
+    print("✅ Shortcuts, .desktop files and PATH resolve, including misheard names")
+
+
+def test_dangerous_commands_never_resolve():
+    root = tempfile.mkdtemp()
+    saved = Config.APP_PATH_ALLOWLIST
+    try:
+        sources = make_tree(root)
+        bin_dir = sources[1][0]
+        for name in ("shutdown", "reboot", "halt", "poweroff", "logoff.exe", "mkfs.ext4"):
+            write_executable(bin_dir, name)
+        write_desktop(sources[0][0], "logout.desktop", "Log Out", "gnome-session-quit --logout")
+        index = AppIndex(sources=sources, cache_path=None)
+        index.refresh()
+        for command in ("launch shut down", "start the reboot", "run halt", "launch shutdown",
+                        "run poweroff", "open logoff", "open log out", "run mkfs ext4"):
+            assert index.resolve(command) is None, command
+        assert not {"shutdown", "reboot", "halt", "poweroff", "log out"} & set(index.entries)
+
+        # PATH binaries need their exact name unless allowlisted
+        assert index.resolve("run vlc").kind == "path"
+        assert index.resolve("run vlcc") is None
+        Config.APP_PATH_ALLOWLIST = ["vlc"]
+        index.refresh()
+        assert index.resolve("run vlcc").name == "vlc"
+
+        # The machine's real PATH and application directories
+        real = AppIndex(cache_path=None)
+        assert real.resolve("launch shut down") is None
+        assert real.resolve("start the reboot") is None
+        assert real.resolve("run halt") is None
+    finally:
+        Config.APP_PATH_ALLOWLIST = saved
+        shutil.rmtree(root)
+    print("✅ Shutdown, reboot, logoff and other denied commands never resolve; PATH needs exact names")
+
+
+def test_incremental_refresh():
+    root = tempfile.mkdtemp()
+    try:
+        sources = make_tree(root)
+        cache_path = os.path.join(root, "index.json")
+        assert AppIndex(sources=sources, cache_path=cache_path).refresh() == (3, 0)
+
+        # A new process loads the cache and rescans nothing
+        index = AppIndex(sources=sources, cache_path=cache_path)
+        assert index.refresh() == (0, 3)
+        assert index.resolve("open vlc") is not None
+
+        # Only the directory that changed is rescanned
+        dev = os.path.join(sources[0][0], "dev")
+        write_desktop(dev, "blender.desktop", "Blender", "blender")
+        os.utime(dev, (time.time() + 5, time.time() + 5))
+        assert index.refresh() == (1, 2)
+        assert index.resolve("open blender").target == "blender"
+
+        shutil.rmtree(dev)
+        scanned, _ = AppIndex(sources=sources, cache_path=cache_path).refresh()
+        assert scanned == 1
+    finally:
+        shutil.rmtree(root)
+    print("✅ Disk cache is reused; only directories whose mtime changed are rescanned")
+
+
+def test_first_command_waits_for_startup_refresh():
+    root = tempfile.mkdtemp()
+    wait = Config.APP_INDEX_WAIT_SECONDS
+    try:
+        index = AppIndex(sources=make_tree(root), cache_path=None)
+        refresh, refreshes = index.refresh, []
+
+        def slow_refresh(seconds=0.2):
+            refreshes.append(seconds)
+            time.sleep(seconds)
+            return refresh()
+
+        # No cache yet: the first command joins the startup scan instead of starting its own
+        index.refresh = slow_refresh
+        index.refresh_async()
+        assert index.resolve("open vlc").kind == "path"
+        assert len(refreshes) == 1
+
+        # A scan slower than the bound: Config.APPS still answer, nothing scans twice
+        index = AppIndex(sources=make_tree(os.path.join(root, "again")), cache_path=None)
+        refresh, refreshes = index.refresh, []
+        index.refresh = lambda: slow_refresh(0.5)
+        Config.APP_INDEX_WAIT_SECONDS = 0.05
+        index.refresh_async()
+        start = time.perf_counter()
+        assert index.resolve("open chrome").kind == "config"
+        assert index.resolve("open vlc") is None
+        assert time.perf_counter() - start < 0.3 and len(refreshes) == 1
+        index._refresh_thread.join()
+        assert index.resolve("open vlc").kind == "path"
+    finally:
+        Config.APP_INDEX_WAIT_SECONDS = wait
+        shutil.rmtree(root)
+    print("✅ The first command waits for the startup scan (bounded) instead of scanning again")
+
+
+def test_lookup_speed():
+    random.seed(7)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = ["".join(random.choice(letters) for _ in range(random.randint(3, 9))) for _ in range(1500)]
+    names = sorted({" ".join(random.sample(words, random.randint(1, 3))) for _ in range(5000)})
+    matcher = FuzzyMatcher(names)
+
+    queries = []
+    for name in random.sample(names, 200):
+        position = random.randrange(len(name))
+        queries.append((name, name[:position] + name[position + 1:]))      # Drop a letter
+
+    start = time.perf_counter()
+    found = sum(names[matcher.best(query)[0]] == name for name, query in queries)
+    per_query = (time.perf_counter() - start) / len(queries)
+
+    assert found >= 180, found
+    assert per_query < 0.001, per_query
+    print(f"✅ {len(names)} names: {per_query * 1e6:.0f} µs per fuzzy lookup, {found}/200 correct")
+
+
+def main():
+    print("JARVIS App Index Test")
+    print("=" * 40)
+    test_desktop_parsing()
+    test_index_sources_and_fuzzy_resolution()
+    test_dangerous_commands_never_resolve()
+    test_incremental_refresh()
+    test_first_command_waits_for_startup_refresh()
+    test_lookup_speed()
+
+
+if __name__ == "__main__":
+    main()
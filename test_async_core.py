@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Async core test for JARVIS
+Checks that events posted from other threads reach coroutine handlers, that
+blocking work runs off the loop, that an idle loop barely wakes up, and that
+audio fed through the thread-safe callback is recognized in order
+"""
+
+import math
+import struct
+import threading
+import time
+
+from async_core import AsyncCore
+from audio_source import GeneratorSource
+from recognition_pipeline import RecognitionPipeline, HotwordCommandStage
+from speech_engines import BufferedEngine
+
+
+class ThreadRecordingEngine(BufferedEngine):
+    """Returns canned words per segment and remembers which thread recognized them"""
+
+    name = "canned"
+
+    def __init__(self, words):
+        super().__init__()
+        self.words = list(words)
+        self.threads = set()
+
+    def transcribe(self, audio_data):
+        self.threads.add(threading.current_thread().name)
+        return self.words.pop(0) if self.words else ""
+
+
+def chunk(loud, frames=4096, sample_rate=16000):
+    return b"".join(struct.pack('<h', int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate)) if loud else 0)
+                    for i in range(frames))
+
+
+def test_events_and_blocking_work():
+    core = AsyncCore(blocking_workers=2)
+    seen = []
+    done = threading.Event()
+
+    async def on_greeting(name):
+        seen.append((name, threading.current_thread().name))
+        # Blocking work goes to the executor; the loop stays free
+        seen.append(await core.run_blocking(lambda: threading.current_thread().name))
+        done.set()
+
+    core.on("greeting", on_greeting)
+    core.start()
+    try:
+        threading.Thread(target=core.post, args=("greeting", "jarvis")).start()
+        assert done.wait(2)
+        assert seen[0] == ("jarvis", "jarvis-async-core")
+        assert seen[1].startswith("jarvis-blocking")
+    finally:
+        core.stop()
+    print("✅ Events from other threads reach coroutine handlers; blocking calls run on the executor")
+
+
+def test_idle_loop_barely_wakes():
+    core = AsyncCore()
+    ticks = []
+
+    async def tick():
+        ticks.append(time.monotonic())
+
+    core.every(0.1, tick)
+    core.start()
+    try:
+        time.sleep(0.55)
+        stats = core.stats()
+    finally:
+        core.stop()
+    assert 5 <= len(ticks) <= 7, ticks
+    # About one wakeup per tick, nothing else
+    assert stats["wakeups"] <= 2 * len(ticks) + 3, stats
+    print(f"✅ Periodic task every 100 ms: {stats['wakeups']} loop wakeups in {stats['seconds']:.2f}s")
+
+
+def test_audio_callback_drives_pipeline():
+    core = AsyncCore()
+    events = []
+    finished = threading.Event()
+
+    def on_command(text):
+        events.append(text)
+        finished.set()
+
+    stage = HotwordCommandStage(on_hotword=lambda: events.append("hotword"), on_command=on_command)
+    engine = ThreadRecordingEngine(["hey jarvis", "open chrome"])
+    loud, quiet = chunk(True), chunk(False)
+    pattern = [0] * 6 + [1] * 3 + [0] * 6 + [1] * 4 + [0] * 6
+    source = GeneratorSource(loud if is_loud else quiet for is_loud in pattern)
+    pipeline = RecognitionPipeline(source, [engine], stage)
+
+    core.start()
+    try:
+        core.attach_pipeline(pipeline)
+        assert finished.wait(5)
+    finally:
+        pipeline.stop()
+        core.stop()
+    assert events == ["hotword", "open chrome"], events
+    assert [name.split("_")[0] for name in engine.threads] == ["jarvis-recognition"], engine.threads
+    assert pipeline.segment == 2
+    print("✅ Audio from the callback is VAD-gated on the loop and recognized on one worker")
+
+
+def main():
+    print("JARVIS Async Core Test")
+    print("=" * 40)
+    test_events_and_blocking_work()
+    test_idle_loop_barely_wakes()
+    test_audio_callback_drives_pipeline()
+
+
+if __name__ == "__main__":
+    main()
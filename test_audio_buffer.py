@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Ring buffer test for JARVIS
+Checks FIFO order, drop policies, the blocking hand-off between threads and
+the timestamped speech history
+"""
+
+import threading
+import time
+
+from audio_buffer import AudioRingBuffer, AudioHistory, DROP_OLDEST, DROP_NEWEST, BLOCK
+
+
+def test_fifo_order():
+    buffer = AudioRingBuffer(capacity=4, chunk_bytes=4)
+    for i in range(3):
+        buffer.put(bytes([i]) * 4)
+    assert [buffer.get(timeout=0)[0] for _ in range(3)] == [0, 1, 2]
+    assert buffer.get(timeout=0) is None
+    print("✅ FIFO order preserved")
+
+
+def test_drop_oldest():
+    buffer = AudioRingBuffer(capacity=2, chunk_bytes=2, drop_policy=DROP_OLDEST)
+    for i in range(4):
+        assert buffer.put(bytes([i, i]))
+    assert buffer.dropped_oldest == 2
+    assert buffer.recent(2) == [b'\x02\x02', b'\x03\x03']
+    print("✅ Drop-oldest keeps the newest audio")
+
+
+def test_drop_newest():
+    buffer = AudioRingBuffer(capacity=2, chunk_bytes=2, drop_policy=DROP_NEWEST)
+    results = [buffer.put(bytes([i, i])) for i in range(4)]
+    assert results == [True, True, False, False]
+    assert buffer.dropped_newest == 2
+    assert buffer.get(timeout=0) == b'\x00\x00'
+    print("✅ Drop-newest keeps the oldest audio")
+
+
+def test_block_waits_for_reader():
+    buffer = AudioRingBuffer(capacity=1, chunk_bytes=2, drop_policy=BLOCK)
+    buffer.put(b'aa')
+
+    def reader():
+        time.sleep(0.05)
+        buffer.get()
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    assert buffer.put(b'bb', timeout=2.0)
+    thread.join()
+    assert buffer.blocked_writes == 1
+    assert buffer.get(timeout=0) == b'bb'
+
+    # With nobody reading, a timed put gives up and counts the drop
+    assert buffer.put(b'cc')
+    assert not buffer.put(b'dd', timeout=0.01)
+    assert buffer.dropped_newest == 1
+    print("✅ Block policy waits for space")
+
+
+def test_get_wakes_on_put_and_close():
+    buffer = AudioRingBuffer(capacity=2, chunk_bytes=2)
+    received = []
+
+    thread = threading.Thread(target=lambda: received.append(buffer.get(timeout=2.0)))
+    thread.start()
+    buffer.put(b'hi')
+    thread.join()
+    assert received == [b'hi']
+
+    thread = threading.Thread(target=lambda: received.append(buffer.get(timeout=2.0)))
+    thread.start()
+    start = time.perf_counter()
+    buffer.close()
+    thread.join()
+    assert received[-1] is None and time.perf_counter() - start < 1.0
+    print("✅ Reader wakes on put() and close()")
+
+
+def test_oversized_chunk_is_split():
+    buffer = AudioRingBuffer(capacity=4, chunk_bytes=2)
+    buffer.put(b'abcde')
+    assert [buffer.get(timeout=0) for _ in range(3)] == [b'ab', b'cd', b'e']
+    print("✅ Oversized chunks are split across slots")
+
+
+def test_stamps_follow_chunks():
+    buffer = AudioRingBuffer(capacity=2, chunk_bytes=2)
+    buffer.put(b'aa', stamp=1.0)
+    buffer.put(b'bb', stamp=2.0)
+    buffer.put(b'cc', stamp=3.0)     # Overwrites 'aa'
+    assert buffer.get(timeout=0) == b'bb' and buffer.last_stamp == 2.0
+    assert buffer.get(timeout=0) == b'cc' and buffer.last_stamp == 3.0
+    print("✅ Capture timestamps travel with their chunks")
+
+
+def test_segment_end_survives_overflow():
+    buffer = AudioRingBuffer(capacity=2, chunk_bytes=2, drop_policy=DROP_OLDEST)
+    buffer.put(b'aa')
+    buffer.put(b'')                  # End of the first segment
+    buffer.put(b'bb')
+    buffer.put(b'cc')                # Overwrites 'aa' but not the marker
+    buffer.put(b'dd')                # Overwrites 'bb'
+    buffer.put(b'')
+    assert len(buffer) == 2
+    assert [buffer.get(timeout=0) for _ in range(4)] == [b'', b'cc', b'dd', b'']
+    assert buffer.get(timeout=0) is None and not buffer
+
+    # A full buffer refusing new audio still takes the marker
+    full = AudioRingBuffer(capacity=1, chunk_bytes=2, drop_policy=DROP_NEWEST)
+    full.put(b'aa')
+    assert not full.put(b'bb') and full.put(b'')
+    assert [full.get(timeout=0) for _ in range(2)] == [b'aa', b'']
+
+    # An empty buffer hands the marker over straight away
+    buffer.put(b'')
+    assert buffer.get(timeout=0) == b''
+    print("✅ End-of-segment markers are never overwritten")
+
+
+def test_history_cuts_segments():
+    history = AudioHistory(seconds=1.0, sample_rate=4, chunk_frames=1)   # Room for 4 chunks
+    for stamp, segment, data in [(0.5, 1, b'a'), (1.0, 1, b'b'), (1.5, 1, b'c'),
+                                 (3.0, 2, b'd'), (3.5, 2, b'e')]:
+        history.append(data, stamp, segment)
+    assert len(history) == 4
+    assert history.audio(1) == b'bc'                  # 'a' has rolled off
+    assert history.audio(1, since=1.5) == b'c'
+    assert history.audio(2, since=1.0) == b'de'
+    print("✅ History returns one segment from a point in time")
+
+
+def main():
+    print("JARVIS Ring Buffer Test")
+    print("=" * 40)
+    test_fifo_order()
+    test_drop_oldest()
+    test_drop_newest()
+    test_block_waits_for_reader()
+    test_get_wakes_on_put_and_close()
+    test_oversized_chunk_is_split()
+    test_stamps_follow_chunks()
+    test_segment_end_survives_overflow()
+    test_history_cuts_segments()
+
+
+if __name__ == "__main__":
+    main()
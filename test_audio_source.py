@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Audio source test for JARVIS
+Checks the file and generator sources, real-time pacing, and that
+SpeechRecognition runs hotword -> command end to end on a replayed source
+"""
+
+import math
+import os
+import struct
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import Future
+
+from audio_source import WavFileSource, RawPCMSource, GeneratorSource
+from test_recognition_pipeline import SpotterEngine, RecordingEngine
+
+CHUNK_FRAMES = 1024
+
+
+def tone_chunk(loud, frames=CHUNK_FRAMES, sample_rate=16000):
+    """One chunk of silence or a loud 440 Hz tone"""
+    return b''.join(struct.pack('<h', int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate)) if loud else 0)
+                    for i in range(frames))
+
+
+def test_wav_and_raw_sources_match():
+    pcm = tone_chunk(True) * 3 + tone_chunk(False)
+    fd, wav_path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    fd, raw_path = tempfile.mkstemp(suffix=".pcm")
+    os.close(fd)
+    try:
+        with wave.open(wav_path, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(16000)
+            wav_file.writeframes(pcm)
+        with open(raw_path, 'wb') as f:
+            f.write(pcm)
+
+        for source in (WavFileSource(wav_path, CHUNK_FRAMES), RawPCMSource(raw_path, chunk_frames=CHUNK_FRAMES)):
+            with source:
+                chunks = iter(source.read, None)
+                assert b''.join(chunks) == pcm
+                assert source.sample_rate == 16000
+    finally:
+        os.unlink(wav_path)
+        os.unlink(raw_path)
+    print("✅ WAV and raw PCM sources replay the same audio")
+
+
+def test_realtime_pacing():
+    chunks = [tone_chunk(False)] * 8          # 0.512 s of audio
+
+    start = time.perf_counter()
+    with GeneratorSource(chunks) as source:
+        while source.read() is not None:
+            pass
+    fast = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with GeneratorSource(chunks, realtime=True) as source:
+        while source.read() is not None:
+            pass
+    paced = time.perf_counter() - start
+
+    assert fast < 0.1, fast
+    assert 0.45 < paced < 1.0, paced
+    print(f"✅ Real-time pacing ({paced:.2f}s) vs as fast as possible ({fast * 1000:.1f}ms)")
+
+
+def test_speech_recognition_on_replayed_source():
+    from speech_recognition_safe import SpeechRecognition
+
+    # "jarvis open chrome" in one breath, as a microphone would deliver it
+    pattern = [0] * 4 + [1] * 6 + [0] * 6
+    source = GeneratorSource((tone_chunk(loud) for loud in pattern), realtime=True)
+    commands = []
+    handled = threading.Event()
+
+    def handler(command):
+        commands.append(command)
+        handled.set()
+
+    recognition = SpeechRecognition(source=source, command_handler=handler)
+    recognition.model = object()              # Fakes stand in for the Vosk models
+    recognition.recognizer = RecordingEngine(["jarvis open chrome"])
+    recognition.hotword_spotter = SpotterEngine(fire_on=3)
+    recognition._enter_hotword_mode()
+    recognition._initialize_audio_source()
+    recognition.is_listening = True
+
+    ready = Future()
+    ready.set_result(recognition)
+    recognition._on_models_ready(ready)
+    try:
+        assert handled.wait(5), "command never dispatched"
+    finally:
+        recognition.cleanup()
+
+    assert commands == ["open chrome"], commands
+    assert 0 <= recognition.last_hotword_latency < 0.5, recognition.last_hotword_latency
+    assert 0 <= recognition.last_command_latency < 0.5, recognition.last_command_latency
+    print(f"✅ Hotword -> command end to end on a replayed source "
+          f"(command ready {recognition.last_command_latency * 1000:.0f} ms after speech)")
+
+
+def main():
+    print("JARVIS Audio Source Test")
+    print("=" * 40)
+    test_wav_and_raw_sources_match()
+    test_realtime_pacing()
+    test_speech_recognition_on_replayed_source()
+
+
+if __name__ == "__main__":
+    main()
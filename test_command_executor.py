@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Command executor test for JARVIS
+Checks that commands share a bounded pool, that camera/screenshot/email
+commands never overlap, that a new voice command supersedes older waiting
+ones, and that a full queue refuses work and shows up in the stats
+"""
+
+import threading
+import time
+
+from command_executor import CommandExecutor, CANCELLED, DONE
+
+
+class Recorder:
+    """Runner that records overlap per lane; commands containing 'block' wait for release"""
+
+    def __init__(self, seconds=0.02):
+        self.seconds = seconds
+        self.release = threading.Event()
+        self.ran = []
+        self.active = 0
+        self.peak = 0
+        self.capture_active = 0
+        self.capture_peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, command):
+        capture = any(word in command for word in ("photo", "screenshot", "email"))
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            if capture:
+                self.capture_active += 1
+                self.capture_peak = max(self.capture_peak, self.capture_active)
+        if "block" in command:
+            self.release.wait(5)
+        time.sleep(self.seconds)
+        with self.lock:
+            self.active -= 1
+            if capture:
+                self.capture_active -= 1
+            self.ran.append(command)
+        return command.upper()
+
+
+def executor_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith("jarvis-command-")]
+
+
+def test_bounded_pool():
+    recorder = Recorder()
+    executor = CommandExecutor(max_workers=3, max_queue=50, runner=recorder)
+    before = len(executor_threads())
+    tickets = [executor.submit(f"open chrome {i}", source="schedule") for i in range(20)]
+    assert all(ticket.wait(5) for ticket in tickets)
+    assert recorder.peak <= 3 and len(executor_threads()) - before <= 3
+    assert tickets[0].state == DONE and tickets[0].result == "OPEN CHROME 0"
+    stats = executor.stats()
+    assert stats["completed"] == 20 and stats["workers"] <= 3 and stats["queued"] == 0
+    executor.shutdown()
+    print(f"✅ 20 commands on {stats['workers']} workers, peak concurrency {recorder.peak}")
+
+
+def test_capture_lane_is_exclusive():
+    recorder = Recorder(seconds=0.05)
+    executor = CommandExecutor(max_workers=4, runner=recorder)
+    commands = ["take a photo", "take a screenshot", "send an email", "take a photo"]
+    tickets = [executor.submit(command, source="schedule") for command in commands]
+    assert tickets[0].intent == "camera" and tickets[1].lane == tickets[2].lane == "capture"
+
+    # Other commands don't queue behind the busy camera
+    time.sleep(0.01)
+    quick = executor.submit("what time is it", source="schedule")
+    assert quick.wait(1) and quick.started - quick.submitted < 0.04
+
+    assert all(ticket.wait(5) for ticket in tickets)
+    assert recorder.capture_peak == 1
+    executor.shutdown()
+    print("✅ Camera, screenshot and email commands run one at a time; others run alongside")
+
+
+def test_new_voice_command_supersedes_waiting_ones():
+    recorder = Recorder(seconds=0)
+    executor = CommandExecutor(max_workers=1, runner=recorder)
+    busy = executor.submit("block on this", source="schedule")
+    time.sleep(0.02)
+    first = executor.submit("open notepad")
+    timer = executor.submit("open paint", source="schedule")
+    second = executor.submit("open calculator")
+    assert first.done() and first.state == CANCELLED and first.reason == "superseded"
+
+    recorder.release.set()
+    assert all(ticket.wait(5) for ticket in (busy, timer, second))
+    assert recorder.ran == ["block on this", "open paint", "open calculator"]
+    assert executor.stats()["superseded"] == 1
+    executor.shutdown()
+    print("✅ A newer voice command replaces one still waiting; timed commands keep their place")
+
+
+def test_backpressure_and_expiry():
+    recorder = Recorder(seconds=0)
+    executor = CommandExecutor(max_workers=1, max_queue=2, stale_after=0.05, runner=recorder)
+    busy = executor.submit("block here", source="schedule")
+    time.sleep(0.02)
+    queued = [executor.submit(f"open paint {i}", source="condition") for i in range(2)]
+    assert executor.submit("open chrome", source="condition") is None      # Queue full
+    stats = executor.stats()
+    assert stats["rejected"] == 1 and stats["queued"] == 2 and stats["max_queued"] == 2
+
+    recorder.release.set()
+    assert all(ticket.wait(5) for ticket in [busy] + queued)
+
+    # A voice command that waited longer than stale_after is dropped, not run late
+    recorder.release.clear()
+    busy = executor.submit("block again", source="schedule")
+    time.sleep(0.02)
+    late = executor.submit("open notepad")
+    time.sleep(0.1)
+    recorder.release.set()
+    assert late.wait(5) and late.state == CANCELLED and late.reason == "expired"
+    assert "open notepad" not in recorder.ran and executor.stats()["expired"] == 1
+
+    # Shutdown cancels what is still waiting and lets the running command finish
+    recorder.release.clear()
+    executor.submit("block once more", source="schedule")
+    time.sleep(0.02)
+    pending = executor.submit("open paint", source="schedule")
+    executor.shutdown(wait=False)
+    assert pending.state == CANCELLED and pending.reason == "shutdown"
+    assert executor.submit("open paint", source="schedule") is None
+    recorder.release.set()
+    print(f"✅ Full queue refuses work; stale voice commands expire (stats: {executor.stats()})")
+
+
+def main():
+    print("JARVIS Command Executor Test")
+    print("=" * 40)
+    test_bounded_pool()
+    test_capture_lane_is_exclusive()
+    test_new_voice_command_supersedes_waiting_ones()
+    test_backpressure_and_expiry()
+
+
+if __name__ == "__main__":
+    main()
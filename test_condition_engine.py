@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Condition engine test for JARVIS
+Compiles spoken conditions, feeds synthetic ActivityMonitor samples and
+checks edge-triggered firing, cooldowns and that rules are only re-evaluated
+when a metric they read changes
+"""
+
+from datetime import datetime
+
+from condition_engine import ConditionEngine, compile_condition, prepare_sample, parse_number, condition_engine
+from activity_monitor import ActivityMonitor
+from advanced_nlp import advanced_nlp
+from tts import tts
+
+
+def sample(cpu=10.0, memory=40.0, battery=80.0, plugged=False, processes=(), started=(), closed=(),
+           clock=(12, 0)):
+    return {
+        "time": datetime(2026, 3, 2, *clock),
+        "cpu": cpu, "memory": memory, "battery": battery, "plugged": plugged,
+        "processes": set(processes), "started": set(started), "closed": set(closed),
+    }
+
+
+def holds(text, **values):
+    return compile_condition(text).test(prepare_sample(sample(**values)))
+
+
+def test_compile_conditions():
+    assert parse_number("twenty five") == 25 and parse_number("20") == 20 and parse_number("soon") is None
+    assert holds("battery is below 20", battery=15) and not holds("battery is below 20", battery=25)
+    assert holds("the battery drops below twenty percent", battery=19)
+    assert not holds("battery is below 20", battery=None)                 # Desktop: no battery
+    assert holds("cpu usage goes above 90", cpu=95) and not holds("cpu usage goes above 90", cpu=90)
+    assert holds("memory is high", memory=85) and holds("battery is low", battery=10)
+    assert holds("laptop is plugged in", plugged=True) and holds("unplugged", plugged=False)
+    assert holds("chrome opens", started=["chrome.exe"]) and not holds("chrome opens", processes=["chrome.exe"])
+    assert holds("i close notepad", closed=["Notepad.exe"])
+    assert holds("chrome is running", processes=["chrome"]) and holds("chrome is not running")
+    assert holds("it is 5 pm", clock=(17, 0)) and not holds("it is 5 pm", clock=(16, 59))
+    assert holds("battery is below 20 and cpu is above 50", battery=10, cpu=60)
+    assert not holds("battery is below 20 and cpu is above 50", battery=10, cpu=40)
+    assert holds("battery is low or memory is high", battery=90, memory=90)
+    assert compile_condition("battery is below 20 and chrome is running").metrics == {"battery", "processes"}
+    try:
+        compile_condition("the weather is nice")
+        assert False, "uncheckable condition accepted"
+    except ValueError:
+        pass
+    print("✅ Conditions compile to predicates over monitor samples")
+
+
+def test_edge_triggered_with_cooldown():
+    ran = []
+    engine = ConditionEngine(runner=ran.append, cooldown=100)
+    rule = engine.add("battery is below 20", "lock the computer")
+
+    readings = [(0, 50), (30, 18), (60, 15), (90, 30), (100, 10), (200, 50), (230, 12)]
+    fired_at = [now for now, battery in readings if engine.on_sample(sample(battery=battery), now=now)]
+    # 30: falls below 20. 60: still below. 100: below again, but within the cooldown. 230: fires again
+    assert fired_at == [30, 230], fired_at
+    assert rule.fired == 2
+    print("✅ Rules fire when the condition becomes true, at most once per cooldown")
+
+
+def test_unless_and_process_events():
+    engine = ConditionEngine(runner=lambda action: None, cooldown=0)
+    unless = engine.add("laptop is plugged in", "dim the screen", negate=True)
+    opened = engine.add("chrome opens", "open notepad")
+
+    assert engine.on_sample(sample(plugged=True), now=0) == []
+    assert engine.on_sample(sample(plugged=False, started=["chrome.exe"]), now=1) == [unless, opened]
+    assert engine.on_sample(sample(plugged=False, processes=["chrome.exe"]), now=2) == []
+    assert engine.on_sample(sample(plugged=False, started=["chrome.exe"]), now=3) == [opened]
+    print("✅ 'unless' rules and process start events")
+
+
+def test_condition_already_true():
+    engine = ConditionEngine(runner=lambda action: None, cooldown=0)
+    low = engine.add("battery is below 20", "lock the computer")
+    restored_low = engine.add("battery is below 20", "lock the computer", restored=True)
+    restored_evening = engine.add("it is 5 pm", "turn on the lights", restored=True)
+
+    # At 8 pm on 15%: the new rule fires at once, the restored ones only take a baseline
+    assert engine.on_sample(sample(battery=15, clock=(20, 0)), now=0) == [low]
+    assert restored_low.active and restored_evening.active
+    assert engine.on_sample(sample(battery=15, clock=(20, 1)), now=30) == []
+
+    # Midnight resets the time rule; the next 5 pm and the next drop below 20 fire all of them
+    engine.on_sample(sample(battery=50, clock=(0, 0)), now=60)
+    assert engine.on_sample(sample(battery=50, clock=(17, 0)), now=90) == [restored_evening]
+    assert engine.on_sample(sample(battery=18, clock=(17, 1)), now=120) == [low, restored_low]
+    print("✅ A new rule fires if its condition already holds; a restored rule waits for the next rising edge")
+
+
+def test_only_affected_rules_are_evaluated():
+    engine = ConditionEngine(runner=lambda action: None)
+    for threshold in range(300):
+        engine.add(f"battery is below {threshold % 100}", "lock the computer")
+    for threshold in range(200):
+        engine.add(f"cpu is above {threshold % 100}", "take a screenshot")
+
+    engine.on_sample(sample(cpu=10, battery=80), now=0)
+    assert engine.evaluations == 500                    # Every new rule once
+
+    engine.on_sample(sample(cpu=10, battery=80), now=30)
+    assert engine.evaluations == 500                    # Nothing changed
+
+    engine.on_sample(sample(cpu=60, battery=80), now=60)
+    assert engine.evaluations == 700                    # Only the CPU rules
+    print("✅ 500 standing rules: a tick only re-evaluates rules whose metrics changed")
+
+
+def test_monitor_publishes_samples():
+    monitor = ActivityMonitor()
+    engine = ConditionEngine(runner=lambda action: None)
+    engine.add("cpu is above 50", "take a screenshot")
+    monitor.add_listener(engine.on_sample)
+    monitor._publish(sample(cpu=75))
+    assert engine.rules[1].fired == 1 and monitor.last_sample["cpu"] == 75
+
+    # The first process scan is a baseline, so nothing already running counts as started
+    started, _ = monitor._check_running_processes()
+    assert started == set()
+    print("✅ ActivityMonitor hands every sample to its listeners")
+
+
+def test_conditional_command_registers_rule():
+    analysis = advanced_nlp.analyze_command("if battery is below 20 then lock the computer")
+    assert analysis['type'] == 'conditional'
+    with tts.collect() as spoken:
+        response = advanced_nlp._handle_conditional(analysis, processor=None)
+    rule = condition_engine.list_rules()[-1]
+    assert spoken == [response] and rule.action == "lock the computer"
+    assert "every 30 seconds" in response
+    condition_engine.remove(rule.id)
+
+    analysis = advanced_nlp.analyze_command("if the weather is nice then open chrome")
+    with tts.collect():
+        response = advanced_nlp._handle_conditional(analysis, processor=None)
+    assert "don't know how to check" in response
+    print("✅ 'if ... then ...' becomes a standing rule instead of running immediately")
+
+
+def main():
+    print("JARVIS Condition Engine Test")
+    print("=" * 40)
+    test_compile_conditions()
+    test_edge_triggered_with_cooldown()
+    test_unless_and_process_events()
+    test_condition_already_true()
+    test_only_affected_rules_are_evaluated()
+    test_monitor_publishes_samples()
+    test_conditional_command_registers_rule()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Intent router test for JARVIS
+Checks that commands route to the right handler intent, including the cases
+the old substring predicate chain got wrong
+"""
+
+from intent_router import IntentRouter, default_rules, intent_router, tokenize
+
+
+def test_routes():
+    expected = {
+        "open chrome": "app",
+        "hey open notepad": "app",
+        "launch file explorer": "app",
+        "open google": "web",
+        "search youtube for cats": "web",
+        "take a screenshot": "screenshot",
+        "take a picture": "camera",
+        "open camera and click a picture of me": "camera",
+        "send photo by email": "email",
+        "what time is it": "time",
+        "what day is it": "conversational",
+        "how are you": "conversational",
+        "volume up": "system",
+        "what is the cpu usage": "info",
+        "list scheduled commands": "schedule",
+        "cancel the reminder to open chrome": "schedule",
+    }
+    for command, intent in expected.items():
+        assert intent_router.best(command) == intent, (command, intent_router.classify(command))
+    print(f"✅ {len(expected)} commands routed to the expected intent")
+
+
+def test_whole_words_only():
+    # "hi" inside "this", "ram" inside "program", "time" inside "sometimes"
+    assert intent_router.best("this is great") is None
+    assert intent_router.classify("sometimes a program") == []
+    assert tokenize("What's up, JARVIS?") == ["what's", "up", "jarvis"]
+    print("✅ Keywords match whole words, not substrings")
+
+
+def test_ranked_scores():
+    ranked = intent_router.classify("open chrome")
+    assert [intent for intent, _ in ranked] == ["app", "web"]
+    assert ranked[0][1] > ranked[1][1]
+    # Each phrase counts once, however often it is said
+    assert intent_router.classify("time time time") == [("time", 2.0)]
+    print("✅ Every matching intent is returned, best first")
+
+
+def test_custom_apps():
+    router = IntentRouter(default_rules(apps={"visual studio code": "code.exe"}))
+    assert router.best("open visual studio code") == "app"
+    assert router.best("open chrome") == "web"            # Not a known app here
+    assert router.best("visual studio code") is None      # Needs a launch verb
+    print("✅ Application names come from the configured app list")
+
+
+def main():
+    print("JARVIS Intent Router Test")
+    print("=" * 40)
+    test_routes()
+    test_whole_words_only()
+    test_ranked_scores()
+    test_custom_apps()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Latency tracker test for JARVIS
+Builds interaction spans across threads the way speech recognition, the
+command processor and TTS do, and checks the exported records and summary
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+from latency_tracker import (
+    LatencyTracker, percentile,
+    WAKE_END, HOTWORD, SPEECH_END, RECOGNIZER_FINAL, PROCESS_COMMAND, DISPATCH, TTS_AUDIO, ACTION_COMPLETE
+)
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile(values, 0.99) == 99
+    assert percentile([7], 0.99) == 7
+    assert percentile([], 0.5) is None
+    print("✅ Nearest-rank percentiles")
+
+
+def voice_interaction(tracker, base, handler_ms):
+    """Simulate one voice interaction with fixed stamps (seconds)"""
+    tracker.begin("voice")
+    tracker.mark(WAKE_END, stamp=base)
+    tracker.mark(HOTWORD, stamp=base + 0.1)
+    tracker.mark(TTS_AUDIO, stamp=base + 0.2)            # Acknowledgment, before dispatch
+    tracker.mark(SPEECH_END, stamp=base + 2.0)
+    tracker.mark(RECOGNIZER_FINAL, stamp=base + 2.3)
+
+    def command_thread():
+        # process_command runs on its own thread, bound to this interaction
+        tracker.mark(PROCESS_COMMAND, stamp=base + 2.31)
+        tracker.mark(DISPATCH, stamp=base + 2.32, detail="app")
+
+        def speak():
+            tracker.mark(TTS_AUDIO, stamp=base + 2.5)
+        tts_thread = threading.Thread(target=tracker.bind(speak))
+        tts_thread.start()
+        tts_thread.join()
+
+        tracker.mark(ACTION_COMPLETE, stamp=base + 2.32 + handler_ms / 1000)
+        return tracker.finish(command="open chrome")
+
+    result = {}
+    thread = threading.Thread(target=tracker.bind(lambda: result.update(command_thread())))
+    thread.start()
+    thread.join()
+    return result
+
+
+def test_spans_and_summary():
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    try:
+        tracker = LatencyTracker(log_path=path)
+        for i in range(20):
+            voice_interaction(tracker, base=100.0 * i, handler_ms=10 * (i + 1))
+        with open(path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+    finally:
+        os.unlink(path)
+
+    assert len(records) == 20
+    first = records[0]
+    assert first["command"] == "open chrome" and first["kind"] == "voice"
+    stages = first["stages_ms"]
+    assert round(stages["hotword"]) == 100
+    assert round(stages["acknowledge"]) == 100      # Hotword -> acknowledgment audio
+    assert round(stages["recognize"]) == 300
+    assert round(stages["first_audio"]) == 180      # The reply, not the acknowledgment
+    assert round(stages["speech_to_action"]) == 330
+    assert {"event": DISPATCH, "ms": 320.0, "detail": "app"} in first["marks"]
+
+    summary = tracker.summary()
+    assert summary["action"]["count"] == 20
+    assert round(summary["action"]["p50"]) == 100
+    assert round(summary["action"]["p95"]) == 190
+    assert round(summary["action"]["p99"]) == 200
+    assert "action" in tracker.report()
+    print("✅ Spans exported and summarized across threads")
+
+
+def test_typed_command_starts_its_own_span():
+    tracker = LatencyTracker()
+    assert tracker.mark(DISPATCH) is None           # Nothing active: ignored
+    tracker.mark(PROCESS_COMMAND)
+    tracker.mark(DISPATCH, detail="time")
+    tracker.mark(ACTION_COMPLETE)
+    record = tracker.finish(command="what time is it")
+    assert record["kind"] == "text"
+    assert set(record["stages_ms"]) == {"route", "action"}
+    assert tracker.current is None and tracker.active() is None
+    print("✅ Typed commands get their own span")
+
+
+def test_global_tracker_writes_nothing_until_started():
+    from latency_tracker import latency_tracker
+    from config import Config
+    existed = os.path.exists(Config.LATENCY_LOG_FILE)
+    assert latency_tracker.log_path is None
+    latency_tracker.mark(PROCESS_COMMAND)
+    latency_tracker.finish(command="what time is it")
+    latency_tracker.reset()
+    assert os.path.exists(Config.LATENCY_LOG_FILE) == existed
+    print("✅ Importing the tracker leaves the latency log alone")
+
+
+def main():
+    print("JARVIS Latency Tracker Test")
+    print("=" * 40)
+    test_percentile()
+    test_spans_and_summary()
+    test_typed_command_starts_its_own_span()
+    test_global_tracker_writes_nothing_until_started()
+
+
+if __name__ == "__main__":
+    main()
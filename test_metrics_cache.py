@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Metrics cache test for JARVIS
+Checks that informational reads are served from a fresh-enough sample, that
+concurrent requests share one refresh, and that no thread samples while idle
+"""
+
+import threading
+import time
+
+from metrics_cache import MetricsCache, SystemMetricsReader
+
+
+class SlowReader:
+    """Counts readings; each takes `seconds`"""
+
+    def __init__(self, seconds=0.0):
+        self.seconds = seconds
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.seconds)
+        return {"cpu": float(self.calls), "memory": 50.0, "battery": None, "plugged": None}
+
+
+def test_reads_within_ttl_share_a_sample():
+    reader = SlowReader()
+    cache = MetricsCache(ttl=0.2, reader=reader)
+    first = cache.get()
+    assert cache.get() is first and reader.calls == 1
+    time.sleep(0.25)
+    assert cache.get()["cpu"] == 2.0 and reader.calls == 2       # Stale: refreshed
+    assert cache.get(max_age=0)["cpu"] == 3.0                     # Caller demands a new one
+    print("✅ Reads within the TTL reuse the cached sample")
+
+
+def test_concurrent_requests_share_one_refresh():
+    reader = SlowReader(seconds=0.2)
+    cache = MetricsCache(ttl=5, reader=reader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get())) for _ in range(10)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    assert reader.calls == 1, reader.calls
+    assert len(results) == 10 and all(result is results[0] for result in results)
+    assert elapsed < 0.4, elapsed
+    print(f"✅ 10 concurrent requests on a cold cache: one sample, {elapsed * 1000:.0f} ms")
+
+
+def test_no_sampling_while_idle():
+    reader = SlowReader()
+    threads = threading.active_count()
+    cache = MetricsCache(ttl=0.5, reader=reader)
+    cache.get()                                 # e.g. the activity monitor's tick
+    time.sleep(0.3)
+    start = time.perf_counter()
+    for _ in range(100):
+        cache.get()
+    elapsed = time.perf_counter() - start
+    assert reader.calls == 1, reader.calls      # Nothing sampled in between
+    assert threading.active_count() == threads
+    assert elapsed < 0.01, elapsed
+    print(f"✅ No sampler thread; 100 reads from the last tick's sample in {elapsed * 1000:.2f} ms")
+
+
+def test_system_reader():
+    reader = SystemMetricsReader()
+    first = reader()
+    time.sleep(0.1)
+    second = reader()
+    for sample in (first, second):
+        assert 0.0 <= sample["cpu"] <= 100.0 and 0.0 < sample["memory"] <= 100.0
+        assert "battery" in sample and "plugged" in sample
+
+    # Any thread may take the next reading; usage is measured since the last one
+    results = []
+    thread = threading.Thread(target=lambda: results.append(reader.cpu_percent()))
+    time.sleep(0.1)
+    thread.start()
+    thread.join()
+    assert 0.0 <= results[0] <= 100.0
+    print("✅ System reader returns CPU, memory and battery readings")
+
+
+def main():
+    print("JARVIS Metrics Cache Test")
+    print("=" * 40)
+    test_reads_within_ttl_share_a_sample()
+    test_concurrent_requests_share_one_refresh()
+    test_no_sampling_while_idle()
+    test_system_reader()
+
+
+if __name__ == "__main__":
+    main()
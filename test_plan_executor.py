@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Plan executor test for JARVIS
+Checks how multi-step commands are split and ordered, that independent steps
+run concurrently, and that the steps are answered with a single reply
+"""
+
+import threading
+import time
+
+from plan_executor import PlanExecutor, build_plan, split_steps, summarize
+from advanced_nlp import advanced_nlp
+from tts import tts
+
+STEP_SECONDS = 0.2
+
+
+class FakeProcessor:
+    """Stands in for CommandProcessor: speaks a line and takes STEP_SECONDS"""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def process_command(self, command, nested=False):
+        start = time.monotonic()
+        time.sleep(STEP_SECONDS)
+        if command == self.fail_on:
+            raise RuntimeError("step failed")
+        tts.speak(f"Finished {command}")
+        with self.lock:
+            self.calls.append((command, start, time.monotonic(), nested))
+
+
+def test_split_steps():
+    assert split_steps("open chrome and open notepad and tell me cpu") == [
+        ("open chrome", False), ("open notepad", False), ("tell me cpu", False)]
+    assert split_steps("take a screenshot, then email it") == [
+        ("take a screenshot", False), ("email it", True)]
+    assert split_steps("first open youtube then search for music and open notepad") == [
+        ("open youtube", False), ("search for music", True), ("open notepad", False)]
+    assert split_steps("after lunch do lock the computer") == [("lunch", False), ("lock the computer", True)]
+    print("✅ Utterances split into ordered and unordered steps")
+
+
+def test_dependencies():
+    plan = build_plan("open chrome and open notepad and tell me cpu")
+    assert [step.depends_on for step in plan] == [[], [], []]
+
+    plan = build_plan("take a screenshot and email it")
+    assert [step.intent for step in plan] == ["screenshot", "email"]
+    assert plan[1].depends_on == [0]
+
+    plan = build_plan("take a photo and open chrome and send photo by email")
+    assert [step.depends_on for step in plan] == [[], [], [0]]
+
+    plan = build_plan("open chrome and notepad and then take a screenshot")
+    assert plan[2].depends_on == [0, 1]
+    print("✅ Dependencies found from 'then', references and photo/screenshot consumers")
+
+
+def test_independent_steps_run_concurrently():
+    processor = FakeProcessor()
+    plan = build_plan("open chrome and open notepad and tell me cpu")
+    start = time.monotonic()
+    PlanExecutor(max_workers=4).execute(plan, processor.process_command)
+    elapsed = time.monotonic() - start
+
+    assert len(processor.calls) == 3
+    assert elapsed < 2 * STEP_SECONDS, elapsed
+    assert [step.spoken for step in plan] == [["Finished open chrome"], ["Finished open notepad"],
+                                              ["Finished tell me cpu"]]
+    print(f"✅ Three independent steps in {elapsed:.2f}s (sequentially {3 * STEP_SECONDS:.1f}s)")
+
+
+def test_dependent_steps_run_in_order():
+    processor = FakeProcessor()
+    plan = build_plan("open chrome and take a screenshot and email it")
+    PlanExecutor(max_workers=4).execute(plan, processor.process_command)
+
+    times = {command: (start, end) for command, start, end, _ in processor.calls}
+    assert times["email it"][0] >= times["take a screenshot"][1]
+    assert times["open chrome"][0] < times["take a screenshot"][1]       # Overlaps the screenshot
+    print("✅ 'email it' waits for the screenshot; 'open chrome' does not")
+
+
+def test_capture_steps_never_overlap():
+    plan = build_plan("take a photo and take a screenshot and open chrome and take a screenshot")
+    assert [step.intent for step in plan] == ["camera", "screenshot", "app", "screenshot"]
+    assert [step.depends_on for step in plan] == [[], [], [], []]
+    assert [step.after for step in plan] == [[], [0], [], [1]]        # The capture lane allows one at a time
+
+    processor = FakeProcessor(fail_on="take a photo")
+    start = time.monotonic()
+    PlanExecutor(max_workers=4).execute(plan, processor.process_command)
+    elapsed = time.monotonic() - start
+    captures = sorted((begin, end) for command, begin, end, _ in processor.calls if command == "take a screenshot")
+    assert len(captures) == 2 and captures[1][0] >= captures[0][1]
+    assert plan[0].error is not None and captures[0][0] >= plan[0].finished    # Waited for the failed photo...
+    assert not plan[1].skipped                                                  # ...but still ran
+    assert elapsed < 4 * STEP_SECONDS, elapsed                                   # "open chrome" ran alongside
+    print("✅ Camera and screenshot steps share the capture lane and never overlap")
+
+
+def test_pool_is_bounded():
+    processor = FakeProcessor()
+    plan = build_plan("open chrome and open notepad and open paint and open calculator")
+    start = time.monotonic()
+    PlanExecutor(max_workers=2).execute(plan, processor.process_command)
+    elapsed = time.monotonic() - start
+    assert 2 * STEP_SECONDS <= elapsed < 3 * STEP_SECONDS, elapsed
+    print("✅ At most max_workers steps run at once")
+
+
+def test_failure_skips_dependents():
+    processor = FakeProcessor(fail_on="take a screenshot")
+    plan = build_plan("take a screenshot and email it and open chrome")
+    PlanExecutor(max_workers=4).execute(plan, processor.process_command)
+    assert isinstance(plan[0].error, RuntimeError) and plan[1].skipped and not plan[2].skipped
+    assert plan[1].cause is plan[0] and plan[1].error is None
+    assert summarize(plan) == ("I couldn't take a screenshot. I skipped email it because I couldn't take a screenshot. "
+                               "Finished open chrome.")
+    print("✅ A failed step skips the steps that depend on it, saying why")
+
+
+def test_single_spoken_summary():
+    processor = FakeProcessor()
+    analysis = advanced_nlp.analyze_command("open chrome and open notepad and tell me cpu")
+    assert analysis['type'] == 'multi_step'
+    with tts.collect() as spoken:
+        response = advanced_nlp._handle_multi_step(analysis, processor)
+    assert spoken == [response]
+    assert response == "Finished open chrome. Finished open notepad. Finished tell me cpu."
+    assert all(nested for *_, nested in processor.calls)
+    print("✅ One reply for the whole plan")
+
+
+def main():
+    print("JARVIS Plan Executor Test")
+    print("=" * 40)
+    test_split_steps()
+    test_dependencies()
+    test_independent_steps_run_concurrently()
+    test_dependent_steps_run_in_order()
+    test_capture_steps_never_overlap()
+    test_pool_is_bounded()
+    test_failure_skips_dependents()
+    test_single_spoken_summary()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Recognition pipeline test for JARVIS
+Replays a synthetic WAV file headless through VAD and a fake engine
+"""
+
+import math
+import os
+import struct
+import tempfile
+import wave
+
+from audio_source import WavFileSource
+from audio_buffer import AudioRingBuffer, DROP_NEWEST
+from recognition_pipeline import RecognitionPipeline, HotwordCommandStage
+from speech_engines import BufferedEngine, RecognizerEngine, RecognitionResult
+
+
+class CountingEngine(BufferedEngine):
+    """Engine that returns canned words, one per speech segment"""
+
+    name = "counting"
+
+    def __init__(self, words):
+        super().__init__()
+        self.words = list(words)
+
+    def transcribe(self, audio_data):
+        return self.words.pop(0) if self.words else ""
+
+
+class SpotterEngine(RecognizerEngine):
+    """Reports the wake word as a partial result on its Nth chunk"""
+
+    name = "spotter"
+
+    def __init__(self, fire_on):
+        self.fire_on = fire_on
+        self.fed = 0
+
+    def feed(self, chunk):
+        self.fed += 1
+        if self.fed == self.fire_on:
+            return RecognitionResult("jarvis", self.name, is_final=False)
+        return None
+
+    def finalize(self):
+        return None
+
+
+class RecordingEngine(CountingEngine):
+    """CountingEngine that remembers how much audio each segment had"""
+
+    name = "recording"
+
+    def __init__(self, words):
+        super().__init__(words)
+        self.heard = []
+
+    def transcribe(self, audio_data):
+        self.heard.append(len(audio_data))
+        return super().transcribe(audio_data)
+
+
+def write_test_wav(path, pattern, sample_rate=16000, chunk_frames=4096):
+    """Write chunks of silence (0) or a loud 440 Hz tone (1)"""
+    frames = bytearray()
+    for loud in pattern:
+        for i in range(chunk_frames):
+            value = int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate)) if loud else 0
+            frames += struct.pack('<h', value)
+    with wave.open(path, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(bytes(frames))
+
+
+def run_pipeline(pattern, engines, stage):
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    try:
+        write_test_wav(path, pattern)
+        source = WavFileSource(path)
+        pipeline = RecognitionPipeline(source, engines, stage)
+        stats = pipeline.run()
+        source.close()
+        return stats
+    finally:
+        os.unlink(path)
+
+
+def test_hotword_then_command():
+    events = []
+    stage = HotwordCommandStage(
+        on_hotword=lambda: events.append("hotword"),
+        on_command=lambda text: events.append(text)
+    )
+    pattern = [0] * 6 + [1] * 3 + [0] * 6 + [1] * 4 + [0] * 6
+    stats = run_pipeline(pattern, [CountingEngine(["hey jarvis", "open chrome"])], stage)
+
+    assert stats["segments"] == 2, stats
+    assert events == ["hotword", "open chrome"], events
+    print("✅ Hotword and command recognized from WAV replay")
+
+
+def test_engines_side_by_side():
+    events = []
+    stage = HotwordCommandStage(on_hotword=lambda: events.append("hotword"))
+    first = CountingEngine([""])            # Produces nothing
+    second = CountingEngine(["jarvis"])     # Falls through to this one
+    second.name = "second"
+    run_pipeline([0] * 4 + [1] * 3 + [0] * 6, [first, second], stage)
+
+    assert events == ["hotword"], events
+    print("✅ Engines run side by side on the same segment")
+
+
+def test_handoff_final_carries_the_command():
+    events = []
+    stage = HotwordCommandStage(
+        on_hotword=lambda: events.append("hotword"),
+        on_command=lambda text: events.append(text),
+        partial_commands=False
+    )
+    # "jarvis open chrome" in one breath: the spotter finalizes the segment, then the recognizer
+    stage.on_result(RecognitionResult("jarvis", "spotter", segment=1))
+    stage.on_result(RecognitionResult("jarvis open chrome", "vosk", segment=1))
+    # A second engine finalizing the same command is still ignored
+    stage.on_result(RecognitionResult("jarvis open chrome", "whisper", segment=1))
+    assert events == ["hotword", "open chrome"], events
+    print("✅ The recognizer's final after a handoff is dispatched as the command")
+
+
+def test_segments_stay_apart_when_the_buffer_overflows():
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    try:
+        write_test_wav(path, [0] * 2 + [1] * 3 + [0] * 6 + [1] * 3 + [0] * 6)
+        source = WavFileSource(path)
+        engine = RecordingEngine(["hey jarvis", "open chrome"])
+        # Recognition falls behind: capture everything into a full 4-chunk buffer first
+        pipeline = RecognitionPipeline(source, [engine], buffer=AudioRingBuffer(4, 4096 * 2, DROP_NEWEST))
+        while True:
+            data = source.read()
+            if data is None:
+                break
+            pipeline.capture(data)
+        pipeline.end_of_stream()
+        pipeline._drain()
+        source.close()
+    finally:
+        os.unlink(path)
+
+    # Only the first 4 chunks fit, but the segment still ends where VAD closed it
+    assert pipeline.buffer.overflows == 12, pipeline.buffer.get_stats()
+    assert engine.heard == [4 * 4096 * 2], engine.heard
+    assert pipeline.get_stats()["results"] == 1
+    print("✅ End-of-segment markers survive ring buffer overflow")
+
+
+def test_command_cut_from_wake_word():
+    events = []
+    command_engine = RecordingEngine(["jarvis open chrome"])
+    stage = HotwordCommandStage(on_command=lambda text: events.append(text), partial_commands=False)
+
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    try:
+        # Wake word and command in one breath: 2 pre-roll + 6 loud + 3 hangover chunks
+        write_test_wav(path, [0] * 4 + [1] * 6 + [0] * 6)
+        source = WavFileSource(path)
+        pipeline = RecognitionPipeline(source, [SpotterEngine(fire_on=3)], stage)
+        wake = {}
+
+        def on_hotword():
+            wake["end"] = pipeline.last_stamp
+            pipeline.handoff([command_engine], wake["end"])
+            events.append("hotword")
+
+        stage.on_hotword = on_hotword
+        pipeline.run()
+        source.close()
+    finally:
+        os.unlink(path)
+
+    chunk_bytes = 4096 * 2
+    assert events == ["hotword", "open chrome"], events
+    # The wake-word chunk is replayed, nothing before it, nothing lost after it
+    assert command_engine.heard == [9 * chunk_bytes], command_engine.heard
+    assert len(pipeline.history.audio(1, since=wake["end"])) == 9 * chunk_bytes
+    assert len(pipeline.history.audio(1)) == 11 * chunk_bytes
+    print("✅ Command segment cut from the end of the wake word")
+
+
+def main():
+    print("JARVIS Recognition Pipeline Test")
+    print("=" * 40)
+    test_hotword_then_command()
+    test_engines_side_by_side()
+    test_handoff_final_carries_the_command()
+    test_segments_stay_apart_when_the_buffer_overflows()
+    test_command_cut_from_wake_word()
+
+
+if __name__ == "__main__":
+    main()
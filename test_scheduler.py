@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Command scheduler test for JARVIS
+Checks due-time ordering, cancellation, persistence across restarts, that
+thousands of pending jobs share one thread, and how timed commands are parsed
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from scheduler import CommandScheduler, parse_job_reference
+from advanced_nlp import advanced_nlp
+
+
+def temp_path():
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    os.unlink(path)
+    return path
+
+
+def test_runs_jobs_in_due_order():
+    ran = []
+    done = threading.Event()
+
+    def runner(command):
+        ran.append(command)
+        if len(ran) == 3:
+            done.set()
+
+    scheduler = CommandScheduler()
+    now = time.time()
+    scheduler.add("third", now + 0.3)
+    scheduler.add("first", now + 0.1)
+    cancelled = scheduler.add("never", now + 0.15)
+    scheduler.add("second", now + 0.2)
+    assert scheduler.cancel(cancelled.id) is cancelled
+    assert scheduler.cancel(cancelled.id) is None
+
+    scheduler.start(runner)
+    try:
+        assert done.wait(2), ran
+        time.sleep(0.1)
+    finally:
+        scheduler.stop()
+    assert ran == ["first", "second", "third"], ran
+    assert scheduler.list_jobs() == []
+    print("✅ Jobs run in due order; cancelled jobs never run")
+
+
+def test_survives_restart():
+    path = temp_path()
+    try:
+        scheduler = CommandScheduler(path=path)
+        scheduler.start(lambda command: None)
+        in_an_hour = scheduler.add("open chrome", time.time() + 3600)
+        scheduler.add("lock the computer", time.time() + 7200)
+        scheduler.stop()
+
+        restarted = CommandScheduler(path=path)
+        assert [job.command for job in restarted.list_jobs()] == ["open chrome", "lock the computer"]
+        assert restarted.list_jobs()[0].due == in_an_hour.due
+        assert restarted.add("take a screenshot", time.time() + 60).id == 3     # Ids keep counting
+
+        # Jobs missed by more than the grace period are dropped on load
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"next_id": 3, "jobs": [
+                {"id": 1, "due": time.time() - 10000, "command": "stale"},
+                {"id": 2, "due": time.time() - 60, "command": "missed by a minute"},
+            ]}, f)
+        reloaded = CommandScheduler(path=path, grace=3600)
+        assert [job.command for job in reloaded.list_jobs()] == ["missed by a minute"]
+    finally:
+        for leftover in (path, path + ".tmp"):
+            if os.path.exists(leftover):
+                os.unlink(leftover)
+    print("✅ Pending jobs are saved and reloaded across restarts")
+
+
+def test_thousands_of_jobs_one_thread():
+    scheduler = CommandScheduler()
+    scheduler.start(lambda command: None)
+    logging.disable(logging.INFO)       # Time the scheduler, not 9000 log lines
+    try:
+        start = time.perf_counter()
+        jobs = [scheduler.add(f"job {i}", time.time() + 600 + i) for i in range(5000)]
+        for job in jobs[:4000]:
+            scheduler.cancel(job.id)
+        elapsed = time.perf_counter() - start
+        assert len(scheduler.list_jobs()) == 1000
+        assert len(scheduler._heap) < 5000                  # Cancelled entries compacted
+        assert [thread.name for thread in threading.enumerate()].count("jarvis-scheduler") == 1
+    finally:
+        logging.disable(logging.NOTSET)
+        scheduler.stop()
+    assert elapsed < 1.0, elapsed
+    print(f"✅ 5000 adds + 4000 cancels in {elapsed * 1000:.0f} ms on one scheduler thread")
+
+
+def test_job_references():
+    assert parse_job_reference("cancel all scheduled commands") == "all"
+    assert parse_job_reference("cancel scheduled command number three") == 3
+    assert parse_job_reference("cancel scheduled command 12") == 12
+    assert parse_job_reference("cancel the reminder to open chrome") == "open chrome"
+    assert parse_job_reference("cancel job 5") == 5
+    assert parse_job_reference("cancel #7") == 7
+    assert parse_job_reference("cancel the 5 pm reminder") == "5 pm"          # A time, not job 5
+    assert parse_job_reference("cancel the reminder to call mom at 5 pm") == "call mom at 5 pm"
+    print("✅ Cancel commands resolve to all, an explicit job number, or the job's words")
+
+
+def test_cancel_by_time():
+    scheduler = CommandScheduler()
+    tomorrow = datetime.now().replace(hour=17, minute=0, second=0, microsecond=0).timestamp() + 86400
+    for i in range(5):
+        scheduler.add(f"open app {i}", tomorrow - 3600 * (i + 1))
+    five_pm = scheduler.add("call mom", tomorrow)
+    assert five_pm.id != 5 and 5 in scheduler.jobs
+
+    reference = parse_job_reference("cancel the 5 pm reminder")
+    assert scheduler.find(reference) == [five_pm]
+    assert scheduler.find("17:00") == [five_pm] and scheduler.find("call mom") == [five_pm]
+    print("✅ 'cancel the 5 pm reminder' finds the job due at 5 pm, not job 5")
+
+
+def test_due_times():
+    now = datetime(2026, 3, 2, 17, 0)
+
+    def due(command):
+        analysis = advanced_nlp.analyze_command(command)
+        assert analysis['type'] == 'scheduled', command
+        return advanced_nlp._due_time(analysis, now)
+
+    assert due("in 5 minutes open chrome") == datetime(2026, 3, 2, 17, 5)
+    assert due("in 2 hours lock the computer") == datetime(2026, 3, 2, 19, 0)
+    assert due("at 7:30 pm play the news") == datetime(2026, 3, 2, 19, 30)
+    assert due("at 9 am check email") == datetime(2026, 3, 3, 9, 0)           # Already past today
+    assert due("tomorrow send the report") == datetime(2026, 3, 3, 17, 0)
+    assert due("next week check the backups") == datetime(2026, 3, 9, 17, 0)
+    print("✅ Timed commands resolve to the right due time")
+
+
+def main():
+    print("JARVIS Command Scheduler Test")
+    print("=" * 40)
+    test_runs_jobs_in_due_order()
+    test_survives_restart()
+    test_thousands_of_jobs_one_thread()
+    test_job_references()
+    test_cancel_by_time()
+    test_due_times()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Batch transcription test for JARVIS
+Transcribes synthetic WAV files from a manifest through the process pool
+with a fake engine, and checks the JSONL records
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import transcribe
+from speech_engines import BufferedEngine
+from test_recognition_pipeline import write_test_wav
+
+
+class FixedEngine(BufferedEngine):
+    """Engine that hears the same command in every segment"""
+
+    name = "fixed"
+
+    def transcribe_words(self, audio_data):
+        return "open chrome", [("open", 0.1, 0.4), ("chrome", 0.5, 0.9)]
+
+
+def create_fixed_engine():
+    return FixedEngine()
+
+
+def make_recordings(folder):
+    """Two one-command recordings and a manifest listing them"""
+    write_test_wav(os.path.join(folder, "first.wav"), [0] * 4 + [1] * 4 + [0] * 6)
+    write_test_wav(os.path.join(folder, "second.wav"), [0] * 8 + [1] * 4 + [0] * 6)
+    manifest = os.path.join(folder, "manifest.jsonl")
+    with open(manifest, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"audio": "first.wav", "text": "Open Chrome"}) + "\n")
+        f.write(json.dumps({"audio": "second.wav", "text": "open notepad"}) + "\n")
+    return manifest
+
+
+def test_word_error_rate():
+    assert transcribe.word_error_rate("open chrome", "Open Chrome.") == 0.0
+    assert transcribe.word_error_rate("open notepad", "open chrome") == 0.5
+    assert transcribe.word_error_rate("open", "please open it") == 2.0
+    print("✅ Word error rate")
+
+
+def test_batch_from_manifest():
+    folder = tempfile.mkdtemp()
+    try:
+        manifest = make_recordings(folder)
+        items = transcribe.collect_inputs([manifest])
+        records = list(transcribe.run_batch(items, create_fixed_engine, (), workers=2))
+        assert transcribe.collect_inputs([folder]) == [(path, None) for path, _ in items]
+    finally:
+        shutil.rmtree(folder)
+
+    records = {os.path.basename(record["file"]): record for record in records}
+    assert set(records) == {"first.wav", "second.wav"}, records
+
+    first, second = records["first.wav"], records["second.wav"]
+    assert first["text"] == "open chrome" and first["wer"] == 0.0
+    assert second["wer"] == 0.5
+    assert first["audio_seconds"] > 0 and first["rtf"] is not None
+
+    # Word timings are relative to the file: speech starts after 2 chunks of
+    # silence (4 silent chunks minus 2 of VAD pre-roll) in the first recording
+    chunk_seconds = 4096 / 16000
+    assert first["segments"][0]["start"] == round(2 * chunk_seconds, 3)
+    assert first["words"][0] == {"word": "open", "start": round(2 * chunk_seconds + 0.1, 3),
+                                 "end": round(2 * chunk_seconds + 0.4, 3)}
+    assert second["segments"][0]["start"] == round(6 * chunk_seconds, 3)
+    print("✅ Manifest transcribed in a process pool")
+
+
+def main():
+    print("JARVIS Batch Transcription Test")
+    print("=" * 40)
+    test_word_error_rate()
+    test_batch_from_manifest()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Speech cache test for JARVIS
+Stands a local HTTP server in for ElevenLabs and checks that repeated
+phrases are synthesized once, that the disk tier survives a restart, that
+pre-warmed phrases play from memory, and that the disk tier is evicted by size
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import Config
+from tts_cache import SpeechCache, cache_key
+
+
+class StubElevenLabs(BaseHTTPRequestHandler):
+    """Answers text-to-speech POSTs with fake MP3 bytes and counts them"""
+
+    requests = []
+    accepts = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        StubElevenLabs.requests.append((self.path, body["text"]))
+        StubElevenLabs.accepts.append(self.headers.get("Accept"))
+        audio = b"ID3" + body["text"].encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Content-Length", str(len(audio)))
+        self.end_headers()
+        self.wfile.write(audio)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_tts(directory):
+    """A TextToSpeech on ElevenLabs whose playback is recorded instead of heard"""
+    from tts import TextToSpeech
+    Config.TTS_CACHE_DIR = directory
+    engine = TextToSpeech()
+    engine.played = []
+    engine._play_audio_bytes = engine.played.append
+    return engine
+
+
+@contextmanager
+def stub_elevenlabs():
+    """Point Config at a local stub server and a fresh cache directory; yields the directory"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubElevenLabs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    directory = tempfile.mkdtemp()
+    saved = (Config.ELEVENLABS_API_KEY, Config.ELEVENLABS_API_URL, Config.TTS_CACHE_DIR, Config.TTS_ENGINE_ORDER,
+             Config.ELEVENLABS_STREAMING)
+    Config.ELEVENLABS_API_KEY = "test-key"
+    Config.ELEVENLABS_STREAMING = False             # Whole MP3 responses (see test_tts_stream.py)
+    Config.ELEVENLABS_API_URL = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    Config.TTS_ENGINE_ORDER = ["elevenlabs"]
+    StubElevenLabs.requests = []
+    StubElevenLabs.accepts = []
+    try:
+        yield directory
+    finally:
+        (Config.ELEVENLABS_API_KEY, Config.ELEVENLABS_API_URL, Config.TTS_CACHE_DIR, Config.TTS_ENGINE_ORDER,
+         Config.ELEVENLABS_STREAMING) = saved
+        server.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_repeated_phrases_skip_synthesis():
+    with stub_elevenlabs() as directory:
+        engine = make_tts(directory)
+        for text in ("Yes sir?", "Opening chrome", "Yes sir?", "Yes sir?"):
+            engine.speak(text, blocking=True)
+        assert [text for _, text in StubElevenLabs.requests] == ["Yes sir?", "Opening chrome"], StubElevenLabs.requests
+        assert StubElevenLabs.requests[0][0] == f"/v1/text-to-speech/{Config.ELEVENLABS_VOICE_ID}"
+        assert StubElevenLabs.accepts[0] == "audio/mpeg"
+        assert engine.played == [b"ID3Yes sir?", b"ID3Opening chrome", b"ID3Yes sir?", b"ID3Yes sir?"]
+        stats = engine.cache_stats()
+        assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (2, 0, 2), stats
+        print(f"✅ 4 utterances, 2 synthesized ({stats['hit_rate']:.0%} hit rate)")
+
+        # A restarted assistant plays known phrases from disk
+        restarted = make_tts(directory)
+        restarted.speak("Opening chrome", blocking=True)
+        assert len(StubElevenLabs.requests) == 2
+        assert restarted.played == [b"ID3Opening chrome"]
+        assert restarted.cache_stats()["disk_hits"] == 1
+        print("✅ Disk tier survives a restart")
+
+
+def test_prewarm_personality_phrases():
+    from conversation_context import jarvis_personality, conversation_context
+    phrases = jarvis_personality.common_phrases()
+    assert phrases[0] == jarvis_personality.BASIC_ACKNOWLEDGMENTS[0]
+    with stub_elevenlabs() as directory:
+        engine = make_tts(directory)
+        # Multi-sentence phrases are synthesized (and so cached) per sentence
+        sentences = {sentence for phrase in phrases for sentence in engine._sentences(phrase)}
+        engine.prewarm_async(phrases).join(10)
+        assert len(StubElevenLabs.requests) == len(sentences)
+        assert engine.played == []                        # Synthesized, not spoken
+
+        # Every acknowledgment now plays from memory
+        for _ in range(10):
+            engine.speak(jarvis_personality.get_acknowledgment(conversation_context), blocking=True)
+        stats = engine.cache_stats()
+        assert len(StubElevenLabs.requests) == len(sentences)
+        assert stats["memory_hits"] >= 10 and stats["misses"] == 0, stats
+
+        # After a restart, pre-warming only loads the files back into memory
+        restarted = make_tts(directory)
+        assert restarted.prewarm(phrases) == 0
+        assert len(StubElevenLabs.requests) == len(sentences)
+        assert restarted.cache_stats()["memory_entries"] == len(sentences)
+    print(f"✅ {len(phrases)} personality phrases pre-warmed; acknowledgments play from memory")
+
+
+def test_key_covers_voice_and_rate():
+    base = cache_key("pyttsx3", "david", None, 150, "Screenshot saved")
+    assert base == cache_key("pyttsx3", "david", None, 150, "Screenshot  saved ")
+    assert base != cache_key("pyttsx3", "zira", None, 150, "Screenshot saved")
+    assert base != cache_key("pyttsx3", "david", None, 180, "Screenshot saved")
+    assert base != cache_key("elevenlabs", "david", None, 150, "Screenshot saved")
+    print("✅ Cache key covers engine, voice, model and rate")
+
+
+def test_disk_tier_evicts_by_size():
+    directory = tempfile.mkdtemp()
+    try:
+        cache = SpeechCache(directory, max_bytes=250, memory_items=2)
+        keys = [cache_key("elevenlabs", "v", "m", None, f"phrase {i}") for i in range(4)]
+        cache.put(keys[0], b"a" * 100)
+        cache.put(keys[1], b"b" * 100)
+        assert cache.get(keys[0]) == b"a" * 100          # Now most recently used
+        cache.put(keys[2], b"c" * 100)                   # Over budget: evicts keys[1]
+        assert not os.path.exists(os.path.join(directory, keys[1] + ".mp3"))
+        assert os.path.exists(os.path.join(directory, keys[0] + ".mp3"))
+        stats = cache.stats()
+        assert stats["disk_bytes"] == 200 and stats["evictions"] == 1, stats
+        assert stats["memory_entries"] == 2
+
+        # Memory only holds two; the oldest comes back from disk
+        cache.put(keys[3], b"d" * 10)                    # Fits on disk; keys[0] leaves memory
+        assert cache.get(keys[0]) == b"a" * 100
+        assert cache.stats()["disk_hits"] == 1
+        assert cache.get(keys[1]) is None
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    print("✅ Disk tier evicts least recently used files past its size limit")
+
+
+def test_directory_created_on_first_put():
+    parent = tempfile.mkdtemp()
+    directory = os.path.join(parent, "tts_cache")
+    try:
+        cache = SpeechCache(directory)
+        assert not os.path.exists(directory)             # Constructing (and importing tts) writes nothing
+        assert cache.get(cache_key("elevenlabs", "v", "m", None, "Yes sir?")) is None
+        assert not os.path.exists(directory)
+        cache.put(cache_key("elevenlabs", "v", "m", None, "Yes sir?"), b"ID3")
+        assert len(os.listdir(directory)) == 1
+    finally:
+        shutil.rmtree(parent, ignore_errors=True)
+    print("✅ Cache directory is only created when something is stored")
+
+
+def main():
+    print("JARVIS Speech Cache Test")
+    print("=" * 40)
+    test_repeated_phrases_skip_synthesis()
+    test_prewarm_personality_phrases()
+    test_key_covers_voice_and_rate()
+    test_disk_tier_evicts_by_size()
+    test_directory_created_on_first_put()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Sentence pipelining test for JARVIS
+Speaks multi-sentence replies through ElevenLabs (a local stub server with a
+fixed synthesis delay) and through a stand-in pyttsx3 engine, and checks that
+sentence N+1 is synthesized while sentence N plays
+"""
+
+import json
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import Config
+import tts as tts_module
+from tts import TextToSpeech, split_sentences
+
+SYNTHESIS = 0.15            # Seconds per sentence, both engines
+PLAYBACK = 0.15
+REPLY = ("I'm not sure I understood 'flibber'. Could you clarify? "
+         "For example, I can open applications like Chrome or Notepad.")
+
+
+class Timeline:
+    """Start/end times of synthesis and playback per sentence"""
+
+    def __init__(self):
+        self.events = []
+        self.lock = threading.Lock()
+
+    def record(self, kind, text, start, end):
+        with self.lock:
+            self.events.append((kind, text, start, end))
+
+    def spans(self, kind):
+        return [(text, start, end) for k, text, start, end in self.events if k == kind]
+
+
+class SlowElevenLabs(BaseHTTPRequestHandler):
+    timeline = None
+    failing = set()             # Texts answered with a server error
+    delays = {}                 # Texts synthesized slower than SYNTHESIS
+
+    def do_POST(self):
+        start = time.monotonic()
+        text = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["text"]
+        time.sleep(SlowElevenLabs.delays.get(text, SYNTHESIS))
+        if text in SlowElevenLabs.failing:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        SlowElevenLabs.timeline.record("synthesize", text, start, time.monotonic())
+        audio = text.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(audio)))
+        self.end_headers()
+        self.wfile.write(audio)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakePyttsx3:
+    """save_to_file + runAndWait render "WAV" bytes after SYNTHESIS seconds"""
+
+    def __init__(self, timeline):
+        self.timeline = timeline
+        self.job = None
+
+    def save_to_file(self, text, path):
+        self.job = (text, path)
+
+    def runAndWait(self):
+        text, path = self.job
+        start = time.monotonic()
+        time.sleep(SYNTHESIS)
+        with open(path, "wb") as f:
+            f.write(b"RIFF" + text.encode("utf-8"))
+        self.timeline.record("synthesize", text, start, time.monotonic())
+
+    def stop(self):
+        pass
+
+
+def player(timeline, strip):
+    def play(data):
+        start = time.monotonic()
+        time.sleep(PLAYBACK)
+        timeline.record("play", data[strip:].decode("utf-8"), start, time.monotonic())
+    return play
+
+
+@contextmanager
+def cache_dir():
+    directory = tempfile.mkdtemp()
+    saved = (Config.TTS_CACHE_DIR, Config.TTS_ENGINE_ORDER)
+    Config.TTS_CACHE_DIR = directory
+    try:
+        yield directory
+    finally:
+        (Config.TTS_CACHE_DIR, Config.TTS_ENGINE_ORDER) = saved
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def assert_pipelined(timeline, sentences):
+    synthesized, played = timeline.spans("synthesize"), timeline.spans("play")
+    assert [text for text, _, _ in played] == sentences, played
+    for i in range(len(sentences) - 1):
+        # Sentence i+1 was being synthesized while sentence i played
+        _, play_start, play_end = played[i]
+        _, synth_start, synth_end = synthesized[i + 1]
+        assert synth_start < play_end and synth_end > play_start, (played[i], synthesized[i + 1])
+    total = played[-1][2] - synthesized[0][1]
+    serial = len(sentences) * (SYNTHESIS + PLAYBACK)
+    return total, serial
+
+
+def test_split_sentences():
+    assert split_sentences("Done.") == ["Done."]
+    assert split_sentences(REPLY) == ["I'm not sure I understood 'flibber'.", "Could you clarify?",
+                                      "For example, I can open applications like Chrome or Notepad."]
+    long = "You have 3 scheduled commands: open chrome at 9 am, take a screenshot at noon, check battery at 5 pm"
+    assert split_sentences(long, max_chars=40) == [
+        "You have 3 scheduled commands:", "open chrome at 9 am,", "take a screenshot at noon,", "check battery at 5 pm"]
+    assert split_sentences("CPU usage is 12.5 percent") == ["CPU usage is 12.5 percent"]
+    print("✅ Replies split into sentences, long sentences into clauses")
+
+
+@contextmanager
+def elevenlabs_tts(timeline):
+    """A whole-MP3 ElevenLabs TextToSpeech against the slow stub, playing into the timeline"""
+    SlowElevenLabs.timeline = timeline
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowElevenLabs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    saved = (Config.ELEVENLABS_API_KEY, Config.ELEVENLABS_API_URL, Config.ELEVENLABS_STREAMING)
+    Config.ELEVENLABS_API_KEY = "test-key"
+    Config.ELEVENLABS_API_URL = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    Config.ELEVENLABS_STREAMING = False
+    try:
+        with cache_dir():
+            Config.TTS_ENGINE_ORDER = ["elevenlabs"]
+            engine = TextToSpeech()
+            engine._play_elevenlabs_audio = player(timeline, 0)
+            yield engine
+    finally:
+        (Config.ELEVENLABS_API_KEY, Config.ELEVENLABS_API_URL, Config.ELEVENLABS_STREAMING) = saved
+        SlowElevenLabs.failing = set()
+        SlowElevenLabs.delays = {}
+        server.shutdown()
+
+
+def test_elevenlabs_pipeline():
+    timeline = Timeline()
+    with elevenlabs_tts(timeline) as engine:
+        engine.speak(REPLY, blocking=True)
+    total, serial = assert_pipelined(timeline, split_sentences(REPLY))
+    print(f"✅ ElevenLabs: 3 sentences in {total * 1000:.0f} ms (one after another: {serial * 1000:.0f} ms)")
+
+
+def test_pyttsx3_pipeline():
+    saved_winsound = tts_module.winsound
+    try:
+        # Windows plays the WAVs with winsound; elsewhere they go to the pyaudio output
+        for sink, winsound, open_output in (("winsound", object(), None),
+                                            ("pyaudio", None, lambda *args: None)):
+            timeline = Timeline()
+            tts_module.winsound = winsound
+            with cache_dir():
+                Config.TTS_ENGINE_ORDER = []
+                engine = TextToSpeech()
+                engine.open_output = open_output
+                engine.local_engine = FakePyttsx3(timeline)
+                engine.primary_engine = "pyttsx3"
+                engine._play_wav_bytes = player(timeline, 4)
+                engine.speak(REPLY, blocking=True)
+                assert engine.prewarm(["Yes sir?"]) == 1
+            total, serial = assert_pipelined(timeline, split_sentences(REPLY))
+            print(f"✅ pyttsx3 through {sink}: 3 sentences in {total * 1000:.0f} ms "
+                  f"(one after another: {serial * 1000:.0f} ms)")
+    finally:
+        tts_module.winsound = saved_winsound
+
+
+def test_fallback_speaks_only_the_rest():
+    timeline = Timeline()
+    sentences = split_sentences(REPLY)
+    saved_winsound = tts_module.winsound
+    tts_module.winsound = object()
+    try:
+        with elevenlabs_tts(timeline) as engine:
+            SlowElevenLabs.failing = {sentences[1]}          # ElevenLabs fails mid-reply
+            engine.local_engine = FakePyttsx3(timeline)
+            engine._play_wav_bytes = player(timeline, 4)
+            engine.speak(REPLY, blocking=True)
+    finally:
+        tts_module.winsound = saved_winsound
+    # The first sentence is heard (and synthesized) once; pyttsx3 picks up from the second
+    assert [text for text, _, _ in timeline.spans("play")] == sentences, timeline.spans("play")
+    assert [text for text, _, _ in timeline.spans("synthesize")].count(sentences[0]) == 1
+    print("✅ A mid-reply ElevenLabs failure falls back to pyttsx3 for the unheard sentences only")
+
+
+def test_interrupt_between_sentences():
+    timeline = Timeline()
+    sentences = split_sentences(REPLY)
+    with elevenlabs_tts(timeline) as engine:
+        SlowElevenLabs.delays = {sentences[1]: 1.0}
+        play = engine._play_elevenlabs_audio
+
+        def play_then_barge_in(data):
+            play(data)
+            # The user talks over the reply while sentence two is still synthesizing
+            threading.Timer(0.1, engine.interrupt).start()
+
+        engine._play_elevenlabs_audio = play_then_barge_in
+        start = time.monotonic()
+        engine.speak(REPLY, blocking=True)
+        elapsed = time.monotonic() - start
+    assert [text for text, _, _ in timeline.spans("play")] == sentences[:1], timeline.spans("play")
+    assert elapsed < 0.8, f"speech ran on for {elapsed:.2f}s after the interrupt"
+    print(f"✅ Barge-in between sentences stops the reply after {elapsed * 1000:.0f} ms")
+
+
+def main():
+    print("JARVIS Sentence Pipelining Test")
+    print("=" * 40)
+    test_split_sentences()
+    test_elevenlabs_pipeline()
+    test_pyttsx3_pipeline()
+    test_fallback_speaks_only_the_rest()
+    test_interrupt_between_sentences()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Speech queue test for JARVIS
+Holds the speech worker on a first utterance, queues more behind it, and
+checks priority order, coalescing of duplicates, barge-in and the metrics,
+and that a barge-in cuts off audio already handed to pyaudio or winsound
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+
+from config import Config
+import tts as tts_module
+from tts import TextToSpeech, ACK, ERROR, SUGGESTION, pcm_to_wav
+
+RATE = 22050
+
+
+def gated_tts():
+    """A TextToSpeech whose worker records utterances and holds on 'hold'"""
+    engine = TextToSpeech()
+    engine.spoken = []
+    engine.gate = threading.Event()
+    engine.holding = threading.Event()
+
+    def say(text):
+        if text == "hold":
+            engine.holding.set()
+            engine.gate.wait(5)
+        engine.spoken.append(text)
+    engine._say = say
+    return engine
+
+
+def test_priority_order():
+    engine = gated_tts()
+    engine.speak("hold")
+    assert engine.holding.wait(2)
+    engine.speak("Would you like me to organize your open windows?", priority=SUGGESTION)
+    engine.speak("Opening chrome")
+    engine.speak("Sorry, I couldn't take a screenshot", priority=ERROR)
+    engine.speak("Yes sir?", priority=ACK)
+    assert engine.queue_stats()["depth"] == 4
+    engine.gate.set()
+    engine.speak("Done.", blocking=True, priority=SUGGESTION)
+    assert engine.spoken == ["hold", "Yes sir?", "Sorry, I couldn't take a screenshot", "Opening chrome",
+                             "Would you like me to organize your open windows?", "Done."], engine.spoken
+    stats = engine.queue_stats()
+    assert stats["depth"] == 0 and stats["spoken"] == 6 and stats["max_depth"] == 5, stats
+    assert set(stats["wait_ms"]) == {"ack", "error", "result", "suggestion"}
+    print("✅ One worker speaks ack > error > result > suggestion")
+    print(f"   Waits (ms): { {name: w['p50'] for name, w in stats['wait_ms'].items()} }")
+
+
+def test_duplicates_coalesce():
+    engine = gated_tts()
+    engine.speak("hold")
+    assert engine.holding.wait(2)
+    engine.speak("Screenshot saved")
+    engine.speak("Opening chrome")
+    engine.speak("screenshot  saved")                           # Same words, still pending
+    engine.speak("Opening chrome", priority=ERROR)              # Duplicate moves up the queue
+    assert engine.queue_stats()["depth"] == 2
+    engine.gate.set()
+    engine.speak("Done.", blocking=True)
+    assert engine.spoken == ["hold", "Opening chrome", "Screenshot saved", "Done."], engine.spoken
+    assert engine.queue_stats()["coalesced"] == 2
+    print("✅ Duplicate pending utterances are spoken once")
+
+
+def test_hotword_barges_in():
+    engine = gated_tts()
+    engine.speak("hold")
+    assert engine.holding.wait(2)
+    waiter_done = threading.Event()
+
+    def wait_for_summary():
+        engine.speak("You have 3 scheduled commands", blocking=True)
+        waiter_done.set()
+    threading.Thread(target=wait_for_summary).start()
+    engine.speak("Would you like me to check your calendar?", priority=SUGGESTION)
+
+    held = engine.current
+    engine.interrupt()                      # New hotword
+    engine.speak("Yes sir?", priority=ACK)
+    assert waiter_done.wait(2)              # Dropped utterances release their waiters
+    assert held.cancelled and engine._interrupted()
+    engine.gate.set()
+    engine.speak("Opening chrome", blocking=True)
+    assert engine.spoken == ["hold", "Yes sir?", "Opening chrome"], engine.spoken
+    stats = engine.queue_stats()
+    assert stats["interrupted"] == 3 and stats["spoken"] == 2, stats      # "hold" was cut short
+    print("✅ A new hotword drops pending speech and cuts the current utterance short")
+
+
+class WavPyttsx3:
+    """Renders every text as `seconds` of 16-bit mono silence"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.path = None
+
+    def save_to_file(self, text, path):
+        self.path = path
+
+    def runAndWait(self):
+        with open(self.path, "wb") as f:
+            f.write(pcm_to_wav(bytes(int(RATE * self.seconds) * 2), RATE))
+
+    def stop(self):
+        pass
+
+
+class PacedOutput:
+    """Stands in for a pyaudio output stream: writes take as long as the audio plays"""
+
+    def __init__(self, sample_rate, channels=1, sample_width=2):
+        self.bytes_per_second = sample_rate * channels * sample_width
+        self.played = 0
+        self.closed = False
+
+    def write(self, data):
+        time.sleep(len(data) / self.bytes_per_second)
+        self.played += len(data)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeWinsound:
+    SND_ASYNC, SND_NODEFAULT, SND_FILENAME = 0x1, 0x2, 0x20000
+
+    def __init__(self):
+        self.calls = []
+
+    def PlaySound(self, sound, flags):
+        self.calls.append((sound, flags))
+
+
+def test_barge_in_stops_playback():
+    directory = tempfile.mkdtemp()
+    saved = (tts_module.winsound, Config.TTS_CACHE_DIR, Config.TTS_ENGINE_ORDER)
+    Config.TTS_CACHE_DIR, Config.TTS_ENGINE_ORDER = directory, []
+    try:
+        for sink in ("pyaudio", "winsound"):
+            tts_module.winsound = winsound = FakeWinsound()
+            engine = TextToSpeech()
+            engine.local_engine = WavPyttsx3(seconds=2.0)
+            engine.primary_engine = "pyttsx3"
+            outputs = []
+            if sink == "pyaudio":
+                engine.open_output = lambda *args: outputs.append(PacedOutput(*args)) or outputs[-1]
+            else:
+                engine.open_output = None
+
+            engine.speak("Here is a long summary of everything you asked for")
+            deadline = time.monotonic() + 2
+            while not (outputs or winsound.calls) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.2)
+            held = engine.current
+            start = time.monotonic()
+            engine.interrupt()
+            assert held.done.wait(1)
+            elapsed = time.monotonic() - start
+
+            assert elapsed < 0.3, f"{sink} kept playing for {elapsed:.2f}s"
+            if sink == "pyaudio":
+                assert 0 < outputs[0].played < 2 * RATE * 2 and outputs[0].closed
+            else:
+                assert winsound.calls[-1] == (None, 0)           # Purged
+                assert winsound.calls[0][1] & winsound.SND_ASYNC
+            stats = engine.queue_stats()
+            assert stats["spoken"] == 0 and stats["interrupted"] == 1, stats
+            print(f"✅ Barge-in cuts off {sink} playback after {elapsed * 1000:.0f} ms")
+    finally:
+        tts_module.winsound, Config.TTS_CACHE_DIR, Config.TTS_ENGINE_ORDER = saved
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    print("JARVIS Speech Queue Test")
+    print("=" * 40)
+    test_priority_order()
+    test_duplicates_coalesce()
+    test_hotword_barges_in()
+    test_barge_in_stops_playback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Streaming speech test for JARVIS
+Stands a local HTTP server in for ElevenLabs that sends its PCM response in
+slow chunks, and checks that playback starts with the first chunk instead of
+after the whole response, that the full audio is cached, that a barge-in
+stops the stream, and that a multi-sentence reply plays on one output
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import Config
+
+CHUNKS = 5
+CHUNK_BYTES = 4410          # 0.1 s of 22.05 kHz 16-bit mono
+CHUNK_DELAY = 0.2
+
+
+class SlowChunkedElevenLabs(BaseHTTPRequestHandler):
+    """Streams CHUNKS chunks of PCM, CHUNK_DELAY seconds apart"""
+
+    protocol_version = "HTTP/1.1"
+    requests = []
+    arrivals = []
+    accepts = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        SlowChunkedElevenLabs.requests.append(self.path)
+        SlowChunkedElevenLabs.accepts.append(self.headers.get("Accept"))
+        SlowChunkedElevenLabs.arrivals.append(time.monotonic())
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/pcm")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for i in range(CHUNKS):
+                if i:
+                    time.sleep(CHUNK_DELAY)
+                # Odd-sized pieces: samples straddle chunk boundaries
+                chunk = bytes([i + 1]) * (CHUNK_BYTES + (1 if i % 2 == 0 else -1))
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            pass                    # Client hung up (barge-in)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RecordingOutput:
+    """Stands in for the pyaudio output stream"""
+
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+        self.writes = []            # (monotonic time, bytes)
+        self.closed = False
+
+    def write(self, data):
+        assert len(data) % 2 == 0
+        self.writes.append((time.monotonic(), data))
+
+    def close(self):
+        self.closed = True
+
+
+@contextmanager
+def streaming_tts():
+    """A streaming TextToSpeech against the slow stub; yields (engine, outputs)"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowChunkedElevenLabs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    directory = tempfile.mkdtemp()
+    saved = (Config.ELEVENLABS_API_KEY, Config.ELEVENLABS_API_URL, Config.TTS_CACHE_DIR, Config.TTS_ENGINE_ORDER,
+             Config.ELEVENLABS_STREAMING)
+    Config.ELEVENLABS_API_KEY = "test-key"
+    Config.ELEVENLABS_API_URL = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    Config.TTS_CACHE_DIR = directory
+    Config.TTS_ENGINE_ORDER = ["elevenlabs"]
+    Config.ELEVENLABS_STREAMING = True
+    SlowChunkedElevenLabs.requests = []
+    SlowChunkedElevenLabs.arrivals = []
+    SlowChunkedElevenLabs.accepts = []
+    try:
+        from tts import TextToSpeech
+        engine = TextToSpeech()
+        outputs = []
+
+        def open_output(sample_rate):
+            outputs.append(RecordingOutput(sample_rate))
+            return outputs[-1]
+        engine.open_output = open_output
+        yield engine, outputs
+    finally:
+        (Config.ELEVENLABS_API_KEY, Config.ELEVENLABS_API_URL, Config.TTS_CACHE_DIR, Config.TTS_ENGINE_ORDER,
+         Config.ELEVENLABS_STREAMING) = saved
+        server.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_playback_starts_with_first_chunk():
+    with streaming_tts() as (engine, outputs):
+        started = time.monotonic()
+        engine.speak("You have 3 scheduled commands", blocking=True)
+        finished = time.monotonic()
+        assert SlowChunkedElevenLabs.requests == [
+            f"/v1/text-to-speech/{Config.ELEVENLABS_VOICE_ID}/stream?output_format={Config.ELEVENLABS_STREAM_FORMAT}"]
+        assert SlowChunkedElevenLabs.accepts == ["*/*"]    # Not asking for MP3 on the PCM path
+        output = outputs[0]
+        assert output.sample_rate == 22050 and output.closed
+        audio = b"".join(data for _, data in output.writes)
+        assert len(audio) == CHUNKS * CHUNK_BYTES
+        first_write = output.writes[0][0] - started
+        assert finished - started >= (CHUNKS - 1) * CHUNK_DELAY
+        assert first_write < CHUNK_DELAY, first_write
+        stats = engine.queue_stats()["first_audio_ms"]
+        assert stats["count"] == 1 and stats["p50"] < CHUNK_DELAY * 1000
+        print(f"✅ First audio after {first_write * 1000:.0f} ms of a {(finished - started) * 1000:.0f} ms response")
+
+        # The whole utterance was kept in memory and plays from the cache next time
+        engine.speak("You have 3 scheduled commands", blocking=True)
+        assert len(SlowChunkedElevenLabs.requests) == 1
+        assert b"".join(data for _, data in outputs[1].writes) == audio
+        assert engine.cache_stats()["memory_hits"] == 1
+        print("✅ Streamed audio is cached whole and replays without a request")
+
+
+def test_barge_in_stops_stream():
+    with streaming_tts() as (engine, outputs):
+        engine.speak("Here is a long summary of everything you asked for")
+        deadline = time.monotonic() + 2
+        while not (outputs and outputs[0].writes) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        engine.interrupt()
+        engine.speak("Yes sir?", blocking=True)
+        heard = sum(len(data) for _, data in outputs[0].writes)
+        assert 0 < heard < CHUNKS * CHUNK_BYTES, heard
+        assert outputs[0].closed
+        assert engine.cache_stats()["disk_entries"] == 1       # Only the complete "Yes sir?"
+    print("✅ A barge-in stops the stream; the partial utterance is not cached")
+
+
+def test_sentences_share_one_stream():
+    with streaming_tts() as (engine, outputs):
+        engine.speak("Screenshot saved. It is in your pictures folder.", blocking=True)
+        base = f"/v1/text-to-speech/{Config.ELEVENLABS_VOICE_ID}"
+        query = f"?output_format={Config.ELEVENLABS_STREAM_FORMAT}"
+        assert sorted(SlowChunkedElevenLabs.requests) == sorted([f"{base}/stream{query}", f"{base}{query}"])
+        # The second sentence was requested while the first was still streaming
+        assert max(SlowChunkedElevenLabs.arrivals) - min(SlowChunkedElevenLabs.arrivals) < CHUNK_DELAY
+        assert len(outputs) == 1 and outputs[0].closed
+        assert sum(len(data) for _, data in outputs[0].writes) == 2 * CHUNKS * CHUNK_BYTES
+    print("✅ Later sentences are fetched during the first one's stream and play on the same output")
+
+
+def test_whole_responses_play_through_the_output():
+    with streaming_tts() as (engine, outputs):
+        Config.ELEVENLABS_STREAMING = False
+        engine.speak("Opening chrome", blocking=True)
+        base = f"/v1/text-to-speech/{Config.ELEVENLABS_VOICE_ID}"
+        # Still PCM, so a barge-in can stop it on the output (MP3 would go to playsound)
+        assert SlowChunkedElevenLabs.requests == [f"{base}?output_format={Config.ELEVENLABS_STREAM_FORMAT}"]
+        assert len(outputs) == 1 and outputs[0].closed
+        assert sum(len(data) for _, data in outputs[0].writes) == CHUNKS * CHUNK_BYTES
+    print("✅ Without streaming, whole PCM responses play on the same stoppable output")
+
+
+def main():
+    print("JARVIS Streaming Speech Test")
+    print("=" * 40)
+    test_playback_starts_with_first_chunk()
+    test_barge_in_stops_stream()
+    test_sentences_share_one_stream()
+    test_whole_responses_play_through_the_output()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Voice activity detection test for JARVIS
+Feeds synthetic silence, tone and hiss chunks through VoiceActivityDetector
+and checks the thresholds, segment boundaries, pre-roll and hangover
+"""
+
+import math
+import random
+import struct
+
+import vad as vad_module
+from vad import VoiceActivityDetector
+
+SAMPLE_RATE = 16000
+CHUNK_FRAMES = 1600          # 100 ms
+
+
+def pcm(samples):
+    values = [max(-32768, min(32767, int(s))) for s in samples]
+    return struct.pack(f"<{len(values)}h", *values)
+
+
+def silence(level=40, seed=0):
+    """Room noise well under the energy threshold"""
+    rng = random.Random(seed)
+    return pcm(rng.gauss(0, level) for _ in range(CHUNK_FRAMES))
+
+
+def tone(frequency=220, amplitude=4000):
+    """Voiced speech stand-in: loud, few zero crossings"""
+    return pcm(amplitude * math.sin(2 * math.pi * frequency * i / SAMPLE_RATE) for i in range(CHUNK_FRAMES))
+
+
+def hiss(level=3000, seed=0):
+    """Loud white noise: over the energy threshold, but crosses zero every other sample"""
+    rng = random.Random(seed)
+    return pcm(rng.gauss(0, level) for _ in range(CHUNK_FRAMES))
+
+
+def make_vad(**overrides):
+    settings = dict(energy_threshold=500, zcr_threshold=0.35, hangover_chunks=3, preroll_chunks=2)
+    settings.update(overrides)
+    return VoiceActivityDetector(**settings)
+
+
+def test_thresholds():
+    vad = make_vad()
+    assert not vad.is_speech(silence()) and vad.last_rms < 500
+    assert vad.is_speech(tone()) and vad.last_zcr < 0.35
+    assert not vad.is_speech(hiss()), (vad.last_rms, vad.last_zcr)
+    assert vad.last_rms > 500 and vad.last_zcr > 0.35      # Rejected by the zero-crossing rate
+    assert not vad.is_speech(tone(amplitude=300))          # Too quiet
+    assert not vad.is_speech(b"")
+    print("✅ Energy and zero-crossing thresholds separate tone from silence and hiss")
+
+
+def test_preroll_and_hangover():
+    vad = make_vad()
+    quiet = [silence(seed=i) for i in range(5)]
+    for chunk in quiet:
+        assert vad.process(chunk) == []
+
+    # Speech starts: the last preroll_chunks quiet chunks come first
+    speech = tone()
+    assert vad.process(speech) == quiet[-2:] + [speech]
+    assert vad.in_speech and vad.segments == 1
+
+    # Loud again mid-segment: no pre-roll replayed, hangover restarts
+    assert vad.process(speech) == [speech]
+
+    # hangover_chunks quiet chunks still go through, then the gate closes
+    tail = [silence(seed=10 + i) for i in range(5)]
+    assert [vad.process(chunk) for chunk in tail[:3]] == [[chunk] for chunk in tail[:3]]
+    assert vad.in_speech
+    assert vad.process(tail[3]) == [] and not vad.in_speech
+    assert vad.process(tail[4]) == []
+
+    stats = vad.get_stats()
+    assert (stats["chunks_processed"], stats["speech_chunks"], stats["segments"]) == (12, 2, 1), stats
+    print("✅ 2 pre-roll chunks replayed, 3 hangover chunks forwarded after speech")
+
+
+def test_segment_boundaries():
+    vad = make_vad(hangover_chunks=1, preroll_chunks=0)
+    events = []
+    vad.on_speech_start = lambda: events.append(("start", index))
+    vad.on_speech_end = lambda: events.append(("end", index))
+
+    # Two words, a pause longer than the hangover, and hiss that never opens the gate
+    script = [silence()] * 2 + [tone()] * 3 + [silence()] * 3 + [hiss()] * 2 + [tone()] * 2 + [silence()] * 3
+    forwarded = 0
+    for index, chunk in enumerate(script):
+        forwarded += len(vad.process(chunk))
+    assert events == [("start", 2), ("end", 6), ("start", 10), ("end", 13)], events
+    assert forwarded == 3 + 1 + 2 + 1                      # Speech plus one hangover chunk each
+    assert vad.segments == 2
+    print("✅ Segments open on the first speech chunk and close after the hangover")
+
+
+def test_reset_drops_segment_and_preroll():
+    vad = make_vad()
+    vad.process(silence())
+    vad.process(tone())
+    vad.reset()
+    assert not vad.in_speech
+    speech = tone()
+    assert vad.process(speech) == [speech]                 # Nothing left to replay
+    print("✅ reset() ends the segment and clears the pre-roll")
+
+
+def test_python_fallback_matches_numpy():
+    if not vad_module.NUMPY_AVAILABLE:
+        print("⚠️ NumPy not installed - fallback is the only backend")
+        return
+    chunks = [silence(), tone(), hiss()]
+    with_numpy = [make_vad().analyze(chunk) for chunk in chunks]
+    vad_module.NUMPY_AVAILABLE = False
+    try:
+        fallback = [make_vad().analyze(chunk) for chunk in chunks]
+    finally:
+        vad_module.NUMPY_AVAILABLE = True
+    for (rms_a, zcr_a), (rms_b, zcr_b) in zip(with_numpy, fallback):
+        assert math.isclose(rms_a, rms_b, rel_tol=1e-4) and math.isclose(zcr_a, zcr_b), (rms_a, rms_b, zcr_a, zcr_b)
+    print("✅ Pure Python fallback measures the same RMS and zero-crossing rate")
+
+
+def main():
+    print("JARVIS VAD Test")
+    print("=" * 40)
+    test_thresholds()
+    test_preroll_and_hangover()
+    test_segment_boundaries()
+    test_reset_drops_segment_and_preroll()
+    test_python_fallback_matches_numpy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Batch transcription for JARVIS
+Runs the live recognition stack (VAD -> RecognitionPipeline -> engine) over
+recorded WAV files without a microphone, in a process pool that loads one
+model per worker.
+
+    python main.py transcribe recordings/ --engine vosk --workers 4 -o results.jsonl
+
+Inputs can be WAV files, directories of WAV files, or manifests: one path per
+line, or JSONL lines with "audio" and the expected "text". Every input
+becomes one JSON line with the transcript, word timings, per-segment results
+and the real-time factor; manifest entries also get a word error rate.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from config import Config
+from vad import VoiceActivityDetector
+from audio_buffer import AudioHistory
+from audio_source import WavFileSource
+from recognition_pipeline import RecognitionPipeline
+import speech_engines
+
+ENGINES = ["vosk", "whisper", "google"]
+
+# Engine owned by this worker process, created once by _init_worker
+_worker_engine = None
+
+
+def create_engine(name, whisper_model="base"):
+    """Build a recognizer engine (with word timings where supported), or None"""
+    if name == "vosk":
+        model = speech_engines.load_vosk_model()
+        return speech_engines.VoskEngine(model, Config.SAMPLE_RATE, words=True) if model else None
+    if name == "whisper":
+        model = speech_engines.load_whisper_model(whisper_model)
+        return speech_engines.WhisperEngine(model, Config.SAMPLE_RATE, word_timestamps=True) if model else None
+    if name == "google":
+        return speech_engines.create_google_engine()
+    raise ValueError(f"Unknown engine '{name}', expected one of {ENGINES}")
+
+
+def collect_inputs(paths):
+    """Expand WAV files, directories and manifests into (wav path, expected text) pairs"""
+    items = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in sorted(os.walk(path)):
+                items.extend((os.path.join(root, name), None)
+                             for name in sorted(files) if name.lower().endswith(".wav"))
+        elif path.lower().endswith(".wav"):
+            items.append((path, None))
+        else:
+            items.extend(_read_manifest(path))
+    return items
+
+
+def _read_manifest(path):
+    """Read a manifest; relative audio paths are resolved against its folder"""
+    base = os.path.dirname(os.path.abspath(path))
+    items = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                entry = json.loads(line)
+                audio, expected = entry.get("audio") or entry["path"], entry.get("text")
+            else:
+                audio, expected = line, None
+            items.append((os.path.join(base, audio), expected))
+    return items
+
+
+def _words(text):
+    return "".join(c for c in text.lower() if c.isalnum() or c.isspace() or c == "'").split()
+
+
+def word_error_rate(expected, actual):
+    """Word-level edit distance divided by the number of expected words"""
+    reference, hypothesis = _words(expected), _words(actual)
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / len(reference)
+
+
+class _SegmentCollector:
+    """Pipeline stage that keeps final results"""
+
+    def __init__(self):
+        self.results = []
+
+    def on_result(self, result):
+        if result.is_final:
+            self.results.append(result)
+
+
+def transcribe_file(path, engine, expected=None):
+    """Run one WAV through VAD and the engine; return its JSON-ready record"""
+    start = time.perf_counter()
+    source = WavFileSource(path)
+    try:
+        engine.reset()
+        collector = _SegmentCollector()
+        vad = VoiceActivityDetector(
+            energy_threshold=Config.VAD_ENERGY_THRESHOLD,
+            zcr_threshold=Config.VAD_ZCR_THRESHOLD,
+            hangover_chunks=Config.VAD_HANGOVER_CHUNKS,
+            preroll_chunks=Config.VAD_PREROLL_CHUNKS
+        )
+        pipeline = RecognitionPipeline(source, [engine], collector, vad=vad,
+                                       history=AudioHistory(seconds=0))
+        stats = pipeline.run()
+    finally:
+        source.close()
+    elapsed = time.perf_counter() - start
+
+    # Headless replay stamps segments with their offset into the file
+    segments, words = [], []
+    for result in collector.results:
+        offset = result.start or 0.0
+        segments.append({"start": round(offset, 3), "engine": result.engine, "text": result.text})
+        words.extend({"word": word, "start": round(offset + w_start, 3), "end": round(offset + w_end, 3)}
+                     for word, w_start, w_end in result.words)
+
+    audio_seconds = stats["audio_seconds"]
+    record = {
+        "file": path,
+        "engine": engine.name,
+        "text": " ".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "words": words,
+        "audio_seconds": round(audio_seconds, 3),
+        "processing_seconds": round(elapsed, 3),
+        "rtf": round(elapsed / audio_seconds, 4) if audio_seconds else None
+    }
+    if expected is not None:
+        record["expected"] = expected
+        record["wer"] = round(word_error_rate(expected, record["text"]), 4)
+    return record
+
+
+def _init_worker(engine_factory, factory_args):
+    """Load the model once per worker process"""
+    global _worker_engine
+    _worker_engine = engine_factory(*factory_args)
+
+
+def _transcribe_in_worker(path, expected):
+    if _worker_engine is None:
+        return {"file": path, "error": "speech recognition engine not available"}
+    try:
+        return transcribe_file(path, _worker_engine, expected)
+    except Exception as e:
+        return {"file": path, "error": str(e)}
+
+
+def run_batch(items, engine_factory=create_engine, factory_args=("vosk",), workers=None):
+    """Yield one record per (path, expected) item as files finish
+
+    workers=0 transcribes in this process; otherwise a pool of `workers`
+    processes (default: one per CPU, at most one per file) is used.
+    """
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(items))
+
+    if workers <= 0:
+        _init_worker(engine_factory, factory_args)
+        for path, expected in items:
+            yield _transcribe_in_worker(path, expected)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(engine_factory, factory_args)) as pool:
+        futures = [pool.submit(_transcribe_in_worker, path, expected) for path, expected in items]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(argv=None):
+    """Command-line entry point; returns the process exit code"""
+    parser = argparse.ArgumentParser(prog="jarvis transcribe",
+                                     description="Transcribe recorded WAV files with the JARVIS recognizer")
+    parser.add_argument("inputs", nargs="+", help="WAV files, directories or manifests")
+    parser.add_argument("--engine", default="vosk", choices=ENGINES, help="Recognizer to run")
+    parser.add_argument("--whisper-model", default="base", help="Whisper model size")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: one per CPU; 0 runs in this process)")
+    parser.add_argument("-o", "--output", help="Write JSONL here instead of stdout")
+    args = parser.parse_args(argv)
+
+    items = collect_inputs(args.inputs)
+    if not items:
+        print("❌ No WAV files found", file=sys.stderr)
+        return 1
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    start = time.perf_counter()
+    audio_seconds, errors, wers = 0.0, 0, []
+    try:
+        for record in run_batch(items, create_engine, (args.engine, args.whisper_model), args.workers):
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            if "error" in record:
+                errors += 1
+                continue
+            audio_seconds += record["audio_seconds"]
+            if "wer" in record:
+                wers.append(record["wer"])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    summary = (f"{len(items)} files, {audio_seconds:.1f}s of audio in {elapsed:.1f}s "
+               f"({audio_seconds / elapsed if elapsed else 0:.1f}x real time), {errors} errors")
+    if wers:
+        summary += f", mean WER {sum(wers) / len(wers):.3f}"
+    print(summary, file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,8 +2,18 @@ import threading
 import os
 import io
 import json
+import re
 import time
+import heapq
+import itertools
+import tempfile
+import wave
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import contextmanager
 from logger import logger
+from latency_tracker import latency_tracker, percentile, TTS_AUDIO
+from tts_cache import SpeechCache, cache_key
 
 try:
     import pyttsx3  # Local engine fallback
@@ -15,6 +25,68 @@ try:
 except Exception:
     requests = None
 
+try:
+    import pyaudio  # Streams ElevenLabs PCM to the speakers as it arrives
+except Exception:
+    pyaudio = None
+
+try:
+    import winsound  # Plays WAV audio when pyaudio is missing (Windows only)
+except Exception:
+    winsound = None
+
+# Utterance priorities, most urgent first
+ACK = 0           # Hotword acknowledgment
+ERROR = 1         # Failures and rejections
+RESULT = 2        # Command confirmations and answers (default)
+SUGGESTION = 3    # Proactive suggestions
+PRIORITY_NAMES = {ACK: "ack", ERROR: "error", RESULT: "result", SUGGESTION: "suggestion"}
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+CLAUSE_END = re.compile(r'(?<=[,;:])\s+')
+
+
+def split_sentences(text, max_chars=None):
+    """Split text into sentences, and sentences over max_chars into clauses."""
+    segments = []
+    for sentence in SENTENCE_END.split(text.strip()):
+        if max_chars and len(sentence) > max_chars:
+            clause = ""
+            for part in CLAUSE_END.split(sentence):
+                if clause and len(clause) + 1 + len(part) > max_chars:
+                    segments.append(clause)
+                    clause = part
+                else:
+                    clause = f"{clause} {part}" if clause else part
+            sentence = clause
+        if sentence:
+            segments.append(sentence)
+    return segments
+
+
+def pcm_to_wav(pcm, sample_rate):
+    """Wrap 16-bit mono PCM in a WAV header."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class Utterance:
+    """One queued speak() call"""
+
+    def __init__(self, text, priority, run):
+        self.text = text
+        self.priority = priority
+        self.run = run                    # Speaks it, bound to the caller's latency span
+        self.enqueued = time.monotonic()
+        self.cancelled = False
+        self.done = threading.Event()
+
+
 class TextToSpeech:
     """Hybrid TTS: ElevenLabs (if API key present) with pyttsx3 fallback."""
 
@@ -24,8 +96,28 @@ class TextToSpeech:
         self.primary_engine = None        # 'elevenlabs' or 'pyttsx3'
         self.local_engine = None          # pyttsx3 instance
         self.is_speaking = False
+        self.sentences_played = 0         # Of the reply being spoken
         self.lock = threading.Lock()
         self.session = None               # requests session
+        self.local_voice = None           # pyttsx3 voice id
+        self.cache = SpeechCache(Config.TTS_CACHE_DIR)
+        self._collecting = threading.local()
+        # One worker speaks queued utterances in priority order
+        self._queue = []                  # [priority, seq, Utterance or None (superseded)]
+        self._pending = {}                # normalized text -> queue entry
+        self._seq = itertools.count()
+        self._queue_cond = threading.Condition()
+        self._worker = None
+        self.current = None               # Utterance being spoken
+        # ElevenLabs streaming and WAV playback: open_output(sample_rate, channels=1, sample_width=2)
+        # -> stream with write()/close()
+        self.open_output = self._open_pyaudio_output if pyaudio else None
+        self._pyaudio = None
+        self.first_audio = deque(maxlen=200)   # Seconds from request to first audio, per streamed utterance
+        # Synthesizes the next sentence of a reply while the current one plays
+        self._synthesis = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jarvis-tts-synth")
+        self._waits = {name: deque(maxlen=200) for name in PRIORITY_NAMES.values()}
+        self.counts = {"spoken": 0, "coalesced": 0, "interrupted": 0, "max_depth": 0}
         self._init_engines()
     
     def _init_engines(self):
@@ -63,12 +155,14 @@ class TextToSpeech:
                 for v in voices:
                     if pref in v.name.lower():
                         self.local_engine.setProperty('voice', v.id)
+                        self.local_voice = v.id
                         chosen = v.name
                         break
                 if chosen:
                     break
             if not chosen and voices:
                 self.local_engine.setProperty('voice', voices[0].id)
+                self.local_voice = voices[0].id
                 chosen = voices[0].name
             logger.log_activity(f"pyttsx3 voice: {chosen}")
         except Exception:
@@ -76,27 +170,292 @@ class TextToSpeech:
         logger.log_activity("Local pyttsx3 TTS ready")
 
     # ---------------- ElevenLabs Handling ---------------- #
-    def _speak_elevenlabs(self, text: str):
+    def _streaming(self):
+        return self.config.ELEVENLABS_STREAMING and self.open_output is not None
+
+    def _pcm_playback(self):
+        """Whether PCM/WAV can be played and cut short (pyaudio or winsound); MP3 goes to playsound."""
+        return self.open_output is not None or winsound is not None
+
+    def _elevenlabs_key(self, text):
+        model = self.config.ELEVENLABS_MODEL_ID
+        if self._pcm_playback():
+            model = f"{model}/{self.config.ELEVENLABS_STREAM_FORMAT}"
+        return cache_key("elevenlabs", self.config.ELEVENLABS_VOICE_ID, model, None, text)
+
+    def _elevenlabs_request(self, text, stream=False):
+        """POST text to ElevenLabs; PCM when streaming is on, MP3 otherwise."""
         from config import Config
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{Config.ELEVENLABS_VOICE_ID}"
+        url = f"{Config.ELEVENLABS_API_URL.rstrip('/')}/text-to-speech/{Config.ELEVENLABS_VOICE_ID}"
+        params = None
+        if self._pcm_playback():
+            params = {"output_format": Config.ELEVENLABS_STREAM_FORMAT}
+            if stream:
+                url += "/stream"
         headers = {
             "xi-api-key": Config.ELEVENLABS_API_KEY,
-            "Accept": "audio/mpeg",
             "Content-Type": "application/json"
         }
+        if params is None or params["output_format"].startswith("mp3"):
+            headers["Accept"] = "audio/mpeg"        # Raw PCM has no Accept type to ask for
         payload = {
             "text": text,
             "model_id": Config.ELEVENLABS_MODEL_ID,
             "voice_settings": {"stability": 0.5, "similarity_boost": 0.75}
         }
-        r = self.session.post(url, headers=headers, data=json.dumps(payload), timeout=30)
+        r = self.session.post(url, params=params, headers=headers, data=json.dumps(payload), timeout=30, stream=stream)
         if r.status_code != 200:
             raise RuntimeError(f"ElevenLabs API error {r.status_code}: {r.text[:120]}")
-        audio_bytes = r.content
-        self._play_audio_bytes(audio_bytes)
+        return r
+
+    def _synthesize_elevenlabs(self, text: str) -> bytes:
+        """Synthesize audio for text through the ElevenLabs API."""
+        return self._elevenlabs_request(text).content
+
+    def _speak_elevenlabs(self, text: str):
+        if self._streaming():
+            self._stream_elevenlabs(text)
+            return
+        key = self._elevenlabs_key(text)
+        audio_bytes = self.cache.get(key)
+        detail = "elevenlabs cached"
+        if audio_bytes is None:
+            audio_bytes = self._synthesize_elevenlabs(text)
+            self.cache.put(key, audio_bytes, ".pcm" if self._pcm_playback() else ".mp3")
+            detail = "elevenlabs"
+        if self._interrupted():
+            return
+        latency_tracker.mark(TTS_AUDIO, detail=detail)
+        self._play_elevenlabs_audio(audio_bytes)
+
+    def _elevenlabs_audio(self, text: str) -> bytes:
+        """Cached or freshly synthesized ElevenLabs audio for text."""
+        key = self._elevenlabs_key(text)
+        audio_bytes = self.cache.get(key)
+        if audio_bytes is None:
+            audio_bytes = self._synthesize_elevenlabs(text)
+            self.cache.put(key, audio_bytes, ".pcm" if self._pcm_playback() else ".mp3")
+        return audio_bytes
+
+    def _play_elevenlabs_audio(self, audio_bytes):
+        if self._pcm_playback():
+            self._play_pcm(audio_bytes, self._stream_rate())
+        else:
+            self._play_audio_bytes(audio_bytes)
+
+    def _speak_elevenlabs_sentences(self, sentences):
+        if not self._streaming():
+            self._pipeline(sentences, self._elevenlabs_audio, self._play_elevenlabs_audio, "elevenlabs")
+            return
+        # Stream the first sentence for the earliest audio; the rest play from
+        # prefetched PCM on the same output, without gaps
+        output = self.open_output(self._stream_rate())
+        try:
+            ahead = self._synthesis.submit(self._elevenlabs_audio, sentences[1])
+            self._stream_elevenlabs(sentences[0], output)
+            self.sentences_played += 1
+            for i in range(1, len(sentences)):
+                audio_bytes = self._next_audio(ahead)
+                if self._interrupted():
+                    return
+                if i + 1 < len(sentences):
+                    ahead = self._synthesis.submit(self._elevenlabs_audio, sentences[i + 1])
+                if not self._write_pcm(output, [audio_bytes]):
+                    ahead.cancel()
+                    return
+                self.sentences_played += 1
+        finally:
+            self._close_output(output)
+
+    def _stream_rate(self):
+        return int(self.config.ELEVENLABS_STREAM_FORMAT.split("_")[1])
+
+    def _stream_elevenlabs(self, text: str, output=None):
+        """Play PCM as response chunks arrive, keeping it in memory for the cache."""
+        key = self._elevenlabs_key(text)
+        cached = self.cache.get(key)
+        own_output = output is None
+        if own_output:
+            output = self.open_output(self._stream_rate())
+        try:
+            if cached is not None:
+                latency_tracker.mark(TTS_AUDIO, detail="elevenlabs cached")
+                self._write_pcm(output, [cached])
+                return
+            requested = time.monotonic()
+            response = self._elevenlabs_request(text, stream=True)
+            buffer = io.BytesIO()
+            try:
+                complete = self._write_pcm(output, response.iter_content(chunk_size=None), buffer, requested)
+            finally:
+                response.close()
+            if complete:
+                self.cache.put(key, buffer.getvalue(), ".pcm")
+        finally:
+            if own_output:
+                self._close_output(output)
+
+    def _pipeline(self, sentences, prepare, play, detail):
+        """Play sentence N while the synthesis worker prepares sentence N+1."""
+        ahead = self._synthesis.submit(prepare, sentences[0])
+        for i in range(len(sentences)):
+            audio_bytes = self._next_audio(ahead)
+            if self._interrupted():
+                return
+            if i + 1 < len(sentences):
+                ahead = self._synthesis.submit(prepare, sentences[i + 1])
+            if i == 0:
+                latency_tracker.mark(TTS_AUDIO, detail=f"{detail} pipelined")
+            if audio_bytes:
+                play(audio_bytes)
+            self.sentences_played += 1
+
+    def _next_audio(self, ahead):
+        """Wait for a prefetched sentence, giving up (and cancelling it) on barge-in."""
+        while not self._interrupted():
+            try:
+                return ahead.result(timeout=0.05)
+            except FutureTimeout:
+                continue
+        ahead.cancel()
+        return None
+
+    def _write_pcm(self, output, chunks, buffer=None, requested=None):
+        """Write 16-bit PCM chunks to output; False if interrupted part way."""
+        remainder = b""
+        for chunk in chunks:
+            if self._interrupted():
+                return False
+            if buffer is not None:
+                buffer.write(chunk)
+            data = remainder + chunk
+            whole = len(data) - len(data) % 2       # Never split a sample
+            remainder = data[whole:]
+            if not whole:
+                continue
+            if requested is not None:
+                first_audio = time.monotonic() - requested
+                self.first_audio.append(first_audio)
+                latency_tracker.mark(TTS_AUDIO, detail="elevenlabs stream")
+                logger.log_activity(f"First audio after {first_audio * 1000:.0f} ms")
+                requested = None
+            # Write in slices so a barge-in is heard within one slice
+            for start in range(0, whole, 4096):
+                if self._interrupted():
+                    return False
+                output.write(data[start:min(start + 4096, whole)])
+        return True
+
+    def _open_pyaudio_output(self, sample_rate, channels=1, sample_width=2):
+        if self._pyaudio is None:
+            self._pyaudio = pyaudio.PyAudio()
+        return self._pyaudio.open(format=self._pyaudio.get_format_from_width(sample_width), channels=channels,
+                                  rate=sample_rate, output=True)
+
+    def _close_output(self, output):
+        try:
+            if hasattr(output, "stop_stream"):
+                output.stop_stream()
+            output.close()
+        except Exception as e:
+            logger.log_error("Error closing audio output", e)
+
+    # ---------------- pyttsx3 Handling ---------------- #
+    def _pyttsx3_key(self, text):
+        return cache_key("pyttsx3", self.local_voice, None, self.config.VOICE_RATE, text)
+
+    def _synthesize_pyttsx3(self, text: str) -> bytes:
+        """Render text to WAV bytes with the local engine."""
+        import tempfile
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as f:
+            temp_path = f.name
+        try:
+            self.local_engine.save_to_file(text, temp_path)
+            self.local_engine.runAndWait()
+            with open(temp_path, 'rb') as f:
+                return f.read()
+        finally:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def _pyttsx3_audio(self, text: str) -> bytes:
+        """Cached or freshly rendered pyttsx3 WAV for text."""
+        key = self._pyttsx3_key(text)
+        audio_bytes = self.cache.get(key)
+        if audio_bytes is None:
+            audio_bytes = self._synthesize_pyttsx3(text)
+            if audio_bytes:
+                self.cache.put(key, audio_bytes, ".wav")
+        return audio_bytes
+
+    def _play_pcm(self, pcm: bytes, sample_rate):
+        """Play 16-bit mono PCM where a barge-in can cut it short."""
+        if self.open_output is None:
+            self._play_winsound(pcm_to_wav(pcm, sample_rate), len(pcm) / (2 * sample_rate))
+            return
+        output = self.open_output(sample_rate)
+        try:
+            self._write_pcm(output, [pcm])
+        finally:
+            self._close_output(output)
+
+    def _play_wav_bytes(self, data: bytes):
+        """Play WAV bytes through the pyaudio output (or winsound), stopping on barge-in."""
+        with wave.open(io.BytesIO(data), 'rb') as wav_file:
+            channels, width, rate = wav_file.getnchannels(), wav_file.getsampwidth(), wav_file.getframerate()
+            frames = wav_file.readframes(wav_file.getnframes())
+        if self.open_output is None:
+            self._play_winsound(data, len(frames) / (channels * width * rate))
+            return
+        output = self.open_output(rate, channels, width)
+        try:
+            self._write_pcm(output, [frames])
+        finally:
+            self._close_output(output)
+
+    def _play_winsound(self, wav: bytes, seconds):
+        """Play WAV asynchronously, purging it on barge-in (winsound can't play memory asynchronously)."""
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as f:
+            f.write(wav)
+            temp_path = f.name
+        try:
+            winsound.PlaySound(temp_path, winsound.SND_FILENAME | winsound.SND_ASYNC | winsound.SND_NODEFAULT)
+            finished = time.monotonic() + seconds
+            while time.monotonic() < finished:
+                if self._interrupted():
+                    winsound.PlaySound(None, 0)
+                    return
+                time.sleep(0.02)
+        finally:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def _speak_pyttsx3(self, text: str):
+        if not self._pcm_playback():
+            # Neither pyaudio nor winsound to play a WAV; speak directly
+            latency_tracker.mark(TTS_AUDIO, detail="pyttsx3")
+            self.local_engine.say(text)
+            self.local_engine.runAndWait()
+            return
+        key = self._pyttsx3_key(text)
+        audio_bytes = self.cache.get(key)
+        detail = "pyttsx3 cached"
+        if audio_bytes is None:
+            audio_bytes = self._synthesize_pyttsx3(text)
+            if audio_bytes:
+                self.cache.put(key, audio_bytes, ".wav")
+            detail = "pyttsx3"
+        if self._interrupted():
+            return
+        latency_tracker.mark(TTS_AUDIO, detail=detail)
+        self._play_wav_bytes(audio_bytes)
 
     def _play_audio_bytes(self, data: bytes):
-        """Play MP3/decoded audio bytes using simpletempfile + playsound fallback."""
+        """Play MP3 bytes with playsound (only without pyaudio and winsound; it can't be cut short)."""
         # Minimal dependency playback to avoid adding heavy libs: use temp file + winsound (wav only) OR playsound.
         import tempfile, os
         # ElevenLabs returns MP3. Try playsound if available; else attempt pydub conversion if installed.
@@ -115,41 +474,168 @@ class TextToSpeech:
             except Exception:
                 pass
     
-    def speak(self, text, blocking=False):
-        """Speak text via preferred engine with fallback."""
+    @contextmanager
+    def collect(self):
+        """Capture what this thread would speak instead of speaking it."""
+        previous = getattr(self._collecting, "lines", None)
+        lines = []
+        self._collecting.lines = lines
+        try:
+            yield lines
+        finally:
+            self._collecting.lines = previous
+
+    # ---------------- Speech Queue ---------------- #
+    def speak(self, text, blocking=False, priority=RESULT):
+        """Queue text for the speech worker (ACK > ERROR > RESULT > SUGGESTION).
+
+        A duplicate of a pending utterance is coalesced into it; `blocking`
+        waits until the utterance has been spoken or interrupted.
+        """
         if not text:
             return
+        collected = getattr(self._collecting, "lines", None)
+        if collected is not None:
+            collected.append(text)
+            return
+
+        if threading.current_thread() is self._worker:
+            self._say(text)               # Nested call from a speaking handler
+            return
+        normalized = " ".join(text.split()).lower()
+        with self._queue_cond:
+            entry = self._pending.get(normalized)
+            if entry is not None:
+                utterance = entry[2]
+                self.counts["coalesced"] += 1
+                if priority < utterance.priority:
+                    # Re-queue at the more urgent priority
+                    entry[2] = None
+                    utterance.priority = priority
+                    self._push(normalized, utterance)
+            else:
+                # Carry the caller's latency span into the speech worker
+                utterance = Utterance(text, priority, latency_tracker.bind(self._say))
+                self._push(normalized, utterance)
+                self.counts["max_depth"] = max(self.counts["max_depth"], len(self._pending))
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run_queue, name="jarvis-tts", daemon=True)
+                self._worker.start()
+            self._queue_cond.notify()
+        if blocking:
+            utterance.done.wait()
+
+    def _push(self, normalized, utterance):
+        entry = [utterance.priority, next(self._seq), utterance]
+        self._pending[normalized] = entry
+        heapq.heappush(self._queue, entry)
+
+    def _run_queue(self):
+        while True:
+            with self._queue_cond:
+                utterance = None
+                while utterance is None:
+                    while not self._queue:
+                        self._queue_cond.wait()
+                    utterance = heapq.heappop(self._queue)[2]
+                self._pending.pop(" ".join(utterance.text.split()).lower(), None)
+                self.current = utterance
+            self._waits[PRIORITY_NAMES[utterance.priority]].append(time.monotonic() - utterance.enqueued)
+            try:
+                utterance.run(utterance.text)
+                if not self._interrupted():
+                    self.counts["spoken"] += 1     # Cut-short ones were counted as interrupted
+            except Exception as e:
+                logger.log_error("Error in speech worker", e)
+            finally:
+                self.current = None
+                utterance.done.set()
 
-        def _do_speak():
-            with self.lock:
-                self.is_speaking = True
-                try:
-                    engine_used = None
-                    if self.primary_engine == "elevenlabs":
-                        try:
-                            logger.log_activity(f"Speaking (ElevenLabs): {text}")
+    def _sentences(self, text):
+        """The pieces text is synthesized in."""
+        if not self.config.TTS_SENTENCE_PIPELINING:
+            return [text]
+        return split_sentences(text, self.config.TTS_CLAUSE_CHARS) or [text]
+
+    def _say(self, text):
+        """Speak text via preferred engine with fallback."""
+        sentences = self._sentences(text)
+        with self.lock:
+            self.is_speaking = True
+            self.sentences_played = 0     # Advanced by the pipelined paths
+            try:
+                engine_used = None
+                if self.primary_engine == "elevenlabs":
+                    try:
+                        logger.log_activity(f"Speaking (ElevenLabs): {text}")
+                        if len(sentences) > 1:
+                            self._speak_elevenlabs_sentences(sentences)
+                        else:
                             self._speak_elevenlabs(text)
-                            engine_used = "elevenlabs"
-                        except Exception as e:
-                            logger.log_error("ElevenLabs failed, falling back", e)
-                    if engine_used is None:
-                        if self.local_engine:
-                            logger.log_activity(f"Speaking (pyttsx3): {text}")
-                            self.local_engine.say(text)
-                            self.local_engine.runAndWait()
+                        engine_used = "elevenlabs"
+                    except Exception as e:
+                        logger.log_error("ElevenLabs failed, falling back", e)
+                        # Only what the user hasn't heard yet
+                        sentences = sentences[self.sentences_played:]
+                        if not sentences or self._interrupted():
+                            return
+                        text = " ".join(sentences)
+                if engine_used is None:
+                    if self.local_engine:
+                        logger.log_activity(f"Speaking (pyttsx3): {text}")
+                        if len(sentences) > 1 and self._pcm_playback():
+                            self._pipeline(sentences, self._pyttsx3_audio, self._play_wav_bytes, "pyttsx3")
                         else:
-                            logger.log_error("No TTS engine available to speak", None)
-                finally:
-                    self.is_speaking = False
+                            self._speak_pyttsx3(text)
+                    else:
+                        logger.log_error("No TTS engine available to speak", None)
+            finally:
+                self.is_speaking = False
+
+    def _interrupted(self):
+        current = self.current
+        return current is not None and current.cancelled
+
+    def interrupt(self):
+        """Barge-in: drop every pending utterance and cut the current one short."""
+        with self._queue_cond:
+            dropped = [entry[2] for entry in self._queue if entry[2] is not None]
+            self._queue.clear()
+            self._pending.clear()
+            current = self.current
+        for utterance in dropped:
+            utterance.cancelled = True
+            utterance.done.set()
+        self.counts["interrupted"] += len(dropped)
+        if current is not None and not current.cancelled:
+            current.cancelled = True
+            self.counts["interrupted"] += 1
+            self.stop()
+        if dropped or current is not None:
+            logger.log_activity(f"Speech interrupted ({len(dropped)} pending dropped)")
+
+    def queue_stats(self):
+        """Queue depth, counters, wait time (ms) per priority and streamed time-to-first-audio."""
+        with self._queue_cond:
+            stats = dict(self.counts, depth=len(self._pending))
+        waits = {}
+        for name, samples in self._waits.items():
+            values = sorted(seconds * 1000 for seconds in samples)
+            if values:
+                waits[name] = {"count": len(values), "p50": round(percentile(values, 0.50), 2),
+                               "p95": round(percentile(values, 0.95), 2), "max": round(values[-1], 2)}
+        stats["wait_ms"] = waits
+        values = sorted(seconds * 1000 for seconds in self.first_audio)
+        if values:
+            stats["first_audio_ms"] = {"count": len(values), "p50": round(percentile(values, 0.50), 2),
+                                       "p95": round(percentile(values, 0.95), 2), "max": round(values[-1], 2)}
+        return stats
 
-        if blocking:
-            _do_speak()
-        else:
-            threading.Thread(target=_do_speak, daemon=True).start()
-    
     def stop(self):
-        """Attempt to stop local engine speech."""
+        """Stop local engine speech and winsound playback; streamed PCM stops at its next slice."""
         try:
+            if winsound is not None and self.is_speaking:
+                winsound.PlaySound(None, 0)
             if self.local_engine and self.is_speaking:
                 self.local_engine.stop()
                 self.is_speaking = False
@@ -157,7 +643,53 @@ class TextToSpeech:
             logger.log_error("Error stopping speech", e)
     
     def is_busy(self):
-        return self.is_speaking
+        return self.is_speaking or bool(self._pending)
+
+    def prewarm(self, texts):
+        """Synthesize texts into the cache without playing them; returns how many were synthesized."""
+        if self.primary_engine == "elevenlabs":
+            extension = ".pcm" if self._pcm_playback() else ".mp3"
+            key_for, synthesize = self._elevenlabs_key, self._synthesize_elevenlabs
+        elif self.local_engine and self._pcm_playback():
+            key_for, synthesize, extension = self._pyttsx3_key, self._synthesize_pyttsx3, ".wav"
+        else:
+            return 0
+        # Warm the sentences that speaking each text will actually look up
+        pieces = []
+        for text in texts:
+            for sentence in self._sentences(text):
+                if sentence not in pieces:
+                    pieces.append(sentence)
+        synthesized = 0
+        for text in pieces:
+            key = key_for(text)
+            if self.cache.warm(key):
+                continue
+            try:
+                # pyttsx3 cannot render while it is speaking; ElevenLabs needs no lock
+                if extension == ".wav":
+                    with self.lock:
+                        audio_bytes = synthesize(text)
+                else:
+                    audio_bytes = synthesize(text)
+            except Exception as e:
+                logger.log_error("TTS pre-warm stopped", e)
+                break
+            if audio_bytes:
+                self.cache.put(key, audio_bytes, extension)
+                synthesized += 1
+        logger.log_activity(f"TTS pre-warm done: {synthesized} of {len(pieces)} sentences synthesized")
+        return synthesized
+
+    def prewarm_async(self, texts):
+        """Pre-warm on a background thread; returns the thread."""
+        thread = threading.Thread(target=self.prewarm, args=(list(texts),), name="jarvis-tts-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def cache_stats(self):
+        """Hit/miss counters of the synthesized speech cache."""
+        return self.cache.stats()
 
 # Global TTS instance
 tts = TextToSpeech()
@@ -0,0 +1,145 @@
+"""
+Synthesized speech cache for JARVIS
+Audio is stored under a hash of (engine, voice, model, rate, text): a small
+in-memory LRU holds the phrases in current use, and an on-disk tier keeps
+everything else across restarts, evicting the least recently used files once
+it grows past its size limit. Repeated phrases play without synthesis.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from config import Config
+from logger import logger
+
+
+def cache_key(engine, voice, model, rate, text):
+    """Content address of one utterance"""
+    identity = "\x1f".join(str(part) for part in (engine, voice, model, rate, " ".join(text.split())))
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+class SpeechCache:
+    """Two-tier (memory LRU + disk) store of synthesized audio bytes"""
+
+    def __init__(self, directory=None, max_bytes=None, memory_items=None):
+        self.directory = directory
+        self.max_bytes = Config.TTS_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.memory_items = Config.TTS_CACHE_MEMORY_ITEMS if memory_items is None else memory_items
+        self.memory = OrderedDict()     # key -> bytes, least recently used first
+        self.files = OrderedDict()      # key -> (path, size), least recently used first
+        self.disk_bytes = 0
+        self.counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        if directory and os.path.isdir(directory):
+            self._scan()
+
+    def _scan(self):
+        """Index the files already on disk, oldest access first"""
+        entries = []
+        with os.scandir(self.directory) as listing:
+            for item in listing:
+                key, extension = os.path.splitext(item.name)
+                if item.is_file() and len(key) == 64 and extension != ".tmp":
+                    stat = item.stat()
+                    entries.append((stat.st_mtime, key, item.path, stat.st_size))
+        for _, key, path, size in sorted(entries):
+            self.files[key] = (path, size)
+            self.disk_bytes += size
+
+    def get(self, key):
+        """Cached audio for `key`, or None"""
+        return self._fetch(key, record=True)
+
+    def warm(self, key):
+        """Bring `key` into memory without counting a hit or miss; True if cached"""
+        return self._fetch(key, record=False) is not None
+
+    def _fetch(self, key, record):
+        with self._lock:
+            data = self.memory.get(key)
+            if data is not None:
+                self.memory.move_to_end(key)
+                if key in self.files:
+                    self.files.move_to_end(key)
+                if record:
+                    self.counts["memory_hits"] += 1
+                return data
+            entry = self.files.get(key)
+            if entry is None:
+                if record:
+                    self.counts["misses"] += 1
+                return None
+            self.files.move_to_end(key)
+
+        try:
+            with open(entry[0], "rb") as f:
+                data = f.read()
+            os.utime(entry[0])          # Keeps LRU order across restarts
+        except OSError:
+            with self._lock:
+                if self.files.pop(key, None):
+                    self.disk_bytes -= entry[1]
+                if record:
+                    self.counts["misses"] += 1
+            return None
+
+        with self._lock:
+            if record:
+                self.counts["disk_hits"] += 1
+            self._remember(key, data)
+        return data
+
+    def put(self, key, data, extension=".mp3"):
+        """Store audio in both tiers"""
+        with self._lock:
+            self._remember(key, data)
+        if not self.directory:
+            return
+        path = os.path.join(self.directory, key + extension)
+        try:
+            os.makedirs(self.directory, exist_ok=True)      # Created on first use
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.log_error(f"Failed to write speech cache file {path}", e)
+            return
+        with self._lock:
+            previous = self.files.pop(key, None)
+            if previous:
+                self.disk_bytes -= previous[1]
+            self.files[key] = (path, len(data))
+            self.disk_bytes += len(data)
+            evicted = self._evict()
+        for old_path in evicted:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+    def _remember(self, key, data):
+        self.memory[key] = data
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_items:
+            self.memory.popitem(last=False)
+
+    def _evict(self):
+        """Drop least recently used files until the disk tier fits; returns their paths"""
+        evicted = []
+        while self.disk_bytes > self.max_bytes and len(self.files) > 1:
+            _, (path, size) = self.files.popitem(last=False)
+            self.disk_bytes -= size
+            self.counts["evictions"] += 1
+            evicted.append(path)
+        return evicted
+
+    def stats(self):
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            lookups = self.counts["memory_hits"] + self.counts["disk_hits"] + self.counts["misses"]
+            hits = lookups - self.counts["misses"]
+            return dict(self.counts, hit_rate=hits / lookups if lookups else 0.0,
+                        memory_entries=len(self.memory), disk_entries=len(self.files), disk_bytes=self.disk_bytes)
@@ -0,0 +1,153 @@
+"""
+Voice activity detection for JARVIS
+Energy + zero-crossing gate with hangover and pre-roll, operating directly on
+raw 16-bit PCM buffers from PyAudio
+"""
+
+import math
+import time
+from collections import deque
+from logger import logger
+
+# NumPy gives us a zero-copy view of the PyAudio buffer; fall back to a
+# memoryview cast (also zero-copy, but slower arithmetic) when it is missing
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger.log_activity("NumPy not available - VAD using pure Python fallback")
+
+
+class VoiceActivityDetector:
+    """Gate audio so only speech segments (plus pre-roll) go downstream"""
+
+    def __init__(self, energy_threshold=500, zcr_threshold=0.35,
+                 hangover_chunks=3, preroll_chunks=2, max_chunk_frames=8192):
+        self.energy_threshold = energy_threshold
+        self.zcr_threshold = zcr_threshold        # Zero crossings per sample above this look like hiss
+        self.hangover_chunks = hangover_chunks    # Keep forwarding this many quiet chunks after speech
+        self.preroll_chunks = preroll_chunks      # Quiet chunks replayed when speech starts
+
+        self.in_speech = False
+        self.last_rms = 0.0
+        self.last_zcr = 0.0
+        self._hangover_left = 0
+        self._preroll = deque(maxlen=max(preroll_chunks, 1))
+
+        # Optional hooks for segment boundaries
+        self.on_speech_start = None
+        self.on_speech_end = None
+
+        # Per-chunk cost accounting
+        self.chunks_processed = 0
+        self.speech_chunks = 0
+        self.segments = 0
+        self.total_cost = 0.0
+        self.max_cost = 0.0
+
+        # Scratch buffers reused for every chunk so analysis never allocates
+        if NUMPY_AVAILABLE:
+            self._scratch = np.empty(max_chunk_frames, dtype=np.float32)
+            self._signs = np.empty(max_chunk_frames, dtype=np.bool_)
+            self._crossings = np.empty(max_chunk_frames, dtype=np.bool_)
+
+    def _ensure_capacity(self, frames):
+        """Grow scratch buffers if a chunk is larger than expected"""
+        if frames > self._scratch.shape[0]:
+            self._scratch = np.empty(frames, dtype=np.float32)
+            self._signs = np.empty(frames, dtype=np.bool_)
+            self._crossings = np.empty(frames, dtype=np.bool_)
+
+    def analyze(self, data):
+        """Return (rms, zero_crossing_rate) for a chunk of int16 PCM"""
+        usable = len(data) & ~1
+        frames = usable // 2
+        if frames == 0:
+            return 0.0, 0.0
+
+        if NUMPY_AVAILABLE:
+            samples = np.frombuffer(data, dtype=np.int16, count=frames)
+            self._ensure_capacity(frames)
+            scratch = self._scratch[:frames]
+            np.copyto(scratch, samples)
+            rms = math.sqrt(float(np.dot(scratch, scratch)) / frames)
+
+            signs = self._signs[:frames]
+            np.less(samples, 0, out=signs)
+            crossings = self._crossings[:frames - 1]
+            np.not_equal(signs[1:], signs[:-1], out=crossings)
+            zcr = np.count_nonzero(crossings) / frames
+        else:
+            samples = memoryview(data)[:usable].cast('h')
+            rms = math.sqrt(sum(s * s for s in samples) / frames)
+            crossings = 0
+            previous = samples[0] < 0
+            for s in samples:
+                negative = s < 0
+                if negative != previous:
+                    crossings += 1
+                previous = negative
+            zcr = crossings / frames
+
+        return rms, zcr
+
+    def is_speech(self, data):
+        """Classify a single chunk without touching segment state"""
+        rms, zcr = self.analyze(data)
+        self.last_rms = rms
+        self.last_zcr = zcr
+        return rms > self.energy_threshold and zcr < self.zcr_threshold
+
+    def process(self, data):
+        """Feed one chunk; return the list of chunks to pass downstream"""
+        start = time.perf_counter()
+        speech = self.is_speech(data)
+        forwarded = []
+
+        if speech:
+            if not self.in_speech:
+                self.in_speech = True
+                self.segments += 1
+                forwarded.extend(self._preroll)
+                self._preroll.clear()
+                if self.on_speech_start:
+                    self.on_speech_start()
+            self._hangover_left = self.hangover_chunks
+            self.speech_chunks += 1
+            forwarded.append(data)
+        elif self.in_speech and self._hangover_left > 0:
+            self._hangover_left -= 1
+            forwarded.append(data)
+        else:
+            if self.in_speech:
+                self.in_speech = False
+                if self.on_speech_end:
+                    self.on_speech_end()
+            if self.preroll_chunks > 0:
+                self._preroll.append(data)
+
+        cost = time.perf_counter() - start
+        self.chunks_processed += 1
+        self.total_cost += cost
+        if cost > self.max_cost:
+            self.max_cost = cost
+        return forwarded
+
+    def reset(self):
+        """Drop segment state and pre-roll (e.g. after a command finishes)"""
+        self.in_speech = False
+        self._hangover_left = 0
+        self._preroll.clear()
+
+    def get_stats(self):
+        """Return per-chunk cost and gating statistics"""
+        avg_cost = self.total_cost / self.chunks_processed if self.chunks_processed else 0.0
+        return {
+            "chunks_processed": self.chunks_processed,
+            "speech_chunks": self.speech_chunks,
+            "segments": self.segments,
+            "avg_cost_us": avg_cost * 1e6,
+            "max_cost_us": self.max_cost * 1e6,
+            "backend": "numpy" if NUMPY_AVAILABLE else "python"
+        }